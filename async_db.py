@@ -0,0 +1,196 @@
+# Contains an asyncio facade over the expenses, income and goals db modules, for running the tracker's
+# data layer inside an asyncio service.
+
+## Imports ##
+
+import asyncio
+import functools
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+import tracker_db
+import schema_db
+import expenses_db
+import income_db
+import goals_db
+
+## Variables ##
+
+# The number of threads that run reads. Each has its own connection, and the db uses WAL, so they
+# read at the same time without blocking each other or the writer.
+READ_WORKERS = 4
+
+# The functions of each db module that are exposed as coroutines, as (reads, writes). Reads run on
+# the read threads and writes on the write thread. Helpers that take a connection, such as
+# add_expense_chunk, and generators such as iter_all_expenses are left out, as they have to run on
+# the thread that owns the connection; the get_ function that returns a list or a page can be used
+# instead of a generator.
+EXPENSES_OPERATIONS = (
+    ('get_cat_names', 'get_cat_list', 'get_name_list', 'get_expense_by_id', 'get_expenses_by_name',
+     'get_all_expenses', 'get_expenses_from_category', 'get_expense_page', 'get_expenses_between',
+     'get_expenses_by_amount', 'search_expenses', 'get_expense_total_between', 'get_cat_totals',
+     'get_monthly_totals', 'get_monthly_cat_totals'),
+    ('add_expense', 'add_expenses_many', 'delete_expense', 'update_expense', 'add_expense_cat',
+     'update_cat_budget', 'rename_expense_cat', 'delete_expense_cat'),
+)
+INCOME_OPERATIONS = (
+    ('get_cat_list', 'get_name_list', 'get_income_by_id', 'get_income_by_name', 'get_all_income',
+     'get_cat_income', 'get_income_from_category', 'get_income_page', 'get_income_between',
+     'get_income_by_amount', 'search_income', 'get_income_total_between', 'get_cat_totals',
+     'get_monthly_totals', 'get_monthly_cat_totals'),
+    ('add_income', 'add_income_many', 'delete_income', 'update_income', 'add_income_cat',
+     'rename_income_cat', 'delete_income_cat'),
+)
+GOALS_OPERATIONS = (
+    ('get_goal_info', 'get_goals_list'),
+    ('add_goal', 'update_goal', 'update_saving_goal_progress', 'delete_goal'),
+)
+
+# The thread pools, created when they are first used.
+_read_executor = None
+_write_executor = None
+_executors_lock = threading.Lock()
+
+## Functions ##
+
+# Gets the thread pools, creating them if needed.
+def get_executors():
+    """
+    Gets the thread pool for reads and the single thread for writes, creating them the first time.
+    Writes all run on the one thread, so they never wait on each other for the db's write lock.
+
+    Args:
+        None
+
+    Returns:
+        (read_executor, write_executor): The thread pools. (tuple of ThreadPoolExecutors)
+    """
+    global _read_executor, _write_executor
+    with _executors_lock:
+        if _read_executor is None:
+            _read_executor = ThreadPoolExecutor(READ_WORKERS, thread_name_prefix='tracker-read')
+            _write_executor = ThreadPoolExecutor(1, thread_name_prefix='tracker-write')
+        return _read_executor, _write_executor
+
+# Runs a blocking function on the read threads.
+async def run_read(func, *args, **kwargs):
+    """
+    Runs a function that only reads the db on one of the read threads, so the event loop isn't
+    blocked while SQLite works.
+
+    Args:
+        func: The function to run. (function)
+        *args, **kwargs: The arguments to call it with.
+
+    Returns:
+        result: What the function returned.
+    """
+    read_executor = get_executors()[0]
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(read_executor, functools.partial(func, *args, **kwargs))
+
+# Runs a blocking function on the write thread.
+async def run_write(func, *args, **kwargs):
+    """
+    Runs a function that writes to the db on the write thread. Writes run one at a time in the order
+    they were made. A function that makes several *_db calls in a tracker_db.transaction() can be
+    passed to run them as one unit.
+
+    Args:
+        func: The function to run. (function)
+        *args, **kwargs: The arguments to call it with.
+
+    Returns:
+        result: What the function returned.
+    """
+    write_executor = get_executors()[1]
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(write_executor, functools.partial(func, *args, **kwargs))
+
+# Makes a coroutine that runs a db function on a thread.
+def make_coroutine(func, run):
+    """
+    Wraps a db function in a coroutine that takes the same arguments and returns the same values.
+
+    Args:
+        func: The db function, such as expenses_db.get_expense_page. (function)
+        run: run_read or run_write, which picks the thread it runs on. (function)
+
+    Returns:
+        call: The coroutine function. (function)
+    """
+    @functools.wraps(func)
+    async def call(*args, **kwargs):
+        return await run(func, *args, **kwargs)
+    return call
+
+# Exposes a db module's public operations as coroutines.
+def wrap_module(module, operations):
+    """
+    Makes an object with a coroutine for each of a db module's public reads and writes.
+
+    Args:
+        module: The db module to wrap, such as expenses_db. (module)
+        operations: The names of the module's functions to expose, as (reads, writes). (tuple of tuples of str)
+
+    Returns:
+        wrapped: An object with a coroutine function for each operation. (SimpleNamespace)
+    """
+    reads, writes = operations
+    coroutines = {}
+    for name in reads:
+        coroutines[name] = make_coroutine(getattr(module, name), run_read)
+    for name in writes:
+        coroutines[name] = make_coroutine(getattr(module, name), run_write)
+    return types.SimpleNamespace(**coroutines)
+
+# The db modules as coroutines, such as await async_db.expenses.get_expense_page(None, None, None, 20).
+expenses = wrap_module(expenses_db, EXPENSES_OPERATIONS)
+income = wrap_module(income_db, INCOME_OPERATIONS)
+goals = wrap_module(goals_db, GOALS_OPERATIONS)
+
+# Creates or upgrades the schema.
+async def create_schema():
+    """
+    Creates the tracker db or applies any migrations it is missing, on the write thread. Await this
+    before anything else.
+
+    Args:
+        None
+
+    Returns:
+        The result of schema_db.create_schema(). (list)
+    """
+    return await run_write(schema_db.create_schema)
+
+# Shuts down the thread pools.
+async def close():
+    """
+    Closes the connections the read and write threads opened and shuts the threads down. The facade
+    can be used again afterwards, which starts new threads.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global _read_executor, _write_executor
+    with _executors_lock:
+        read_executor, write_executor = _read_executor, _write_executor
+        _read_executor = None
+        _write_executor = None
+    if read_executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    # Every read thread has to close its own connection, so they all wait at the barrier until each
+    # has been given one of the closes.
+    barrier = threading.Barrier(READ_WORKERS)
+    def close_read_connection():
+        barrier.wait()
+        tracker_db.close_connection()
+    closes = [loop.run_in_executor(read_executor, close_read_connection) for _ in range(READ_WORKERS)]
+    closes.append(loop.run_in_executor(write_executor, tracker_db.close_connection))
+    await asyncio.gather(*closes)
+    read_executor.shutdown()
+    write_executor.shutdown()
@@ -3,32 +3,22 @@
 ## Imports ##
 
 import sqlite3
-import os
+import tracker_db
 
 ## Functions ##
 
 # Creates database if it doesn't exist.
 def create():
     try:
-        db = sqlite3.connect('data/tracker')
-    except sqlite3.OperationalError:
-        os.mkdir('data')
-    finally:
-        db = sqlite3.connect('data/tracker')
-    try:
-        cursor = db.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS budget(
-                        id INTEGER PRIMARY KEY,
-                        category TEXT,
-                        name TEXT,
-                        date_added TEXT)''')
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''CREATE TABLE IF NOT EXISTS budget(
+                            id INTEGER PRIMARY KEY,
+                            category TEXT,
+                            name TEXT,
+                            date_added TEXT)''')
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Searches a specific db for something.
@@ -23,6 +23,7 @@ def main_menu():
 2 - View expense budgets
 3 - Add a new expense category
 4 - Delete an expense category 
+5 - View monthly spending
 0 - Return to previous menu
 : ''')
 
@@ -42,6 +43,10 @@ def main_menu():
         elif user_input == '4':
             expenses_menu.delete_category()
 
+        # View monthly spending.
+        elif user_input == '5':
+            view_monthly()
+
         # Return to previous menu.
         elif user_input == '0':
             return
@@ -77,11 +82,12 @@ def edit_budget():
         print("\nCategory -- Budget")
         for expense_cat in current_expense_cats:
             # Changes the budget depending on what it is.
-            expense_cat_budget_ph = str(expense_cat[1])
-            if expense_cat_budget_ph == '0.0':
+            if expense_cat[1] == 0:
                 expense_cat_budget_ph = 'N/A'
+            else:
+                expense_cat_budget_ph = global_utils.amount_format(expense_cat[1])
             # Prints the categories and budgets.
-            print(f'{global_utils.name_capitalise(expense_cat[0])} -- {global_utils.amount_format(expense_cat_budget_ph)}')
+            print(f'{global_utils.name_capitalise(expense_cat[0])} -- {expense_cat_budget_ph}')
 
     # Gets the expense category to set the budget of.
     cat_to_set = budget_utils.get_cat_to_set(current_expense_cats)
@@ -141,56 +147,41 @@ def view_budget():
             print(f"Error: {current_expense_cats[1]}")
             return
         
-    # Gets a list of all expenses.
-    expense_data = expenses_db.get_all_expenses()
-    # If the list is not empty.
-    if len(expense_data) != 0:
-        # If the get_cat_list() function has returned an error.
-        if expense_data[0] == 1:
-            print("\nSorry, something went wrong accessing the expenses database.")
-            print(f"Error: {expense_data[1]}")
-            return
-    
+    # Gets the number and total of the expenses in every category from the running totals.
+    cat_totals = expenses_db.get_cat_totals()
+    if len(cat_totals) != 0 and cat_totals[0] == 1:
+        print("\nSorry, something went wrong accessing the expenses database.")
+        print(f"Error: {cat_totals[1]}")
+        return
+    cat_totals_by_name = {}
+    for cat_total in cat_totals:
+        cat_totals_by_name[cat_total[0]] = cat_total
+
     # Creates an empty list of cat data.
     cat_data = []
-    # Adds expense data to the category: [[cat_name_0], [cat_budget_0], [expense_data_0], [expense_data_1]...],
-    # [[cat_name_1], [cat_budget_1], [expense_data_0], [expense_data_1]...].
+    # Adds the budget and totals to each category: [cat_name_0, cat_budget_0, cat_total_0, cat_count_0,
+    # cat_last_date_0, cat_smallest_0, cat_largest_0], [cat_name_1, cat_budget_1, cat_total_1, ...]...
     for cat in current_expense_cats:
-        temp_cat_data = []
-        temp_cat_data.append(cat[0])
-        temp_cat_data.append(cat[1])
-        for expense in expense_data:
-            # If the name of the category is the same as the expense category.
-            if cat[0] == expense[0]:
-                temp_cat_data.append(expense)
-        cat_data.append(temp_cat_data)
+        cat_total = cat_totals_by_name.get(cat[0], (cat[0], 0, 0, None, None, None))
+        cat_data.append([cat[0], cat[1], cat_total[2], cat_total[1], cat_total[3], cat_total[4], cat_total[5]])
 
     # Calculates how the expenses in a category compare to the budget.
     for cat in cat_data:
         budget = cat[1]
-        total = 0.0
-        # Adds the expense amounts to the running total.
-        for count, expense_data in enumerate(cat):
-            if count <= 1:
-                continue
-            else:
-                total += expense_data[2]
+        total = cat[2]
         # Gets a difference.
-        diff = str(abs(total - budget))
-        # Adds an extra 0 if required.
-        if diff[-2] == '.':
-            diff = diff + '0'
+        diff = global_utils.amount_format(abs(total - budget))
 
         # Chooses a comment for the category.
-        if budget == 0.0:
+        if budget == 0:
             comment = "You haven't added a budget yet."
-        elif budget > 0.0 and total == 0.0:
+        elif budget > 0 and total == 0:
             comment = "You haven't added any expenses to this category." 
-        elif budget > 0.0 and total > 0.0 and total < budget:
+        elif budget > 0 and total > 0 and total < budget:
             comment  = f'You are {diff} under your budget.'
-        elif budget > 0.0 and total > 0.0 and total > budget:
+        elif budget > 0 and total > 0 and total > budget:
             comment = f'You are {diff} over your budget!'
-        elif budget > 0.0 and total > 0.0 and total == budget:
+        elif budget > 0 and total > 0 and total == budget:
             comment = "You've spent all your budget."
         else:
             comment = "We don't have a comment for you."
@@ -202,11 +193,12 @@ def view_budget():
         print("\nCategory -- Budget -- Comment")
         for cat in cat_data:
             # Changes the budget depending on what it is.
-            cat_budget = str(cat[1])
-            if cat_budget == '0.0':
+            if cat[1] == 0:
                 cat_budget = 'N/A'
+            else:
+                cat_budget = global_utils.amount_format(cat[1])
             # Prints the catgeories and budgets.
-            print(f'{global_utils.name_capitalise(cat[0])} -- {global_utils.amount_format(cat_budget)} -- {cat[-1]}')
+            print(f'{global_utils.name_capitalise(cat[0])} -- {cat_budget} -- {cat[-1]}')
 
     # Gets the expense category to view a breakdown for.
     cat_to_view = budget_utils.get_cat_to_view(current_expense_cats)
@@ -215,4 +207,58 @@ def view_budget():
         return
     
     # Prints a breakdown of the category for the user.
-    budget_utils.cat_breakdown(cat_to_view, cat_data)
\ No newline at end of file
+    budget_utils.cat_breakdown(cat_to_view, cat_data)
+
+# Shows spending for each month.
+def view_monthly():
+    """
+    Shows how much was spent each month, in every category or in one, from the monthly totals.
+
+    Args:
+        None
+        
+    Returns:
+        None
+    """
+    # Get list of current expense categories.
+    current_expense_cats = expenses_db.get_cat_names()
+    # If the list is empty.
+    if len(current_expense_cats) == 0:
+        print("\nYou haven't added any expense categories.")
+        return
+    # If the get_cat_names() function has returned an error.
+    if current_expense_cats[0] == 1:
+        print("\nSorry, something went wrong accessing the expense categories database.")
+        print(f"Error: {current_expense_cats[1]}")
+        return
+
+    # Gets the category and months to show.
+    category = global_utils.get_search_category(current_expense_cats, 'show')
+    if category == 1:
+        return
+    elif category == 2:
+        category = None
+    months = {'first': None, 'last': None}
+    for limit in months:
+        month = global_utils.get_month(limit)
+        if month == 1:
+            return
+        elif month != 2:
+            months[limit] = month
+
+    # Gets the totals of each month.
+    monthly_totals = expenses_db.get_monthly_totals(category, months['first'], months['last'])
+    if len(monthly_totals) != 0 and monthly_totals[0] == 1:
+        print("\nSorry, something went wrong accessing the expenses database.")
+        print(f"Error: {monthly_totals[1]}")
+        return
+    if len(monthly_totals) == 0:
+        print("\nThere are no expenses in those months.")
+        return
+
+    # Prints the totals.
+    if category is None:
+        print("\nMonthly spending in every category:")
+    else:
+        print(f"\nMonthly spending in the {global_utils.name_capitalise(category)} category:")
+    global_utils.print_monthly_totals(monthly_totals, months['first'], months['last'])
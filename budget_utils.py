@@ -1,4 +1,5 @@
 # Utility functions for the budget part of the tracker.
+import expenses_db
 import global_utils
 
 # Gets the name of the expense category to change the budget of.
@@ -58,7 +59,7 @@ def get_budget_to_set(expense_category):
         expense_category: The name of the expense category whose budget is being set (str).
         
     Returns:
-        budget: The value of the category budget (float).
+        budget: The value of the category budget in cents (int).
         1: If the user wishes to return to the previous menu (int).
     """
     while True:
@@ -67,12 +68,8 @@ def get_budget_to_set(expense_category):
 : ''').lower()
         if budget_input == '0':
             return 1
-        if len(budget_input[budget_input.rfind('.')+1:]) != 2:
-            print("\nPlease enter a valid amount.")
-            continue
-        try:
-            budget = float(budget_input)
-        except ValueError:
+        budget = global_utils.amount_to_cents(budget_input)
+        if budget is None:
             print("\nPlease enter a valid amount.")
             continue
         return budget
@@ -84,7 +81,8 @@ def cat_breakdown(category_name, cat_data):
 
     Args:
         category_name: The name of the category to be broken down (str).
-        cat_data: Category data from the database (list of tuples of strings and floats).
+        cat_data: The name, budget, expense total, number of expenses, date of the latest expense, smallest
+                  and largest expense and comment of each category (list of lists of strings and ints).
         
     Returns:
         None
@@ -95,34 +93,42 @@ def cat_breakdown(category_name, cat_data):
             current_cat_data = cat
             break
 
-    expense_total = 0.0
-
-    print(f'\n{global_utils.name_capitalise(cat[0])} Expense Category Breakdown:')
+    print(f'\n{global_utils.name_capitalise(current_cat_data[0])} Expense Category Breakdown:')
 
-    if cat[1] == 0.0:
+    if current_cat_data[1] == 0:
         print("\nYou haven't set a budget for this category.")
     else:
-        budget = str(cat[1])
-        if budget[-2:] == '.0':
-            budget = budget + '0'
-        print(f'\nBudget: {budget}')
+        print(f'\nBudget: {global_utils.amount_format(current_cat_data[1])}')
 
-    if len(cat) == 3:
+    # Prints the expenses in the category as they are read.
+    expense_count = 0
+    try:
+        for expense in expenses_db.iter_expenses_from_category(category_name):
+            if expense_count == 0:
+                print('\nExpenses:')
+                print('    Name -- Amount -- Date Added')
+            print(f'    {global_utils.name_capitalise(expense[1])} -- {global_utils.amount_format(expense[2])} -- {global_utils.date_format(expense[3])}')
+            expense_count += 1
+    except Exception as e:
+        print("\nSorry, something went wrong accessing the expenses database.")
+        print(f"Error: {e}")
+        return
+
+    if expense_count == 0:
         print("\nYou haven't added any expenses to this category,")
     else:
-        print('\nExpenses:')
-        print('    Name -- Amount -- Date Added')
-        for item in current_cat_data:
-            if type(item) is tuple:
-                expense_total += item[2]
-                amount = str(item[2])
-                if amount[-2:] == '.0':
-                    amount = amount + '0'
-                print(f'    {global_utils.name_capitalise(item[1])} -- {amount} -- {item[3]}')
-
-        expense_total = str(expense_total)
-        if expense_total[-2:] == '.0':
-            expense_total = expense_total + '0'
-        print(f'\nExpense Total: {expense_total}')
+        print(f'\nExpense Total: {global_utils.amount_format(current_cat_data[2])}')
+        print(f'Number of Expenses: {current_cat_data[3]}')
+        # The totals were read before the expenses, so they may be empty if the category was empty then.
+        smallest, largest, latest = '-', '-', '-'
+        if current_cat_data[5] is not None:
+            smallest = global_utils.amount_format(current_cat_data[5])
+        if current_cat_data[6] is not None:
+            largest = global_utils.amount_format(current_cat_data[6])
+        if current_cat_data[4] is not None:
+            latest = global_utils.date_format(current_cat_data[4])
+        print(f'Smallest Expense: {smallest}')
+        print(f'Largest Expense: {largest}')
+        print(f'Latest Expense Added: {latest}')
 
-        print(f"\n{current_cat_data[-1]}")
\ No newline at end of file
+        print(f"\n{current_cat_data[-1]}")
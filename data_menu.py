@@ -0,0 +1,345 @@
+import import_db
+import export_db
+import report_db
+import data_utils
+import schema_db
+import global_utils
+
+# Contains all the menu functions for importing, exporting and reporting on data.
+
+def main_menu():
+    """
+    Lets the user select a data option.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    print("\nData Options")
+
+    while True:
+        user_input = input('''\nPlease select from one of the following options:
+1 - Import expenses from a CSV file
+2 - Import income from a CSV file
+3 - Import a QIF or OFX bank statement
+4 - Export expenses, income or goals
+5 - Rebuild the category totals
+6 - View an overview of everything
+0 - Return to previous menu
+: ''')
+
+        # Import expenses from a CSV file.
+        if user_input == '1':
+            import_csv('expenses')
+
+        # Import income from a CSV file.
+        elif user_input == '2':
+            import_csv('income')
+
+        # Import a QIF or OFX bank statement.
+        elif user_input == '3':
+            import_statement()
+
+        # Export expenses, income or goals.
+        elif user_input == '4':
+            export_table()
+
+        # Rebuild the category totals.
+        elif user_input == '5':
+            rebuild_totals()
+
+        # View an overview of everything.
+        elif user_input == '6':
+            view_overview()
+
+        # Return to previous menu.
+        elif user_input == '0':
+            return
+
+# Imports a CSV file.
+def import_csv(target):
+    """
+    Lets the user import expenses or income from a CSV file.
+
+    Args:
+        target: 'expenses' or 'income'. (str)
+
+    Returns:
+        None
+    """
+    # Tells the user what's happening.
+    print(f"\nImporting {target} from a CSV file.")
+
+    # Gets the categories the rows can be added to.
+    current_cats = import_db.get_target_cats(target)
+    if type(current_cats) != set:
+        print(f"\nSorry, something went wrong accessing the {target} categories database.")
+        print(f"Error: {current_cats[1]}")
+        return
+
+    # Gets the file to import.
+    path = data_utils.get_import_path()
+    if path == 1:
+        return
+
+    # Gets the columns of the file.
+    columns = import_db.get_csv_columns(path)
+    if len(columns) != 0 and columns[0] == 1:
+        print("\nSorry, something went wrong reading the file.")
+        print(f"Error: {columns[1]}")
+        return
+    if len(columns) == 0:
+        print("\nThe file is empty.")
+        return
+    print("\nThe columns in the file are:")
+    for column in columns:
+        print(column)
+
+    # Gets which column holds each field.
+    mapping = {}
+    for field, description, optional in (('name', 'name', False),
+                                         ('amount', 'amount', False),
+                                         ('category', 'category', True),
+                                         ('date', 'date', True)):
+        column = data_utils.get_column(columns, description, optional)
+        # If the result is 1, return to the previous menu.
+        if column == 1:
+            return
+        # If the result is 2, the file has no column for the field.
+        elif column == 2:
+            mapping[field] = None
+        else:
+            mapping[field] = column
+
+    # Gets the pattern of the dates if the file has them.
+    date_pattern = None
+    if mapping['date'] is not None:
+        date_pattern = data_utils.get_date_pattern()
+        if date_pattern == 1:
+            return
+        elif date_pattern == 2:
+            date_pattern = None
+
+    # Gets what to do about categories.
+    default_category = None
+    create_cats = False
+    if mapping['category'] is None:
+        if len(current_cats) == 0:
+            print(f"\nYou can't import {target} without a category column as you haven't added any {target} categories.")
+            return
+        default_category = data_utils.get_default_category(sorted(current_cats))
+        if default_category == 1:
+            return
+    else:
+        create_cats = data_utils.get_create_cats()
+
+    # Imports the file.
+    print(f"\nImporting {path}...")
+    import_result = import_db.import_csv(path, target, mapping, date_pattern, default_category, create_cats,
+                                         data_utils.print_progress)
+    if import_result[0] == 1:
+        print(f"\nSorry, something went wrong importing {path}. Rows in batches already written were kept.")
+        print(f"Error: {import_result[1]}")
+        return
+    data_utils.print_import_summary(import_result[1])
+
+# Imports a bank statement.
+def import_statement():
+    """
+    Lets the user import a QIF or OFX bank statement. Money going out is added to expenses and money
+    coming in is added to income.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Tells the user what's happening.
+    print("\nImporting a QIF or OFX bank statement.")
+
+    # Gets the categories the transactions can be added to.
+    current_cats = {}
+    for target in ('expenses', 'income'):
+        current_cats[target] = import_db.get_target_cats(target)
+        if type(current_cats[target]) != set:
+            print(f"\nSorry, something went wrong accessing the {target} categories database.")
+            print(f"Error: {current_cats[target][1]}")
+            return
+
+    # Gets the file to import.
+    path = data_utils.get_import_path()
+    if path == 1:
+        return
+
+    # Gets whether the file is QIF or OFX.
+    statement_format = import_db.get_statement_format(path)
+    if statement_format[0] == 1:
+        print("\nSorry, the file could not be read as a bank statement.")
+        print(f"Error: {statement_format[1]}")
+        return
+    print(f"\nReading the file as {statement_format.upper()}.")
+
+    # Gets the pattern of the dates, as QIF files don't all write them the same way.
+    date_pattern = None
+    if statement_format == 'qif':
+        date_pattern = data_utils.get_date_pattern('MM/DD/YYYY')
+        if date_pattern == 1:
+            return
+        elif date_pattern == 2:
+            date_pattern = None
+
+    # Gets what to do about categories.
+    create_cats = data_utils.get_create_cats()
+    default_cats = {}
+    for target in ('expenses', 'income'):
+        default_cat = data_utils.get_statement_category(target, sorted(current_cats[target]), create_cats)
+        # If the result is 1, return to the previous menu.
+        if default_cat == 1:
+            return
+        # If the result is 2, transactions without a category are skipped.
+        elif default_cat == 2:
+            default_cats[target] = None
+        else:
+            default_cats[target] = default_cat
+
+    # Imports the file.
+    print(f"\nImporting {path}...")
+    import_result = import_db.import_statement(path, statement_format, default_cats, date_pattern, create_cats,
+                                               data_utils.print_progress)
+    if import_result[0] == 1:
+        print(f"\nSorry, something went wrong importing {path}. Rows in batches already written were kept.")
+        print(f"Error: {import_result[1]}")
+        return
+    data_utils.print_import_summary(import_result[1])
+
+# Exports a table.
+def export_table():
+    """
+    Lets the user export expenses, income or goals to a CSV or JSON Lines file, optionally only for
+    one category or between two dates.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Tells the user what's happening.
+    print("\nExporting data.")
+
+    # Gets what to export and where to.
+    table = data_utils.get_export_table()
+    if table == 1:
+        return
+    export_format = data_utils.get_export_format()
+    if export_format == 1:
+        return
+    path = data_utils.get_export_path(export_format)
+    if path == 1:
+        return
+
+    # Gets the category to export.
+    if table == 'goals':
+        current_cats = ['income', 'saving']
+    else:
+        current_cats = import_db.get_target_cats(table)
+        if type(current_cats) != set:
+            print(f"\nSorry, something went wrong accessing the {table} categories database.")
+            print(f"Error: {current_cats[1]}")
+            return
+        current_cats = sorted(current_cats)
+    category = data_utils.get_export_category(current_cats)
+    if category == 1:
+        return
+    elif category == 2:
+        category = None
+
+    # Gets the dates to export between. Goals don't have dates.
+    dates = {'first': None, 'last': None}
+    if table != 'goals':
+        for limit in dates:
+            date_added = data_utils.get_export_date(limit)
+            if date_added == 1:
+                return
+            elif date_added != 2:
+                dates[limit] = date_added
+
+    # Exports the table.
+    print(f"\nExporting {table} to {path}...")
+    export_result = export_db.export_table(table, path, export_format, category, dates['first'], dates['last'],
+                                           data_utils.print_export_progress)
+    if export_result[0] == 1:
+        print(f"\nSorry, something went wrong exporting {table}.")
+        print(f"Error: {export_result[1]}")
+        return
+    print(f"\n{export_result[1]} rows were exported to {path}.")
+
+# Rebuilds the category totals.
+def rebuild_totals():
+    """
+    Adds up the running and monthly totals of every expense and income category again from the rows,
+    in case they have drifted.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    print("\nRebuilding the category totals...")
+    rebuild_result = schema_db.rebuild_totals()
+    if rebuild_result[0] == 1:
+        print("\nSorry, something went wrong rebuilding the category totals.")
+        print(f"Error: {rebuild_result[1]}")
+        return
+    print("\nThe category totals have been rebuilt.")
+
+# Shows an overview of the tracker.
+def view_overview():
+    """
+    Prints the totals of every expense and income category and the progress of every goal, all read
+    from the same snapshot of the db so they agree with each other.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    overview_result = report_db.get_overview()
+    if overview_result[0] == 1:
+        print("\nSorry, something went wrong reading the overview.")
+        print(f"Error: {overview_result[1]}")
+        return
+    overview = overview_result[1]
+
+    # Prints the categories of expenses and income.
+    for title, key in (('Expenses', 'expense_cats'), ('Income', 'income_cats')):
+        print(f"\n{title}:")
+        if len(overview[key]) == 0:
+            print("No categories added.")
+            continue
+        print("Category -- Count -- Total -- Latest Added")
+        for name, count, total, last_date, smallest, largest in overview[key]:
+            if last_date is None:
+                latest = 'N/A'
+            else:
+                latest = global_utils.date_format(last_date)
+            print(f"{global_utils.name_capitalise(name)} -- {count} -- {global_utils.amount_format(total)} -- {latest}")
+
+    # Prints the goals.
+    for title, key in (('Saving Goals', 'saving_goals'), ('Income Goals', 'income_goals')):
+        if len(overview[key]) == 0:
+            continue
+        print(f"\n{title}:")
+        print("Name -- Goal Amount -- Current Progress")
+        for goal in overview[key]:
+            print(f"{global_utils.name_capitalise(goal[0])} -- {global_utils.amount_format(goal[2])} -- {global_utils.amount_format(goal[3])}")
+
+    # Prints the balance.
+    print(f"\nTotal Income: {global_utils.amount_format(overview['income_total'])}")
+    print(f"Total Expenses: {global_utils.amount_format(overview['expense_total'])}")
+    print(f"Balance: {global_utils.amount_format(overview['income_total'] - overview['expense_total'])}")
@@ -0,0 +1,345 @@
+# Utility functions for the importing and exporting part of the tracker.
+import os
+import global_utils
+
+# Gets the path of a file to import.
+def get_import_path():
+    """
+    Gets the path of a file to import.
+
+    Args:
+        None
+
+    Returns:
+        path_input: The path of the file. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        path_input = input('''Please enter the path of the file you want to import. Enter 0 to return to the previous menu.
+: ''').strip()
+        if path_input == '0':
+            return 1
+        if os.path.isfile(path_input):
+            return path_input
+        print("\nThere is no file at that path.")
+
+# Gets the column of a CSV file that holds a field.
+def get_column(columns, field, optional):
+    """
+    Gets which column of a CSV file holds a field of the rows being imported.
+
+    Args:
+        columns: The names of the columns in the file. (list of str)
+        field: A description of the field, such as 'amount'. (str)
+        optional: If True, the user can say the file has no column for the field. (bool)
+
+    Returns:
+        column_input: The name of the column. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the field is optional and the file has no column for it. (int)
+    """
+    if optional:
+        skip_text = ' Enter none if there isn\'t one.'
+    else:
+        skip_text = ''
+    while True:
+        print('')
+        column_input = input(f'''Please enter the name of the column that holds the {field}.{skip_text}
+Enter 0 to return to the previous menu.
+: ''').strip()
+        if column_input == '0':
+            return 1
+        if optional and column_input.lower() == 'none':
+            return 2
+        if column_input in columns:
+            return column_input
+        print("\nYou did not enter the name of a column.")
+
+# Gets the pattern of the dates in a file.
+def get_date_pattern(default_format='YYYY-MM-DD'):
+    """
+    Gets the pattern the dates in a file are written in.
+
+    Args:
+        default_format: How the dates are written if the user doesn't enter a pattern. (str)
+
+    Returns:
+        pattern_input: A strptime pattern, such as %d/%m/%Y. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the dates are written in the default format. (int)
+    """
+    while True:
+        print('')
+        pattern_input = input(f'''Please enter the pattern of the dates, such as %d/%m/%Y. Press enter if they are written as {default_format}.
+Enter 0 to return to the previous menu.
+: ''').strip()
+        if pattern_input == '0':
+            return 1
+        if pattern_input == '':
+            return 2
+        if '%' in pattern_input:
+            return pattern_input
+        print("\nPlease enter a pattern using codes such as %d, %m and %Y.")
+
+# Gets the category for imported rows that don't have one.
+def get_default_category(current_cats):
+    """
+    Gets the category that imported rows without a category are added to.
+
+    Args:
+        current_cats: A list of the names of the current categories. (list of str)
+
+    Returns:
+        cat_input: The name of the category. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    print("\nThe current categories are:")
+    for cat in current_cats:
+        print(global_utils.name_capitalise(cat))
+    while True:
+        print('')
+        cat_input = input('''Please enter the name of the category to add the imported rows to. Enter 0 to return to the previous menu.
+: ''').lower()
+        if cat_input == '0':
+            return 1
+        if cat_input in current_cats:
+            return cat_input
+        print("\nYou did not enter the name of a category.")
+
+# Gets the category for statement transactions that don't have one.
+def get_statement_category(target, current_cats, create_cats):
+    """
+    Gets the category that expenses or income from a bank statement are added to if they don't have one.
+
+    Args:
+        target: 'expenses' or 'income'. (str)
+        current_cats: A list of the names of the current categories. (list of str)
+        create_cats: If True, the category doesn't have to exist yet. (bool)
+
+    Returns:
+        cat_input: The name of the category. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If transactions without a category should be skipped. (int)
+    """
+    if len(current_cats) != 0:
+        print(f"\nThe current {target} categories are:")
+        for cat in current_cats:
+            print(global_utils.name_capitalise(cat))
+    while True:
+        print('')
+        cat_input = input(f'''Please enter the category to add {target} without a category to. Enter none to skip them.
+Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if cat_input == '0':
+            return 1
+        if cat_input == 'none':
+            return 2
+        if cat_input in current_cats or (create_cats and cat_input != ''):
+            return cat_input
+        print("\nYou did not enter the name of a category.")
+
+# Checks if categories missing from the tracker should be created.
+def get_create_cats():
+    """
+    Asks if categories in an imported file that the tracker doesn't have yet should be created.
+
+    Args:
+        None
+
+    Returns:
+        True: If they should be created. (bool)
+        False: If rows in them should be skipped. (bool)
+    """
+    while True:
+        print('')
+        confirm_input = input('''Should categories in the file that don't exist yet be created? If not, their rows are skipped.
+Please enter yes or no.
+: ''').lower()
+        if confirm_input == 'yes' or confirm_input == 'y':
+            return True
+        elif confirm_input == 'no' or confirm_input == 'n':
+            return False
+        else:
+            print("\nPlease enter yes or no.")
+
+# Gets the table to export.
+def get_export_table():
+    """
+    Gets which table the user wants to export.
+
+    Args:
+        None
+
+    Returns:
+        'expenses', 'income' or 'goals': The table to export. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        table_input = input('''Please enter what you want to export: expenses, income or goals. Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if table_input == '0':
+            return 1
+        if table_input in ('expenses', 'income', 'goals'):
+            return table_input
+        print("\nPlease enter expenses, income or goals.")
+
+# Gets the format to export to.
+def get_export_format():
+    """
+    Gets the format the user wants to export to.
+
+    Args:
+        None
+
+    Returns:
+        'csv' or 'jsonl': The format to export to. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        format_input = input('''Please enter the format to export to: csv or jsonl. Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if format_input == '0':
+            return 1
+        if format_input in ('csv', 'jsonl'):
+            return format_input
+        print("\nPlease enter csv or jsonl.")
+
+# Gets the path of a file to export to.
+def get_export_path(export_format):
+    """
+    Gets the path of the file to export to, checking before a file is overwritten.
+
+    Args:
+        export_format: 'csv' or 'jsonl'. (str)
+
+    Returns:
+        path_input: The path of the file. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        path_input = input(f'''Please enter the path of the .{export_format} file to export to. Enter 0 to return to the previous menu.
+: ''').strip()
+        if path_input == '0':
+            return 1
+        if path_input == '':
+            print("\nPlease enter a path.")
+            continue
+        directory = os.path.dirname(path_input)
+        if directory != '' and not os.path.isdir(directory):
+            print("\nThere is no folder at that path.")
+            continue
+        if os.path.exists(path_input):
+            confirm_input = input('''\nThere is already a file at that path. Do you want to replace it? Please enter yes or no.
+: ''').lower()
+            if confirm_input != 'yes' and confirm_input != 'y':
+                continue
+        return path_input
+
+# Gets the category to export.
+def get_export_category(current_cats):
+    """
+    Gets the category the user wants to export the rows of.
+
+    Args:
+        current_cats: A list of the names of the categories. (list of str)
+
+    Returns:
+        cat_input: The name of the category. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the rows of every category should be exported. (int)
+    """
+    print("\nThe categories are:")
+    for cat in current_cats:
+        print(global_utils.name_capitalise(cat))
+    while True:
+        print('')
+        cat_input = input('''Please enter the category to export. Press enter to export every category.
+Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if cat_input == '0':
+            return 1
+        if cat_input == '':
+            return 2
+        if cat_input in current_cats:
+            return cat_input
+        print("\nYou did not enter the name of a category.")
+
+# Gets a date to limit an export to.
+def get_export_date(limit):
+    """
+    Gets the first or last date of the rows the user wants to export.
+
+    Args:
+        limit: 'first' or 'last'. (str)
+
+    Returns:
+        date_added: The date as the number of days since 1970-01-01. (int)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the export shouldn't be limited by this date. (int)
+    """
+    while True:
+        print('')
+        date_input = input(f'''Please enter the {limit} date to export as YYYY-MM-DD. Press enter for no limit.
+Enter 0 to return to the previous menu.
+: ''').strip()
+        if date_input == '0':
+            return 1
+        if date_input == '':
+            return 2
+        date_added = global_utils.date_to_days(date_input)
+        if date_added is not None:
+            return date_added
+        print("\nPlease enter a date as YYYY-MM-DD.")
+
+# Prints the progress of an import.
+def print_progress(summary):
+    """
+    Prints how many rows an import has read so far and how fast it is going.
+
+    Args:
+        summary: The summary of the import so far. (dict)
+
+    Returns:
+        None
+    """
+    rate = summary['read'] / max(summary['seconds'], 0.001)
+    print(f"{summary['read']} rows read, {summary['added']} added ({rate:.0f} rows per second)...")
+
+# Prints the summary of an import.
+def print_import_summary(summary):
+    """
+    Prints what an import did, including the first rows it couldn't import.
+
+    Args:
+        summary: The summary of the import. (dict)
+
+    Returns:
+        None
+    """
+    rate = summary['read'] / max(summary['seconds'], 0.001)
+    print(f"\nRead {summary['read']} rows in {summary['seconds']:.2f}s ({rate:.0f} rows per second).")
+    print(f"{summary['added']} rows were added and {summary['rejected']} were skipped.")
+    if len(summary['rejected_rows']) != 0:
+        print('\nLine -- Reason skipped')
+        for line, reason in summary['rejected_rows'][:10]:
+            print(f'{line} -- {reason}')
+        if summary['rejected'] > 10:
+            print(f"...and {summary['rejected'] - 10} more.")
+
+# Prints the progress of an export.
+def print_export_progress(count):
+    """
+    Prints how many rows an export has written so far.
+
+    Args:
+        count: The number of rows written. (int)
+
+    Returns:
+        None
+    """
+    if count % 100000 == 0:
+        print(f"{count} rows exported...")
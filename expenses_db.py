@@ -3,73 +3,21 @@
 ## Imports ##
 
 import sqlite3
-import os
+import tracker_db
 
-## Functions ##
-
-# Creates expenses database if it doesn't exist.
-def create_expenses():
-    """
-    Creates the expenses database if it doesn't already exist.
-
-    Args:
-        None
-        
-    Returns:
-        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
-    """
-    try:
-        db = sqlite3.connect('data/tracker')
-    except sqlite3.OperationalError:
-        os.mkdir('data')
-    try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS expenses(
-                        category TEXT,
-                        name TEXT UNIQUE PRIMARY KEY,
-                        amount FLOAT,
-                        date_added TEXT)''')
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        db.close()
-        return [1, e]
-    finally:
-        db.close()
+## Variables ##
 
-    return [0, 0]
+# Selects expenses as (category, name, amount, date_added, id), with the category by name.
+EXPENSE_SELECT = '''SELECT expense_cats.name, expenses.name, expenses.amount, expenses.date_added, expenses.id
+                    FROM expenses JOIN expense_cats ON expense_cats.id = expenses.category_id'''
 
-# Creates expense_cats database if it doesn't exist.
-def create_expense_cats():  
-    """
-    Creates the expense_cats database if it doesn't already exist.
+# The number of rows add_expenses_many inserts with each executemany call.
+CHUNK_SIZE = 1000
 
-    Args:
-        None
-        
-    Returns:
-        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
-    """  
-    try:
-        db = sqlite3.connect('data/tracker')
-    except sqlite3.OperationalError:
-        os.mkdir('data')
-    try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('CREATE TABLE IF NOT EXISTS expense_cats(name TEXT, budget FLOAT)')
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        db.close()
-        return [1, e]
-    finally:
-        db.close()
+# The most matches a search ranks by default. Only the newest are ranked when more expenses match.
+SEARCH_CANDIDATES = 2000
 
-    return [0, 0]
+## Functions ##
 
 # Gets a list of category names.
 def get_cat_names():
@@ -85,18 +33,14 @@ def get_cat_names():
     """
     cat_names = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
         cursor.execute('SELECT name FROM expense_cats')
         for row in cursor:
             for category in row:
                 cat_names.append(category)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return cat_names
 
 # Gets a list of categories.
@@ -109,21 +53,17 @@ def get_cat_list():
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        cat_list: A list of tuples of expense cat data. (list of tuples of strs and floats)
+        cat_list: A list of tuples of expense cat data. (list of tuples of strs and ints)
     """
     cat_list = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('SELECT * FROM expense_cats')
+        cursor.execute('SELECT name, budget FROM expense_cats')
         for row in cursor:
             cat_list.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return cat_list
 
 # Gets a list of expense names.
@@ -140,77 +80,117 @@ def get_name_list():
     """
     name_list = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT name
+        cursor.execute('''SELECT DISTINCT name
                           FROM expenses''')
         for row in cursor:
             for expense in row:
                 name_list.append(expense)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return name_list
         
-# Gets specific expense data.
-def get_expense(search_term):
+# Gets an expense by its id.
+def get_expense_by_id(expense_id):
     """
-    Gets specific expense data.
+    Gets the data of the expense with an id.
 
     Args:
-        search_term: The name of the expense that we want the data of. (str)
+        expense_id: The id of the expense. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        expense_info: A list of a tuple of expense data. (list of a tuple of str and floats)
+        expense_info: A list of the tuple of expense data, empty if there is no such expense. (list of a tuple of str and ints)
     """
     expense_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT * FROM expenses WHERE 
-                       category = ? OR name = ? OR amount = ? OR date_added = ?''',
-                       (search_term, search_term, search_term, search_term))
+        cursor.execute(EXPENSE_SELECT + ''' WHERE
+                       expenses.id = ?''',
+                       (expense_id,))
         for row in cursor:
             expense_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return expense_info
 
-# Gets all expense data.
-def get_all_expenses():
+# Gets the expenses with a name.
+def get_expenses_by_name(name, limit=None):
     """
-    Gets a list of expense data.
+    Gets a list of expense data for every expense with a name.
 
     Args:
-        None
+        name: The name of the expenses. (str)
+        limit: The most expenses to get, or None for all of them. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        expense_info: A list of strings containing expense names. (list of strs)
+        expense_info: A list of tuples of expense data. (list of tuples of strs and ints)
     """
     expense_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('SELECT * FROM expenses')
+        query = EXPENSE_SELECT + ''' WHERE
+                       expenses.name = ?
+                       ORDER BY expenses.id'''
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        cursor.execute(query, (name,))
         for row in cursor:
             expense_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return expense_info
 
+# Reads all expense data.
+def iter_all_expenses():
+    """
+    Reads the data of every expense, oldest first, a few rows at a time.
+
+    Args:
+        None
+
+    Yields:
+        expense: The expense data as (category, name, amount, date_added, id). (tuple of strs and ints)
+    """
+    yield from tracker_db.iter_rows(EXPENSE_SELECT + ' ORDER BY expenses.id')
+
+# Gets all expense data.
+def get_all_expenses():
+    """
+    Gets a list of expense data.
+
+    Args:
+        None
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        expense_info: A list of tuples of expense data. (list of tuples of strs and ints)
+    """
+    try:
+        return list(iter_all_expenses())
+    except Exception as e:
+        return [1, e]
+
+# Reads expenses from a single category.
+def iter_expenses_from_category(category):
+    """
+    Reads the data of the expenses in a category, oldest first, a few rows at a time.
+
+    Args:
+        category: The name of the category we want the data for. (str)
+
+    Yields:
+        expense: The expense data as (category, name, amount, date_added, id). (tuple of strs and ints)
+    """
+    yield from tracker_db.iter_rows(EXPENSE_SELECT + ''' WHERE
+                                    expense_cats.name = ?
+                                    ORDER BY expenses.id''',
+                                    (category,))
+
 # Gets expenses from a single category.
 def get_expenses_from_category(category):
     """
@@ -221,24 +201,331 @@ def get_expenses_from_category(category):
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        expense_info: A list of strings containing expense names. (list of strs)
+        expense_info: A list of tuples of expense data. (list of tuples of strs and ints)
+    """
+    try:
+        return list(iter_expenses_from_category(category))
+    except Exception as e:
+        return [1, e]
+
+# Gets a page of expenses.
+def get_expense_page(category, after_id, before_id, page_size):
+    """
+    Gets a page of expense data, oldest first, by seeking to the id of the expense next to it rather
+    than counting past the expenses before it, so every page takes the same time to get.
+
+    Args:
+        category: The name of the category to get the expenses of, or None for every category. (str)
+        after_id: The page starts after the expense with this id, or None. (int)
+        before_id: The page ends before the expense with this id, or None. (int)
+        page_size: The number of expenses on the page. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, expense_info, more]: 0 shows that nothing has gone wrong, expense_info is a list of tuples of
+                                 expense data and more is True if there are more expenses past the page
+                                 in the direction it was got. (list)
+    """
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append('expenses.category_id = (SELECT id FROM expense_cats WHERE name = ?)')
+        params.append(category)
+    # Pages before an expense are got newest first and then put back in order.
+    if before_id is not None:
+        conditions.append('expenses.id < ?')
+        params.append(before_id)
+        order = 'DESC'
+    else:
+        if after_id is not None:
+            conditions.append('expenses.id > ?')
+            params.append(after_id)
+        order = 'ASC'
+    query = EXPENSE_SELECT
+    if len(conditions) != 0:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    # Gets one more expense than fits on the page to see if there are more.
+    query += f' ORDER BY expenses.id {order} LIMIT ?'
+    params.append(page_size + 1)
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        expense_info = cursor.fetchall()
+    except Exception as e:
+        return [1, e]
+    more = len(expense_info) > page_size
+    expense_info = expense_info[:page_size]
+    if before_id is not None:
+        expense_info.reverse()
+    return [0, expense_info, more]
+
+# Gets expenses added between two dates.
+def get_expenses_between(start, end, limit=None):
+    """
+    Gets a list of expense data for the expenses added between two dates, oldest first.
+
+    Args:
+        start: The first date to include, as the number of days since 1970-01-01. (int)
+        end: The last date to include, as the number of days since 1970-01-01. (int)
+        limit: The most expenses to get, or None for all of them. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        expense_info: A list of tuples of expense data. (list of tuples of strs and ints)
+    """
+    expense_info = []
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        query = EXPENSE_SELECT + ''' WHERE
+                       date_added BETWEEN ? AND ?
+                       ORDER BY date_added'''
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        cursor.execute(query, (start, end))
+        for row in cursor:
+            expense_info.append(row)
+    except Exception as e:
+        return [1, e]
+    return expense_info
+
+# Gets expenses by an amount range.
+def get_expenses_by_amount(low, high, limit=None):
+    """
+    Gets a list of expense data for the expenses with an amount in a range, smallest first.
+
+    Args:
+        low: The smallest amount to include in cents. (int)
+        high: The largest amount to include in cents. (int)
+        limit: The most expenses to get, or None for all of them. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        expense_info: A list of tuples of expense data. (list of tuples of strs and ints)
     """
     expense_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT * FROM expenses WHERE
-                       category = ?''',
-                       (category,))
+        query = EXPENSE_SELECT + ''' WHERE
+                       amount BETWEEN ? AND ?
+                       ORDER BY amount, expenses.id'''
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        cursor.execute(query, (low, high))
         for row in cursor:
             expense_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
-    return expense_info    
+    return expense_info
+
+# Searches the names of expenses.
+def search_expenses(search_text, category=None, start=None, end=None, limit=None, candidates=SEARCH_CANDIDATES):
+    """
+    Searches the names of expenses with the full-text index, best matches first. Each word searched for
+    must be in the name, or start a word in it. Ranking takes time in proportion to the number of
+    matches, so at most candidates matches are ranked, newest first. When that many match, as with a
+    common word, the best of the newest are found rather than the best of all of them.
+
+    Args:
+        search_text: The words to search for. (str)
+        category: Only expenses in this category are found, or None for every category. (str)
+        start: The first date to include, as the number of days since 1970-01-01, or None. (int)
+        end: The last date to include, as the number of days since 1970-01-01, or None. (int)
+        limit: The most expenses to get, or None for all of them. (int)
+        candidates: The most matches to rank, or None to rank every match. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, expense_info, capped]: 0 shows that nothing has gone wrong, expense_info is a list of tuples
+                                   of expense data and capped is True if at least candidates expenses matched, so
+                                   only the newest were ranked. (list)
+    """
+    expense_info = []
+    capped = False
+    match = tracker_db.match_query(search_text)
+    if match is None:
+        return [0, expense_info, capped]
+    conditions = []
+    params = [match]
+    if category is not None:
+        conditions.append('expense_cats.name = ?')
+        params.append(category)
+    if start is not None:
+        conditions.append('expenses.date_added >= ?')
+        params.append(start)
+    if end is not None:
+        conditions.append('expenses.date_added <= ?')
+        params.append(end)
+    # Only the newest matches are ranked, as ranking every match of a common word takes time in
+    # proportion to the size of the table.
+    query = '''SELECT expense_cats.name, expenses.name, expenses.amount, expenses.date_added AS date_added, expenses.id,
+                      expenses_fts.rank AS rank
+               FROM expenses_fts
+               JOIN expenses ON expenses.id = expenses_fts.rowid
+               JOIN expense_cats ON expense_cats.id = expenses.category_id
+               WHERE expenses_fts MATCH ?'''
+    for condition in conditions:
+        query += ' AND ' + condition
+    if candidates is not None:
+        query += ' ORDER BY expenses_fts.rowid DESC LIMIT ?'
+        params.append(candidates)
+    # Ties, such as expenses with the same name, are shown newest first. The number of matches ranked is
+    # counted to see if the candidates ran out.
+    query = f'SELECT *, COUNT(*) OVER () FROM ({query}) ORDER BY rank, date_added DESC'
+    if limit is not None:
+        query += f' LIMIT {int(limit)}'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        for row in cursor:
+            expense_info.append(row[:5])
+            capped = candidates is not None and row[6] >= candidates
+    except Exception as e:
+        return [1, e]
+    return [0, expense_info, capped]
+
+# Gets the total of the expenses added between two dates.
+def get_expense_total_between(start, end):
+    """
+    Gets the total amount of the expenses added between two dates.
+
+    Args:
+        start: The first date to include, as the number of days since 1970-01-01. (int)
+        end: The last date to include, as the number of days since 1970-01-01. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        expense_total: The total amount of the expenses in cents. (int)
+    """
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute('''SELECT IFNULL(SUM(amount), 0) FROM expenses WHERE
+                       date_added BETWEEN ? AND ?''',
+                       (start, end))
+        expense_total = cursor.fetchone()[0]
+    except Exception as e:
+        return [1, e]
+    return expense_total
+
+# Gets the totals of each expense category.
+def get_cat_totals(category=None):
+    """
+    Gets the number, total, smallest and largest amount of the expenses in each category, and the date
+    the latest was added. The count, total and date are read from expense_cat_totals, which triggers keep
+    up to date, and the smallest and largest are two lookups in the category and amount index, so this
+    takes the same time however many expenses there are.
+
+    Args:
+        category: Only this category's totals are got, or None for every category. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        cat_totals: A tuple of (name, count, total, last_date, smallest, largest) for each category, with amounts
+                    in cents and the date as days since 1970-01-01. last_date, smallest and largest are None
+                    if a category has no expenses. (list of tuples of strs and ints)
+    """
+    cat_totals = []
+    query = '''SELECT expense_cats.name, IFNULL(expense_cat_totals.count, 0), IFNULL(expense_cat_totals.total, 0),
+                      expense_cat_totals.last_date,
+                      (SELECT MIN(amount) FROM expenses WHERE category_id = expense_cats.id),
+                      (SELECT MAX(amount) FROM expenses WHERE category_id = expense_cats.id)
+               FROM expense_cats LEFT JOIN expense_cat_totals ON expense_cat_totals.category_id = expense_cats.id'''
+    params = ()
+    if category is not None:
+        query += ' WHERE expense_cats.name = ?'
+        params = (category,)
+    query += ' ORDER BY expense_cats.name'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        for row in cursor:
+            cat_totals.append(row)
+    except Exception as e:
+        return [1, e]
+    return cat_totals
+
+# Gets the monthly totals of expenses.
+def get_monthly_totals(category=None, start=None, end=None):
+    """
+    Gets the number and total amount of the expenses added in each month, from expense_monthly, which triggers
+    keep up to date. A series over ten years reads at most 120 rows for each category, however many
+    expenses there are. Months with no expenses are left out.
+
+    Args:
+        category: Only this category's expenses are counted, or None for every category. (str)
+        start: The first month to get, as YYYY-MM, or None. (str)
+        end: The last month to get, as YYYY-MM, or None. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        monthly_totals: A tuple of (month, count, total) for each month in order, with the month as YYYY-MM
+                        and the total in cents. (list of tuples of strs and ints)
+    """
+    monthly_totals = []
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append('category_id = (SELECT id FROM expense_cats WHERE name = ?)')
+        params.append(category)
+    if start is not None:
+        conditions.append('month >= ?')
+        params.append(start)
+    if end is not None:
+        conditions.append('month <= ?')
+        params.append(end)
+    query = 'SELECT month, SUM(count), SUM(total) FROM expense_monthly'
+    if len(conditions) != 0:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' GROUP BY month ORDER BY month'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        for row in cursor:
+            monthly_totals.append(row)
+    except Exception as e:
+        return [1, e]
+    return monthly_totals
+
+# Gets the monthly totals of each expense category.
+def get_monthly_cat_totals(start=None, end=None):
+    """
+    Gets the number and total amount of the expenses added in each month for every category, from
+    expense_monthly. Months in which a category has no expenses are left out.
+
+    Args:
+        start: The first month to get, as YYYY-MM, or None. (str)
+        end: The last month to get, as YYYY-MM, or None. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        monthly_totals: A tuple of (category, month, count, total) for each category and month, ordered by
+                        category then month. (list of tuples of strs and ints)
+    """
+    monthly_totals = []
+    query = '''SELECT expense_cats.name, expense_monthly.month, expense_monthly.count, expense_monthly.total
+               FROM expense_monthly JOIN expense_cats ON expense_cats.id = expense_monthly.category_id
+               WHERE expense_monthly.month BETWEEN ? AND ?
+               ORDER BY expense_cats.name, expense_monthly.month'''
+    # Every YYYY-MM sorts between these.
+    if start is None:
+        start = '0000-00'
+    if end is None:
+        end = '9999-99'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, (start, end))
+        for row in cursor:
+            monthly_totals.append(row)
+    except Exception as e:
+        return [1, e]
+    return monthly_totals
 
 # Adds an expense.
 def add_expense(expense_info):
@@ -246,109 +533,156 @@ def add_expense(expense_info):
     Adds an expense.
 
     Args:
-        expense_info: A list of data to be added to the database. (list of strs and floats)
+        expense_info: A list of data to be added to the database. (list of strs and ints)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
+        [0, expense_id]: 0 shows that nothing has gone wrong and expense_id is the id of the new expense. (int)
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''INSERT INTO expenses
-                       (category, name, amount, date_added)
-                       VALUES(?, ?, ?, ?)''',
-                       (expense_info[0], expense_info[1], expense_info[2], expense_info[3]))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''INSERT INTO expenses
+                           (category_id, name, amount, date_added)
+                           VALUES((SELECT id FROM expense_cats WHERE name = ?), ?, ?, ?)''',
+                           (expense_info[0], expense_info[1], expense_info[2], expense_info[3]))
+            expense_id = cursor.lastrowid
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
-    return [0, 0]
+    return [0, expense_id]
 
-# Deletes an expense.
-def delete_expense(name):
+# Adds many expenses in one transaction.
+def add_expenses_many(expense_rows):
     """
-    Deletes an expense from the database.
+    Adds many expenses in a single transaction, inserting CHUNK_SIZE rows with each executemany call.
+    A row that can't be added, for example because its category doesn't exist, is reported in the
+    results and doesn't stop the others from being added.
 
     Args:
-        name: The name of the expense to be deleted. (str)
+        expense_rows: The expenses to add, each as [category, name, amount, date_added]. (iterable of lists of strs and ints)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
+        [0, results]: 0 shows that nothing has gone wrong and results has a result for each row in order, either
+                      [0, expense_id] if it was added or [1, e] if it wasn't. (list of lists)
     """
+    results = []
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM expenses WHERE
-                       name = ?''',
-                       (name,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            chunk = []
+            for expense_info in expense_rows:
+                chunk.append((expense_info[0], expense_info[1], expense_info[2], expense_info[3]))
+                if len(chunk) == CHUNK_SIZE:
+                    results.extend(add_expense_chunk(db, chunk))
+                    chunk = []
+            if len(chunk) != 0:
+                results.extend(add_expense_chunk(db, chunk))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
-    return [0, 0]
+    return [0, results]
 
-# Updates the information of an expense.
-def update_expense(updated_expense_info, expense_name):
+# Adds a chunk of expenses for add_expenses_many.
+def add_expense_chunk(db, chunk):
     """
-    Updates an expense in the database.
+    Adds a chunk of expenses with one executemany call. If any row in the chunk breaks a constraint, the
+    chunk is rolled back and its rows are added one at a time so each gets its own result. This must
+    run inside a transaction.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        chunk: The expenses to add, each as (category, name, amount, date_added). (list of tuples of strs and ints)
+        
+    Returns:
+        results: A result for each row in order, either [0, expense_id] or [1, e]. (list of lists)
+    """
+    insert_sql = '''INSERT INTO expenses
+                    (category_id, name, amount, date_added)
+                    VALUES((SELECT id FROM expense_cats WHERE name = ?), ?, ?, ?)'''
+    try:
+        with tracker_db.transaction():
+            # Pauses the search index, category totals and monthly totals triggers so the chunk can be
+            # indexed and added to the totals in one statement each, which is much faster than a row at a time.
+            db.execute('INSERT INTO triggers_paused(paused) VALUES(1)')
+            db.executemany(insert_sql, chunk)
+            last_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+            chunk_ids = (last_id - len(chunk) + 1, last_id)
+            db.execute('''INSERT INTO expenses_fts(rowid, name)
+                          SELECT id, name FROM expenses WHERE id BETWEEN ? AND ?''',
+                       chunk_ids)
+            db.execute('''INSERT INTO expense_cat_totals(category_id, count, total, last_date)
+                          SELECT category_id, COUNT(*), SUM(amount), MAX(date_added) FROM expenses
+                          WHERE id BETWEEN ? AND ? GROUP BY category_id
+                          ON CONFLICT(category_id) DO UPDATE SET count = count + excluded.count,
+                          total = total + excluded.total,
+                          last_date = MAX(IFNULL(last_date, excluded.last_date), excluded.last_date)''',
+                       chunk_ids)
+            db.execute('''INSERT INTO expense_monthly(category_id, month, count, total)
+                          SELECT category_id, strftime('%Y-%m', date_added * 86400, 'unixepoch'), COUNT(*), SUM(amount)
+                          FROM expenses WHERE id BETWEEN ? AND ? GROUP BY 1, 2
+                          ON CONFLICT(category_id, month) DO UPDATE SET count = count + excluded.count,
+                          total = total + excluded.total''',
+                       chunk_ids)
+            db.execute('DELETE FROM triggers_paused')
+    except sqlite3.IntegrityError:
+        results = []
+        for row in chunk:
+            try:
+                cursor = db.execute(insert_sql, row)
+                results.append([0, cursor.lastrowid])
+            except sqlite3.IntegrityError as e:
+                results.append([1, e])
+        return results
+    # The write lock is held for the whole transaction, so the chunk's rows were given consecutive ids.
+    first_id = last_id - len(chunk) + 1
+    results = []
+    for expense_id in range(first_id, last_id + 1):
+        results.append([0, expense_id])
+    return results
+
+# Deletes an expense.
+def delete_expense(expense_id):
+    """
+    Deletes an expense from the database.
 
     Args:
-        updated_expense_info: A list of the new expense data. (list of strings and floats)
-        name: The name of the expense to be changed. (str)
+        expense_id: The id of the expense to be deleted. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''UPDATE expenses SET
-                       category = ?, name = ?, amount = ?, date_added = ?
-                       WHERE name = ?''',
-                       (updated_expense_info[0], updated_expense_info[1], updated_expense_info[2], updated_expense_info[3], expense_name))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''DELETE FROM expenses WHERE
+                           id = ?''',
+                           (expense_id,))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
-# Deletes expenses associated with a category.
-def delete_expenses(category):
+# Updates the information of an expense.
+def update_expense(updated_expense_info, expense_id):
     """
-    Deletes expenses associated with an expense category.
+    Updates an expense in the database.
 
     Args:
-        category: The name of the expense category from which the expenses are to be deleted. (str)
+        updated_expense_info: A list of the new expense data. (list of strings and ints)
+        expense_id: The id of the expense to be changed. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM expenses WHERE
-                       category = ?''',
-                       (category,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE expenses SET
+                           category_id = (SELECT id FROM expense_cats WHERE name = ?), name = ?, amount = ?, date_added = ?
+                           WHERE id = ?''',
+                           (updated_expense_info[0], updated_expense_info[1], updated_expense_info[2], updated_expense_info[3], expense_id))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Adds a new expense category.
@@ -358,24 +692,19 @@ def add_expense_cat(name, budget):
 
     Args:
         name: The name of the expense category to be added. (str)
-        budget: The budget of the expense category. (float)
+        budget: The budget of the expense category in cents. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''INSERT INTO expense_cats(name,budget)
-                          VALUES(?, ?)''', (name, budget))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''INSERT INTO expense_cats(name,budget)
+                              VALUES(?, ?)''', (name, budget))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Updates the budget of an expense.
@@ -385,31 +714,49 @@ def update_cat_budget(name, new_budget):
 
     Args:
         name: The name of the expense category to be updated. (str)
-        new_budget: The new budget for the expense category. (float)
+        new_budget: The new budget for the expense category in cents. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''UPDATE expense_cats SET
-                       budget = ? WHERE name = ?''',
-                       (new_budget, name))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE expense_cats SET
+                           budget = ? WHERE name = ?''',
+                           (new_budget, name))
+    except Exception as e:
+        return [1, e]
+    return [0, 0]
+
+# Renames an expense category.
+def rename_expense_cat(name, new_name):
+    """
+    Renames an expense category. The expenses in it point at the category's id, so they don't change.
+
+    Args:
+        name: The name of the expense category to be renamed. (str)
+        new_name: The new name of the expense category. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, 0]: 0 shows that nothing has gone wrong.
+    """
+    try:
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE expense_cats SET
+                           name = ? WHERE name = ?''',
+                           (new_name, name))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Deletes an expense category.
 def delete_expense_cat(name):
     """
-    Deletes an expense category.
+    Deletes an expense category. The expenses in it are deleted along with it by the foreign key.
 
     Args:
         name: The name of the expense category to be deleted. (str)
@@ -419,16 +766,11 @@ def delete_expense_cat(name):
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM expense_cats WHERE
-                       name = ?''',
-                       (name,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''DELETE FROM expense_cats WHERE
+                           name = ?''',
+                           (name,))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
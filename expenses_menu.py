@@ -1,6 +1,5 @@
 import expenses_db
 import expenses_utils
-import datetime
 import global_utils
 
 # Contains all the menu functions for the expenses section of the tracker.
@@ -26,6 +25,8 @@ def main_menu():
 5 - View expenses by category
 6 - Add a new expense category
 7 - Delete an expense category                           
+8 - Rename an expense category
+9 - Search expenses
 0 - Return to previous menu
 : ''')
 
@@ -57,6 +58,14 @@ def main_menu():
         elif user_input == '7':
             delete_category()
 
+        # Rename an expense category.
+        elif user_input == '8':
+            rename_category()
+
+        # Search expenses.
+        elif user_input == '9':
+            search_expenses()
+
         # Return to previous menu.
         elif user_input == '0':
             return
@@ -82,16 +91,6 @@ def add_expense():
             print(f"Error: {current_expense_cats[1]}")
             return
     
-    # Get list of current expense names.
-    current_expense_names = expenses_db.get_name_list()
-    # If the list is not empty (there might be no expenses added).
-    if len(current_expense_names) != 0:
-        # If the get_cat_list() function has returned an error.
-        if current_expense_names[0] == 1:
-            print("\nSorry, something went wrong retrieving the expense names.")
-            print(f"Error: {current_expense_names[1]}")
-            return
-    
     # Tells the user what's happening.
     print("\nAdding a new expense.")
 
@@ -116,9 +115,9 @@ def add_expense():
         new_expense_info.append(new_expense_cat)
 
     # Gets the name of the new expense.
-    new_expense_name = expenses_utils.get_new_expense_name(current_expense_names)
+    new_expense_name = expenses_utils.get_new_expense_name()
     # If the result is 1, return to the previous menu.
-    if new_expense_cat == 1:
+    if new_expense_name == 1:
         return
     else:
         new_expense_info.append(new_expense_name)
@@ -132,7 +131,7 @@ def add_expense():
         new_expense_info.append(new_expense_amount)
 
     # Gets today's date.
-    new_expense_date = datetime.datetime.today().strftime('%Y-%m-%d')
+    new_expense_date = global_utils.today()
     new_expense_info.append(new_expense_date)
 
     # Adds the new expense to the tracker.
@@ -147,6 +146,86 @@ def add_expense():
     else:
         print("\nSorry, an unexpected error has occurred and the expense could not be added to the database.")
 
+# Finds the expenses the user is looking for.
+def find_expenses(action, current_expense_cats):
+    """
+    Lets the user search for an expense by name, ID, category, amount range, date range or a
+    search of the names. Each search uses an index, and at most MATCH_LIMIT expenses are shown to choose from.
+
+    Args:
+        action: What the user wants to do with the expense, such as 'edit'. (str)
+        current_expense_cats: A list of the names of the current expense categories. (list of str)
+
+    Returns:
+        matching_expenses: The data of the expenses found. (list of tuples of strs and ints)
+        1: If the user wishes to return to the previous menu, or nothing was found. (int)
+    """
+    # Gets what to search by.
+    lookup_type = global_utils.get_lookup_type('expense', action)
+    if lookup_type == 1:
+        return 1
+
+    # Gets what to search for and searches. One more expense than can be shown is got to see if there are more.
+    if lookup_type == 'name':
+        name = global_utils.get_lookup_name('expense')
+        if name == 1:
+            return 1
+        matching_expenses = expenses_db.get_expenses_by_name(name, global_utils.MATCH_LIMIT + 1)
+    elif lookup_type == 'id':
+        expense_id = global_utils.get_lookup_id('expense')
+        if expense_id == 1:
+            return 1
+        matching_expenses = expenses_db.get_expense_by_id(expense_id)
+    elif lookup_type == 'category':
+        if len(current_expense_cats) == 0:
+            print("\nYou haven't added any expense categories.")
+            return 1
+        category = global_utils.get_lookup_category(current_expense_cats)
+        if category == 1:
+            return 1
+        expense_page = expenses_db.get_expense_page(category, None, None, global_utils.MATCH_LIMIT + 1)
+        if expense_page[0] == 1:
+            matching_expenses = expense_page
+        else:
+            matching_expenses = expense_page[1]
+    elif lookup_type == 'amount':
+        amount_range = global_utils.get_amount_range()
+        if amount_range == 1:
+            return 1
+        matching_expenses = expenses_db.get_expenses_by_amount(amount_range[0], amount_range[1], global_utils.MATCH_LIMIT + 1)
+    elif lookup_type == 'search':
+        search_text = global_utils.get_search_text('expenses')
+        if search_text == 1:
+            return 1
+        search_result = expenses_db.search_expenses(search_text, limit=global_utils.MATCH_LIMIT + 1)
+        if search_result[0] == 1:
+            matching_expenses = search_result
+        else:
+            matching_expenses = search_result[1]
+            # If a common word matched too many to rank them all.
+            if search_result[2]:
+                print(f"\nYour search matched at least {expenses_db.SEARCH_CANDIDATES} expenses, so only the newest of them were ranked.")
+    else:
+        date_range = global_utils.get_date_range()
+        if date_range == 1:
+            return 1
+        matching_expenses = expenses_db.get_expenses_between(date_range[0], date_range[1], global_utils.MATCH_LIMIT + 1)
+
+    # If the search has returned an error.
+    if len(matching_expenses) != 0 and matching_expenses[0] == 1:
+        print("\nSorry, something went wrong accessing the expenses database.")
+        print(f"Error: {matching_expenses[1]}")
+        return 1
+    # If nothing was found.
+    if len(matching_expenses) == 0:
+        print("\nNo expenses matched your search.")
+        return 1
+    # If more expenses were found than can be shown.
+    if len(matching_expenses) > global_utils.MATCH_LIMIT:
+        print(f"\nOnly the first {global_utils.MATCH_LIMIT} expenses found are shown. Search more narrowly to see the rest.")
+        matching_expenses = matching_expenses[:global_utils.MATCH_LIMIT]
+    return matching_expenses
+
 # Deletes an expense
 def delete_expense():
     """
@@ -158,30 +237,37 @@ def delete_expense():
     Returns:
         None
     """
-    # Get list of current expense names.
-    current_expense_names = expenses_db.get_name_list()
-    # If the list is not empty (there might be no expenses added).
-    if len(current_expense_names) != 0:
-        # If the get_cat_list() function has returned an error.
-        if current_expense_names[0] == 1:
-            print("\nSorry, something went wrong retrieving the expense names.")
-            print(f"Error: {current_expense_names[1]}")
+    # Get list of current expense categories.
+    current_expense_cats = expenses_db.get_cat_names()
+    # If the list is not empty (there might be no categories added).
+    if len(current_expense_cats) != 0:
+        # If the get_cat_names() function has returned an error.
+        if current_expense_cats[0] == 1:
+            print("\nSorry, something went wrong accessing the expense categories database.")
+            print(f"Error: {current_expense_cats[1]}")
             return
 
     # Tells the user what's happening.
     print("\nDeleting an expense.")
 
-    # Get the name of the expense to delete.
-    expense_to_delete = expenses_utils.get_expense_to_delete(current_expense_names)
-    # Returns to the previous menu if expense_to_delete returns 1.
-    if expense_to_delete == 1:
+    # Finds the expenses the user is looking for.
+    matching_expenses = find_expenses('delete', current_expense_cats)
+    # Returns to the previous menu if find_expenses returns 1.
+    if matching_expenses == 1:
         return
+
+    # Gets the expense to delete if more than one was found.
+    expense_to_delete_info = expenses_utils.get_expense_from_matches(matching_expenses)
+    # Returns to the previous menu if get_expense_from_matches returns 1.
+    if expense_to_delete_info == 1:
+        return
+    expense_to_delete = expense_to_delete_info[1]
     
     # Tells the user what's happening.
     print(f"\nDeleting {global_utils.name_capitalise(expense_to_delete)} from the database...")
 
     # Deletes the existing expense from the database.
-    delete_expense_result = expenses_db.delete_expense(expense_to_delete)
+    delete_expense_result = expenses_db.delete_expense(expense_to_delete_info[4])
     # Handles unexpected behaviour of the function not returning a list/anything.
     if len(delete_expense_result) == 0:
         print(f"\nAn unexpected error occurred while trying to delete {global_utils.name_capitalise(expense_to_delete)} from the database.")
@@ -222,51 +308,32 @@ def edit_expense():
             print(f"Error: {current_expense_cats[1]}")
             return
     
-    # Get list of current expense names.
-    current_expense_names = expenses_db.get_name_list()
-    # If the list is not empty (there might be no expenses added).
-    if len(current_expense_names) != 0:
-        # If the get_cat_list() function has returned an error.
-        if current_expense_names[0] == 1:
-            print("\nSorry, something went wrong retrieving the expense names.")
-            print(f"Error: {current_expense_names[1]}")
-            return
-
-    # Lists the current expenses.
-    print("\nList of current expenses:\n")
-    for expense in current_expense_names:
-        print(global_utils.name_capitalise(expense))
+    # Finds the expenses the user is looking for.
+    matching_expenses = find_expenses('edit', current_expense_cats)
+    # If the result is 1, return to the previous menu.
+    if matching_expenses == 1:
+        return
 
-    # Gets the name of the expense to edit from the user.
-    expense_name_to_edit = expenses_utils.get_expense_to_edit(current_expense_names)
+    # Gets the current info of the expense that's going to be edited, if more than one was found.
+    expense_to_edit_current_info = expenses_utils.get_expense_from_matches(matching_expenses)
     # If the result is 1, return to the previous menu.
-    if expense_name_to_edit == 1:
+    if expense_to_edit_current_info == 1:
         return
 
     # Tells the user what's happening.
-    print(f"\nYou are editing the {global_utils.name_capitalise(expense_name_to_edit)} expense.")
-
-    # Gets the current info from the database of the expense that's going to be edited.
-    expense_to_edit_current_info = expenses_db.get_expense(expense_name_to_edit)
-    # If the list is not empty.
-    if len(expense_to_edit_current_info) != 0:
-        # If the get_expense() function has returned an error.
-        if expense_to_edit_current_info[0] == 1:
-            print(f"\nSorry, something went wrong retrieving {global_utils.name_capitalise(expense_to_edit_current_info)}'s information.")
-            print(f"Error: {expense_to_edit_current_info[1]}")
-            return
+    print(f"\nYou are editing the {global_utils.name_capitalise(expense_to_edit_current_info[1])} expense.")
 
     # Create an empty list to add the new expense data to.    
     new_expense_info = []
 
     # Gets the change of expense category if required.
-    edited_expense_cat = expenses_utils.get_edit_expense_cat(current_expense_cats, expense_to_edit_current_info[0])
+    edited_expense_cat = expenses_utils.get_edit_expense_cat(current_expense_cats, expense_to_edit_current_info)
     # If the result is 1, return to the previous menu.
     if edited_expense_cat == 1:
         return
     # If the result is 2, no change so add current info to new_expense_info
     elif edited_expense_cat == 2:
-        new_expense_info.append(expense_to_edit_current_info[0][0])
+        new_expense_info.append(expense_to_edit_current_info[0])
     # Otherwise add the new expense category to new_expense_info.
     else:
         new_expense_info.append(edited_expense_cat)
@@ -274,13 +341,13 @@ def edit_expense():
     #print(new_expense_info)
 
     # Gets the change of name if required.
-    edited_expense_name = expenses_utils.get_edit_expense_name(current_expense_names, expense_to_edit_current_info[0])
+    edited_expense_name = expenses_utils.get_edit_expense_name(expense_to_edit_current_info)
     # If the result is 1, return to the previous menu.
     if edited_expense_name == 1:
         return
     # If the result is 2, no change so add current info to new_expense_info
     elif edited_expense_name == 2:
-        new_expense_info.append(expense_to_edit_current_info[0][1])
+        new_expense_info.append(expense_to_edit_current_info[1])
     # Otherwise add the new name to new_expense_info.
     else:
         new_expense_info.append(edited_expense_name)
@@ -288,13 +355,13 @@ def edit_expense():
     #print(new_expense_info)
 
     # Gets the change of value if required.
-    edited_expense_amount = expenses_utils.get_edit_expense_amount(expense_to_edit_current_info[0])
+    edited_expense_amount = expenses_utils.get_edit_expense_amount(expense_to_edit_current_info)
     # If the result is 1, return to the previous menu.
     if edited_expense_amount == 1:
         return
     # If the result is 2, no change so add current info to new_expense_info
     elif edited_expense_amount == 2:
-        new_expense_info.append(expense_to_edit_current_info[0][2])
+        new_expense_info.append(expense_to_edit_current_info[2])
     # Otherwise add the new amount to new_expense_info.
     else:
         new_expense_info.append(edited_expense_amount)
@@ -302,16 +369,16 @@ def edit_expense():
     #print(new_expense_info)
 
     # Gets today's date.
-    new_expense_date = datetime.datetime.today().strftime('%Y-%m-%d')
+    new_expense_date = global_utils.today()
     new_expense_info.append(new_expense_date)
 
     # Checks if anything has changed. If not, returns.
-    if list(expense_to_edit_current_info[0][0:3]) == new_expense_info[0:3]:
+    if list(expense_to_edit_current_info[0:3]) == new_expense_info[0:3]:
         print("\nNo changes were made to the expense.")
         return
 
     # Updates the expense with the new info.
-    edit_expense_result = expenses_db.update_expense(new_expense_info, expense_to_edit_current_info[0][1])
+    edit_expense_result = expenses_db.update_expense(new_expense_info, expense_to_edit_current_info[4])
     if edit_expense_result[0] == 1:
         print("\nSorry, something went wrong while updating the expense.")
         print(f"Error: {edit_expense_result[1]}")
@@ -333,31 +400,11 @@ def view_all():
     Returns:
         None
     """
-    # Get list of all expenses.
-    expense_info = expenses_db.get_all_expenses()
-    # If the list is empty.
-    if len(expense_info) == 0:
+    # Lets the user browse the expenses a page at a time.
+    browse_result = global_utils.browse_pages(expenses_db.get_expense_page, None, 'all expenses', 'expenses')
+    # If no expenses have been added.
+    if browse_result == 2:
         print("\nYou haven't added any expenses.")
-        return
-    # If get_all_expenses() has returned an error.
-    if expense_info[0] == 1:
-        print("\nSorry, something went wrong accessing the expenses database.")
-        print(f"Error: {expense_info[1]}")
-        return
-
-    # Tells the user what's happening.
-    print("\nViewing all expenses:\n")
-
-    # Prints all the expenses.
-    print("Name -- Category -- Amount -- Date Added")
-    for expense in expense_info:
-        print(f"{global_utils.name_capitalise(expense[1])} -- {global_utils.name_capitalise(expense[0])} -- {global_utils.amount_format(expense[2])} -- {expense[3]}")
-    
-    # Prints how many expenses have been added.
-    if len(expense_info) == 1:
-        print(f"\nYou have added 1 expense to the database.")
-    else:
-        print(f"\nYou have added {len(expense_info)} expenses to the database.")
 
 # Views expenses by category.
 def view_by_category():
@@ -398,33 +445,85 @@ def view_by_category():
         if cat_to_view == 1:
             return
 
-        # Gets the expenses in that category.
-        expense_info = expenses_db.get_expenses_from_category(cat_to_view)
-
-        # If the category list is empty.
-        if len(expense_info) == 0:
+        # Lets the user browse the expenses in that category a page at a time.
+        browse_result = global_utils.browse_pages(expenses_db.get_expense_page, cat_to_view,
+                                                  f"expenses in the {global_utils.name_capitalise(cat_to_view)} category",
+                                                  'expenses')
+        # If the category is empty.
+        if browse_result == 2:
             print("\nYou haven't added any expenses to this category.")
             continue
-        # If get_all_expenses() has returned an error.
-        if expense_info[0] == 1:
-            print("\nSorry, something went wrong accessing the expenses database.")
-            print(f"Error: {expense_info[1]}")
+        return
+
+# Searches expenses.
+def search_expenses():
+    """
+    Lets the user search the names of expenses, optionally in one category or between two dates, and
+    prints the best matches first.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Get list of current expense categories.
+    current_expense_cats = expenses_db.get_cat_names()
+    # If the list is not empty (there might be no categories added).
+    if len(current_expense_cats) != 0:
+        # If the get_cat_names() function has returned an error.
+        if current_expense_cats[0] == 1:
+            print("\nSorry, something went wrong accessing the expense categories database.")
+            print(f"Error: {current_expense_cats[1]}")
             return
-        break
+    else:
+        print("\nYou haven't added any expense categories.")
+        return
 
-    # Tells the user what's happening.
-    print(f"\nViewing expenses in the {global_utils.name_capitalise(cat_to_view)} category:\n")
+    # Gets what to search for.
+    search_text = global_utils.get_search_text('expenses')
+    if search_text == 1:
+        return
+
+    # Gets the category and dates to search between.
+    category = global_utils.get_search_category(current_expense_cats)
+    if category == 1:
+        return
+    elif category == 2:
+        category = None
+    dates = {'first': None, 'last': None}
+    for limit in dates:
+        date_added = global_utils.get_search_date(limit)
+        if date_added == 1:
+            return
+        elif date_added != 2:
+            dates[limit] = date_added
 
-    # Prints all the expenses.
+    # Searches, getting one more than can be shown to see if there are more.
+    search_result = expenses_db.search_expenses(search_text, category, dates['first'], dates['last'], global_utils.MATCH_LIMIT + 1)
+    # If the search has returned an error.
+    if search_result[0] == 1:
+        print("\nSorry, something went wrong accessing the expenses database.")
+        print(f"Error: {search_result[1]}")
+        return
+    matching_expenses = search_result[1]
+    # If nothing was found.
+    if len(matching_expenses) == 0:
+        print("\nNo expenses matched your search.")
+        return
+
+    # Prints the matches, best first.
+    print(f"\nExpenses matching '{search_text}':\n")
     print("Name -- Category -- Amount -- Date Added")
-    for expense in expense_info:
-        print(f"{global_utils.name_capitalise(expense[1])} -- {global_utils.name_capitalise(expense[0])} -- {global_utils.amount_format(expense[2])} -- {expense[3]}")
-    
-    # Prints how many expenses have been added.
-    if len(expense_info) == 1:
-        print(f"\nThere is 1 expense in this category.")
-    else:
-        print(f"\nThere are {len(expense_info)} expenses in this category.")
+    for row in matching_expenses[:global_utils.MATCH_LIMIT]:
+        print(f"{global_utils.name_capitalise(row[1])} -- {global_utils.name_capitalise(row[0])} -- {global_utils.amount_format(row[2])} -- {global_utils.date_format(row[3])}")
+    # If more were found than can be shown.
+    if len(matching_expenses) > global_utils.MATCH_LIMIT:
+        print(f"\nOnly the best {global_utils.MATCH_LIMIT} expenses found are shown. Search more narrowly to see the rest.")
+    # If a common word matched too many to rank them all.
+    if search_result[2]:
+        print(f"\nYour search matched at least {expenses_db.SEARCH_CANDIDATES} expenses, so only the newest of them were ranked.")
+        print("Search with more words, in one category or between two dates for fewer matches.")
 
 # Adds a new expense category.
 def add_category():
@@ -463,7 +562,7 @@ def add_category():
         return
     
     # Adds a zero budget placeholder to the expense.
-    new_expense_cat_budget = 0.0
+    new_expense_cat_budget = 0
     
     # Tells the user what's happening.
     print(f"\nAdding {global_utils.name_capitalise(new_expense_cat_name)} to the database...")
@@ -537,7 +636,8 @@ def delete_category():
     
     # If successful, the first index of the result list is 0.
     if delete_cat_result[0] == 0:
-        print(f"\n{global_utils.name_capitalise(expense_cat_to_delete)} was successfully deleted from the expense categories database.")
+        print(f"\n{global_utils.name_capitalise(expense_cat_to_delete)} and everything in it were successfully deleted from the database.")
+        return
     # If unsuccessful, the first index will be 1.
     elif delete_cat_result[0] == 1:
         print(f"\nSorry, something went wrong and {global_utils.name_capitalise(expense_cat_to_delete)} could not be deleted from the database.")
@@ -547,24 +647,59 @@ def delete_category():
     else:
         print(f"\nAn unexpected error occurred while trying to delete {global_utils.name_capitalise(expense_cat_to_delete)} from the database.")
         return
-    
-    # Deletes the expenses associated with the category from the database.
-    delete_expenses_result = expenses_db.delete_expenses(expense_cat_to_delete)
-    # Handles unexpected behaviour of the function not returning a list/anything.
-    if len(delete_expenses_result) == 0:
-        print(f"\nAn unexpected error occurred while trying to delete expenses from the database.")
+
+# Renames an expense category.
+def rename_category():
+    """
+    Lets the user rename an expense category.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Get list of current expense categories.
+    current_expense_cats = expenses_db.get_cat_names()
+    # If the list is empty.
+    if len(current_expense_cats) == 0:
+        print("\nYou haven't added any expense categories.")
         return
-    
-    # If successful, the first index of the result list is 0.
-    if delete_expenses_result[0] == 0:
-        print(f"\nExpenses associated with {global_utils.name_capitalise(expense_cat_to_delete)} were successfully deleted from the expense categories database.")
+    # If the get_cat_names() function has returned an error.
+    if current_expense_cats[0] == 1:
+        print("\nSorry, something went wrong accessing the expense categories database.")
+        print(f"Error: {current_expense_cats[1]}")
         return
-    # If unsuccessful, the first index will be 1.
-    elif delete_cat_result[0] == 1:
-        print(f"\nSorry, something went wrong and the expenses could not be deleted from the database.")
-        print(f"Error: {delete_cat_result[1]}")
+
+    # Tells the user what's happening.
+    print("\nRenaming an expense category.")
+
+    # Prints the current categories.
+    print("\nThe current expense categories are:")
+    for expense_cat in current_expense_cats:
+        print(global_utils.name_capitalise(expense_cat))
+
+    # Get the name of the expense category to rename.
+    expense_cat_to_rename = expenses_utils.get_cat_to_rename(current_expense_cats)
+    # Returns to the previous menu if get_cat_to_rename returns 1.
+    if expense_cat_to_rename == 1:
         return
+
+    # Get the new name of the expense category.
+    new_expense_cat_name = expenses_utils.get_new_cat_name(current_expense_cats)
+    # Returns to the previous menu if get_new_cat_name returns 1.
+    if new_expense_cat_name == 1:
+        return
+
+    # Renames the expense category in the database.
+    rename_cat_result = expenses_db.rename_expense_cat(expense_cat_to_rename, new_expense_cat_name)
+    # If successful, the first index of the result list is 0.
+    if rename_cat_result[0] == 0:
+        print(f"\n{global_utils.name_capitalise(expense_cat_to_rename)} was successfully renamed to {global_utils.name_capitalise(new_expense_cat_name)}.")
+    # If unsuccessful, the first index will be 1.
+    elif rename_cat_result[0] == 1:
+        print(f"\nSorry, something went wrong and {global_utils.name_capitalise(expense_cat_to_rename)} could not be renamed.")
+        print(f"Error: {rename_cat_result[1]}")
     # Handles behaviour if the result contains anything other than the expected conditions.
     else:
-        print(f"\nAn unexpected error occurred while trying to delete expenses from the database.")
-        return    
\ No newline at end of file
+        print(f"\nAn unexpected error occurred while trying to rename {global_utils.name_capitalise(expense_cat_to_rename)}.")
@@ -49,12 +49,12 @@ def get_new_expense_cat(current_expense_cats):
             print("\nYou did not enter the name of a category.")
 
 # Gets the name of a new expense.
-def get_new_expense_name(current_expense_names):
+def get_new_expense_name():
     """
     Gets the name of a new expense.
 
     Args:
-        current_expense_names: A list of the names of the existing expenses. (list of str)
+        None
         
     Returns:
         name_input: The name of the new expense. (str)
@@ -62,14 +62,11 @@ def get_new_expense_name(current_expense_names):
     """
     while True:
         print('')
-        name_input = input('''Please describe the expense. It must be unique.
+        name_input = input('''Please describe the expense.
 Enter 0 to return to the previous menu.
 : ''').lower()
         if name_input == '0':
             return 1
-        if name_input in current_expense_names:
-            print("\nThe expense name you entered matches an existing name.")
-            continue
         return name_input
 
 # Gets the amount of a new expense.
@@ -81,7 +78,7 @@ def get_new_expense_amount():
         None
         
     Returns:
-        amount: The value of the new expense. (float)
+        amount: The value of the new expense in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     while True:
@@ -90,12 +87,8 @@ def get_new_expense_amount():
 : ''').lower()
         if amount_input == '0':
             return 1
-        if len(amount_input[amount_input.rfind('.')+1:]) != 2:
-            print("\nPlease enter a valid amount.")
-            continue
-        try:
-            amount = float(amount_input)
-        except ValueError:
+        amount = global_utils.amount_to_cents(amount_input)
+        if amount is None:
             print("\nPlease enter a valid amount.")
             continue
         return amount
@@ -107,7 +100,7 @@ def get_edit_expense_cat(current_expense_cats, current_expense_info):
 
     Args:
         current_expense_cats: A list of the names of the current expense categories. (list of str)
-        current_expense_info: A list of the current expense info. (list of strings, floats)
+        current_expense_info: A list of the current expense info. (list of strings, ints)
         
     Returns:
         new_cat_input: The name of the expense category of the edited expense. (str)
@@ -144,13 +137,12 @@ Would you like to change it? Please enter yes or no.
             print("\nYou did not enter the name of a category.")
 
 # Gets a new name for an expense edit.
-def get_edit_expense_name(current_expense_names, current_expense_info):
+def get_edit_expense_name(current_expense_info):
     """
     Checks if the user wants to edit the name of an expense and gets the new name if they do.
 
     Args:
-        current_expense_names: A list of the names of the current expenses. (list of str)
-        current_expense_info: A list of the current expense info. (list of strings, floats)
+        current_expense_info: A list of the current expense info. (list of strings, ints)
         
     Returns:
         new_name_input: The new name of the expense. (str)
@@ -169,22 +161,14 @@ Would you like to change it? Please enter yes or no.
         else:
             print("\nPlease enter yes or no.")
 
-    # Prints a list of current expense names.
-    print('\nThe current expense names are:')
-    for name in current_expense_names:
-        print(global_utils.name_capitalise(name))
-
     # Gets a new name if needed.
     while True:
         print('')
-        new_name_input = input(f'''Please enter a new name for the expense. It must be unique.
+        new_name_input = input(f'''Please enter a new name for the expense.
 Enter 0 to return to the previous menu.
 : ''').lower()
         if new_name_input == '0':
             return 1
-        if new_name_input in current_expense_names:
-            print("\nThe expense name you entered matches an existing name.")
-            continue
         return new_name_input
 
 # Gets a new amount for an expense edit.
@@ -193,10 +177,10 @@ def get_edit_expense_amount(current_expense_info):
     Checks if the user wants to edit the value of an expense and gets the new value if they do.
 
     Args:
-        current_expense_info: A list of the current expense info. (list of strings, floats)
+        current_expense_info: A list of the current expense info. (list of strings, ints)
         
     Returns:
-        new_amount: The new value of the expense. (str)
+        new_amount: The new value of the expense in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """ 
     # Checks if the user wants to edit the expense amount.
@@ -219,84 +203,89 @@ Would you like to change it? Please enter yes or no.
 : ''').lower()
         if new_amount_input == '0':
             return 1
-        if len(new_amount_input[new_amount_input.rfind('.')+1:]) != 2:
+        new_amount = global_utils.amount_to_cents(new_amount_input)
+        if new_amount is None:
             print("Please enter a valid amount.")
             continue
-        try:
-            new_amount = float(new_amount_input)
-        except ValueError:
-            print("Please enter a valud amount.")
-            continue
         return new_amount
         
-# Gets the name of the expense to edit.        
-def get_expense_to_edit(current_expense_names):
+# Gets one expense from the expenses found by a search.
+def get_expense_from_matches(matching_expenses):
     """
-    Gets the name of the expense the user wants to change.
+    Gets the expense the user means when their search found more than one.
 
     Args:
-        current_expense_names: A list of the names of the current expenses. (list of str)
+        matching_expenses: A list of the data of the expenses found. (list of tuples of strs and ints)
         
     Returns:
-        name_input: The name of the expense the user wants to edit. (str)
+        expense_info: The data of the chosen expense. (tuple of strs and ints)
         1: If the user wishes to return to the previous menu. (int)
-    """ 
+    """
+    if len(matching_expenses) == 1:
+        return matching_expenses[0]
+
+    # Prints the matching expenses so the user can pick one by id.
+    print(f'\n{len(matching_expenses)} expenses were found.')
+    print('ID -- Name -- Category -- Amount -- Date Added')
+    for expense_info in matching_expenses:
+        print(f'{expense_info[4]} -- {global_utils.name_capitalise(expense_info[1])} -- {global_utils.name_capitalise(expense_info[0])} -- {global_utils.amount_format(expense_info[2])} -- {global_utils.date_format(expense_info[3])}')
+
     while True:
         print('')
-        name_input = input('''Please enter the name of the expense you want to edit. Enter 0 to return to the previous menu.
+        id_input = input('''Please enter the ID of the expense. Enter 0 to return to the previous menu.
 : ''').lower()
-        if name_input == '0':
+        if id_input == '0':
             return 1
-        if name_input in current_expense_names:
-            return name_input
-        else:
-            print("\nYou did not enter the name of a expense.")     
+        for expense_info in matching_expenses:
+            if str(expense_info[4]) == id_input:
+                return expense_info
+        print("\nYou did not enter one of the IDs shown.")
 
-# Gets the name of the expense to delete.
-def get_expense_to_delete(current_expense_names):
+# Gets the name of the category to view.
+def get_cat_to_view(current_expense_cats):
     """
-    Gets the name of the expense the user wants to delete.
+    Gets the name of the expense category the user wants to view.
 
     Args:
-        current_expense_names: A list of the names of the current expenses. (list of str)
+        current_expense_cats: A list of the names of the current expense categories. (list of str)
         
     Returns:
-        name_input: The name of the expense the user wants to edit. (str)
+        cat_input: The name of the expense category the user wants to view. (str)
         1: If the user wishes to return to the previous menu. (int)
     """ 
     while True:
         print('')
-        name_input = input('''Please enter the name of the expense you want to delete. Enter 0 to return to the previous menu.
+        cat_input = input('''Please enter the name of the category you want to view. Enter 0 to return to the previous menu.
 : ''').lower()
-        if name_input == '0':
+        if cat_input == '0':
             return 1
-        if name_input in current_expense_names:
-            return name_input
+        if cat_input in current_expense_cats:
+            return cat_input
         else:
-            print("\nYou did not enter the name of a expense.")   
+            print("\nYou did not enter the name of a category.") 
 
-# Gets the name of the category to view.
-def get_cat_to_view(current_expense_cats):
+# Gets the name of the category to rename.
+def get_cat_to_rename(current_expense_cats):
     """
-    Gets the name of the expense category the user wants to view.
+    Gets the name of the expense category the user wants to rename.
 
     Args:
         current_expense_cats: A list of the names of the current expense categories. (list of str)
         
     Returns:
-        cat_input: The name of the expense category the user wants to view. (str)
+        cat_input: The name of the expense category to rename. (str)
         1: If the user wishes to return to the previous menu. (int)
-    """ 
+    """
     while True:
         print('')
-        cat_input = input('''Please enter the name of the category you want to view. Enter 0 to return to the previous menu.
+        cat_input = input('''Please enter the name of the category you want to rename. Enter 0 to return to the previous menu.
 : ''').lower()
         if cat_input == '0':
             return 1
         if cat_input in current_expense_cats:
             return cat_input
         else:
-            print("\nYou did not enter the name of a category.") 
+            print("\nYou did not enter the name of a category.")
 
 # Gets the name of the category to delete.
 def get_cat_to_delete(current_expense_cats):
@@ -0,0 +1,191 @@
+# Contains the functions that export the expenses, income and goals tables in the db to files.
+
+## Imports ##
+
+import csv
+import json
+import os
+import tracker_db
+import expenses_db
+import income_db
+import global_utils
+
+## Variables ##
+
+# The number of rows fetched from the db at a time while exporting.
+EXPORT_SIZE = 1000
+
+# The tables that can be exported, with the query for each, the names of its columns, the columns
+# its category and date filters apply to and which of its columns are amounts and dates.
+EXPORT_TABLES = {
+    'expenses': {'select': expenses_db.EXPENSE_SELECT,
+                 'columns': ['category', 'name', 'amount', 'date_added', 'id'],
+                 'category_column': 'expense_cats.name',
+                 'date_column': 'expenses.date_added',
+                 'order': 'expenses.id',
+                 'amounts': [2],
+                 'dates': [3]},
+    'income': {'select': income_db.INCOME_SELECT,
+               'columns': ['category', 'name', 'amount', 'date_added', 'id'],
+               'category_column': 'income_cats.name',
+               'date_column': 'income.date_added',
+               'order': 'income.id',
+               'amounts': [2],
+               'dates': [3]},
+    'goals': {'select': 'SELECT name, category, amount, progress FROM goals',
+              'columns': ['name', 'category', 'amount', 'progress'],
+              'category_column': 'category',
+              'date_column': None,
+              'order': 'name',
+              'amounts': [2, 3],
+              'dates': []},
+}
+
+# The formats tables can be exported to.
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+## Functions ##
+
+# Reads the rows of a table to export.
+def iter_export_rows(table, category=None, start=None, end=None):
+    """
+    Reads the rows of a table EXPORT_SIZE rows at a time with fetchmany, so only that many are held
+    in memory however big the table is. Amounts are written as 12.50 and dates as YYYY-MM-DD, the same
+    way they are imported.
+
+    Args:
+        table: 'expenses', 'income' or 'goals'. (str)
+        category: Only rows in this category are read, or None for all of them. For goals this is
+                  'income' or 'saving'. (str)
+        start: The first date to read, as the number of days since 1970-01-01, or None. (int)
+        end: The last date to read, as the number of days since 1970-01-01, or None. (int)
+
+    Yields:
+        row: The values of a row, in the order of the table's columns. (list of strs and ints)
+    """
+    export_table = EXPORT_TABLES[table]
+    if export_table['date_column'] is None and (start is not None or end is not None):
+        raise ValueError(f"{table.capitalize()} can't be filtered by date.")
+
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append(f"{export_table['category_column']} = ?")
+        params.append(category)
+    if start is not None:
+        conditions.append(f"{export_table['date_column']} >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append(f"{export_table['date_column']} <= ?")
+        params.append(end)
+    query = export_table['select']
+    if len(conditions) != 0:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += f" ORDER BY {export_table['order']}"
+
+    db = tracker_db.get_connection()
+    cursor = db.cursor()
+    cursor.execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(EXPORT_SIZE)
+            if len(rows) == 0:
+                return
+            for row in rows:
+                row = list(row)
+                for index in export_table['amounts']:
+                    row[index] = global_utils.amount_format(row[index])
+                for index in export_table['dates']:
+                    row[index] = global_utils.date_format(row[index])
+                yield row
+    finally:
+        cursor.close()
+
+# Writes rows to a CSV file.
+def write_csv(export_file, columns, rows, progress=None):
+    """
+    Writes rows to a CSV file with a header row, as they are read.
+
+    Args:
+        export_file: The file to write to. (file)
+        columns: The names of the columns. (list of str)
+        rows: The rows to write. (iterable of lists)
+        progress: Called with the number of rows written every EXPORT_SIZE rows. (function)
+
+    Returns:
+        count: The number of rows written. (int)
+    """
+    writer = csv.writer(export_file)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if progress is not None and count % EXPORT_SIZE == 0:
+            progress(count)
+    return count
+
+# Writes rows to a JSON Lines file.
+def write_jsonl(export_file, columns, rows, progress=None):
+    """
+    Writes rows to a JSON Lines file, with each row as an object on its own line, as they are read.
+
+    Args:
+        export_file: The file to write to. (file)
+        columns: The names of the columns. (list of str)
+        rows: The rows to write. (iterable of lists)
+        progress: Called with the number of rows written every EXPORT_SIZE rows. (function)
+
+    Returns:
+        count: The number of rows written. (int)
+    """
+    count = 0
+    for row in rows:
+        export_file.write(json.dumps(dict(zip(columns, row))) + '\n')
+        count += 1
+        if progress is not None and count % EXPORT_SIZE == 0:
+            progress(count)
+    return count
+
+# Exports a table to a file.
+def export_table(table, path, export_format, category=None, start=None, end=None, progress=None):
+    """
+    Exports a table to a CSV or JSON Lines file. Rows are streamed from the db to the file, so memory
+    use doesn't grow with the table. They are read from a read-only snapshot, so the export doesn't
+    hold up rows being added meanwhile and doesn't include them. The file is written under a temporary
+    name and only replaces path once the export has finished.
+
+    Args:
+        table: 'expenses', 'income' or 'goals'. (str)
+        path: The path of the file to write. (str)
+        export_format: 'csv' or 'jsonl'. (str)
+        category: Only rows in this category are exported, or None for all of them. For goals this is
+                  'income' or 'saving'. (str)
+        start: The first date to export, as the number of days since 1970-01-01, or None. (int)
+        end: The last date to export, as the number of days since 1970-01-01, or None. (int)
+        progress: Called with the number of rows written every EXPORT_SIZE rows. (function)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        [0, count]: 0 shows that nothing has gone wrong and count is the number of rows exported. (int)
+    """
+    temp_path = path + '.tmp'
+    try:
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"There is no table called {table} to export.")
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"{export_format} is not a format that can be exported to.")
+        # Reads from a snapshot, so rows added while the file is written don't end up half in it.
+        with tracker_db.snapshot():
+            rows = iter_export_rows(table, category, start, end)
+            with open(temp_path, 'w', newline='', encoding='utf-8') as export_file:
+                if export_format == 'csv':
+                    count = write_csv(export_file, EXPORT_TABLES[table]['columns'], rows, progress)
+                else:
+                    count = write_jsonl(export_file, EXPORT_TABLES[table]['columns'], rows, progress)
+        os.replace(temp_path, path)
+    except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return [1, e]
+    return [0, count]
@@ -1,4 +1,16 @@
 # Adds some global utility functions.
+import decimal
+import datetime
+
+# Dates are stored as the number of days since this date.
+EPOCH = datetime.date(1970, 1, 1)
+
+# The number of rows shown on each page when browsing. It can be changed while browsing.
+PAGE_SIZE = 20
+# The most rows that can be shown on a page.
+MAX_PAGE_SIZE = 500
+# The most rows a search shows to choose from.
+MATCH_LIMIT = 100
 
 def name_capitalise(name):
     """
@@ -22,15 +34,479 @@ def name_capitalise(name):
 
 def amount_format(amount):
     """
-    Adds an additional 0 to an obtained float value so money can be viewed properly in tables. Only use in place.
+    Formats an amount of money stored in cents so it can be viewed properly in tables.
+
+    Args:
+        amount: The amount in cents. (int)
+        
+    Returns:
+        amount: The amount with two decimal places, such as 12.50. (str)
+    """ 
+    if amount < 0:
+        return f'-{-amount // 100}.{-amount % 100:02d}'
+    return f'{amount // 100}.{amount % 100:02d}'
+
+def amount_to_cents(amount_input):
+    """
+    Converts an amount entered by the user into cents. The amount must have two decimal places.
 
     Args:
-        amount: The amount that requires an additional 0. (float)
+        amount_input: The amount entered by the user, such as 12.50. (str)
         
     Returns:
-        amount: The original amount plus an additional 0. (str)
+        cents: The amount in cents. (int)
+        None: If the amount isn't valid.
     """ 
-    amount = str(amount)
-    if amount[-2] == '.':
-        amount = amount + '0'
-    return amount
\ No newline at end of file
+    if len(amount_input[amount_input.rfind('.')+1:]) != 2:
+        return None
+    try:
+        amount = decimal.Decimal(amount_input)
+    except decimal.InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return int(amount * 100)
+
+def date_format(days):
+    """
+    Formats a date stored as a number of days so it can be viewed properly in tables.
+
+    Args:
+        days: The date as the number of days since 1970-01-01. (int)
+        
+    Returns:
+        date: The date as YYYY-MM-DD. (str)
+    """ 
+    return (EPOCH + datetime.timedelta(days=days)).isoformat()
+
+def date_to_days(date_input, date_pattern=None):
+    """
+    Converts a date entered as YYYY-MM-DD, or in another pattern, into the number of days used to store it.
+
+    Args:
+        date_input: The date, such as 2024-01-31. (str)
+        date_pattern: A strptime pattern for the date, such as %d/%m/%Y, if it isn't YYYY-MM-DD. (str)
+        
+    Returns:
+        days: The date as the number of days since 1970-01-01. (int)
+        None: If the date isn't valid.
+    """ 
+    try:
+        if date_pattern is None:
+            date = datetime.date.fromisoformat(date_input)
+        else:
+            date = datetime.datetime.strptime(date_input, date_pattern).date()
+    except ValueError:
+        return None
+    return (date - EPOCH).days
+
+def today():
+    """
+    Gets today's date as the number of days used to store it.
+
+    Args:
+        None
+        
+    Returns:
+        days: Today as the number of days since 1970-01-01. (int)
+    """ 
+    return (datetime.date.today() - EPOCH).days
+
+def get_page_size():
+    """
+    Gets the number of rows the user wants to see on each page.
+
+    Args:
+        None
+
+    Returns:
+        size_input: The number of rows on each page. (int)
+        None: If the user wishes to keep the current page size, as 1 is a page size they can choose.
+    """
+    while True:
+        print('')
+        size_input = input(f'''Please enter the number of rows to show on each page, from 1 to {MAX_PAGE_SIZE}. Enter 0 to keep {PAGE_SIZE}.
+: ''').strip()
+        if size_input == '0':
+            return None
+        if size_input.isdigit() and 1 <= int(size_input) <= MAX_PAGE_SIZE:
+            return int(size_input)
+        print(f"\nPlease enter a whole number from 1 to {MAX_PAGE_SIZE}.")
+
+def browse_pages(get_page, category, title, table):
+    """
+    Lets the user browse expenses or income a page at a time, moving to the next or previous page or
+    changing the page size. Each page is got by seeking from the id at the edge of the current page, so
+    showing a page takes the same time however many rows come before it.
+
+    Args:
+        get_page: The function that gets a page, expenses_db.get_expense_page or income_db.get_income_page. (function)
+        category: The name of the category to browse, or None for every category. (str)
+        title: What is being browsed, such as 'all expenses'. (str)
+        table: The name of the table, used in error messages. (str)
+
+    Returns:
+        0: If the user has finished browsing. (int)
+        1: If something went wrong getting a page. (int)
+        2: If there are no rows to browse. (int)
+    """
+    global PAGE_SIZE
+    page = get_page(category, None, None, PAGE_SIZE)
+    if page[0] == 0 and len(page[1]) == 0:
+        return 2
+    # The position of the first row on the page, counted as pages are moved through.
+    first_row = 1
+    more_before = False
+    more_after = page[0] == 0 and page[2]
+    while True:
+        if page[0] == 1:
+            print(f"\nSorry, something went wrong accessing the {table} database.")
+            print(f"Error: {page[1]}")
+            return 1
+        rows = page[1]
+        # The rows may have been deleted since the last page was shown.
+        if len(rows) == 0:
+            print(f"\nThere are no more {table} to show.")
+            return 0
+
+        # Prints the page.
+        print(f"\nViewing {title}, {first_row} to {first_row + len(rows) - 1}:\n")
+        print("Name -- Category -- Amount -- Date Added")
+        for row in rows:
+            print(f"{name_capitalise(row[1])} -- {name_capitalise(row[0])} -- {amount_format(row[2])} -- {date_format(row[3])}")
+
+        # Gets where the user wants to go next.
+        options = ''
+        if more_after:
+            options += 'n - Next page\n'
+        if more_before:
+            options += 'p - Previous page\n'
+        while True:
+            user_input = input(f'''\n{options}s - Change the page size\n0 - Return to previous menu\n: ''').strip().lower()
+            if user_input == 'n' and more_after:
+                page = get_page(category, rows[-1][4], None, PAGE_SIZE)
+                if page[0] == 0:
+                    first_row += len(rows)
+                    more_before = True
+                    more_after = page[2]
+                break
+            elif user_input == 'p' and more_before:
+                page = get_page(category, None, rows[0][4], PAGE_SIZE)
+                if page[0] == 0:
+                    first_row -= len(page[1])
+                    more_before = page[2]
+                    more_after = True
+                break
+            elif user_input == 's':
+                page_size = get_page_size()
+                if page_size is None:
+                    continue
+                PAGE_SIZE = page_size
+                # Gets the page again from its first row. Ids are whole numbers, so the page starts
+                # after the id before it.
+                page = get_page(category, rows[0][4] - 1, None, PAGE_SIZE)
+                if page[0] == 0:
+                    more_after = page[2]
+                break
+            elif user_input == '0':
+                return 0
+
+def get_lookup_type(row_type, action):
+    """
+    Gets how the user wants to find the expense or income they want to edit or delete.
+
+    Args:
+        row_type: 'expense' or 'income'. (str)
+        action: What the user wants to do, such as 'edit'. (str)
+
+    Returns:
+        'name', 'id', 'category', 'amount', 'date' or 'search': What to search by. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    lookup_types = {'1': 'name', '2': 'id', '3': 'category', '4': 'amount', '5': 'date', '6': 'search'}
+    while True:
+        user_input = input(f'''\nHow do you want to find the {row_type} you want to {action}?
+1 - By name
+2 - By ID
+3 - By category
+4 - By amount range
+5 - By date range
+6 - By searching the names
+0 - Return to previous menu
+: ''').strip()
+        if user_input == '0':
+            return 1
+        if user_input in lookup_types:
+            return lookup_types[user_input]
+        print("\nPlease enter one of the numbers shown.")
+
+def get_lookup_name(row_type):
+    """
+    Gets the name of the expense or income the user is looking for.
+
+    Args:
+        row_type: 'expense' or 'income'. (str)
+
+    Returns:
+        name_input: The name. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        name_input = input(f'''Please enter the name of the {row_type}. Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if name_input == '0':
+            return 1
+        if name_input != '':
+            return name_input
+        print("\nPlease enter a name.")
+
+def get_lookup_id(row_type):
+    """
+    Gets the ID of the expense or income the user is looking for.
+
+    Args:
+        row_type: 'expense' or 'income'. (str)
+
+    Returns:
+        id_input: The ID. (int)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        id_input = input(f'''Please enter the ID of the {row_type}. Enter 0 to return to the previous menu.
+: ''').strip()
+        if id_input == '0':
+            return 1
+        if id_input.isdigit():
+            return int(id_input)
+        print("\nPlease enter an ID, which is a whole number.")
+
+def get_lookup_category(current_cats):
+    """
+    Gets the category the user wants to search in.
+
+    Args:
+        current_cats: A list of the names of the categories. (list of str)
+
+    Returns:
+        cat_input: The name of the category. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    print("\nThe current categories are:")
+    for cat in current_cats:
+        print(name_capitalise(cat))
+    while True:
+        print('')
+        cat_input = input('''Please enter the name of the category. Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if cat_input == '0':
+            return 1
+        if cat_input in current_cats:
+            return cat_input
+        print("\nYou did not enter the name of a category.")
+
+def get_amount_range():
+    """
+    Gets the smallest and largest amounts the user wants to search between.
+
+    Args:
+        None
+
+    Returns:
+        [low, high]: The smallest and largest amounts in cents. (list of ints)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    amounts = []
+    for limit in ('smallest', 'largest'):
+        while True:
+            print('')
+            amount_input = input(f'''Please enter the {limit} amount to search for, such as 12.50. Enter 0 to return to the previous menu.
+: ''').strip()
+            if amount_input == '0':
+                return 1
+            amount = amount_to_cents(amount_input)
+            if amount is None:
+                print("\nPlease enter a valid amount.")
+            elif len(amounts) != 0 and amount < amounts[0]:
+                print("\nThe largest amount can't be less than the smallest amount.")
+            else:
+                amounts.append(amount)
+                break
+    return amounts
+
+def get_date_range():
+    """
+    Gets the first and last dates the user wants to search between.
+
+    Args:
+        None
+
+    Returns:
+        [start, end]: The first and last dates as the number of days since 1970-01-01. (list of ints)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    dates = []
+    for limit in ('first', 'last'):
+        while True:
+            print('')
+            date_input = input(f'''Please enter the {limit} date to search, as YYYY-MM-DD. Enter 0 to return to the previous menu.
+: ''').strip()
+            if date_input == '0':
+                return 1
+            date = date_to_days(date_input)
+            if date is None:
+                print("\nPlease enter a date as YYYY-MM-DD.")
+            elif len(dates) != 0 and date < dates[0]:
+                print("\nThe last date can't be before the first date.")
+            else:
+                dates.append(date)
+                break
+    return dates
+
+def get_search_text(row_type):
+    """
+    Gets the words the user wants to search the names of expenses or income for.
+
+    Args:
+        row_type: 'expenses' or 'income'. (str)
+
+    Returns:
+        search_input: The words to search for. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        search_input = input(f'''Please enter the words to search the names of {row_type} for. The start of a word is enough.
+Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if search_input == '0':
+            return 1
+        if any(char.isalnum() for char in search_input):
+            return search_input
+        print("\nPlease enter at least one word.")
+
+def get_search_category(current_cats, action='search in'):
+    """
+    Gets the category the user wants to limit a search or report to.
+
+    Args:
+        current_cats: A list of the names of the categories. (list of str)
+        action: What is being done with the category, such as 'search in'. (str)
+
+    Returns:
+        cat_input: The name of the category. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If every category should be used. (int)
+    """
+    print("\nThe current categories are:")
+    for cat in current_cats:
+        print(name_capitalise(cat))
+    while True:
+        print('')
+        cat_input = input(f'''Please enter the category to {action}. Press enter to {action} every category.
+Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if cat_input == '0':
+            return 1
+        if cat_input == '':
+            return 2
+        if cat_input in current_cats:
+            return cat_input
+        print("\nYou did not enter the name of a category.")
+
+def get_search_date(limit):
+    """
+    Gets the first or last date the user wants to limit a search to.
+
+    Args:
+        limit: 'first' or 'last'. (str)
+
+    Returns:
+        date_added: The date as the number of days since 1970-01-01. (int)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the search shouldn't be limited by this date. (int)
+    """
+    while True:
+        print('')
+        date_input = input(f'''Please enter the {limit} date to search, as YYYY-MM-DD. Press enter for no limit.
+Enter 0 to return to the previous menu.
+: ''').strip()
+        if date_input == '0':
+            return 1
+        if date_input == '':
+            return 2
+        date_added = date_to_days(date_input)
+        if date_added is not None:
+            return date_added
+        print("\nPlease enter a date as YYYY-MM-DD.")
+
+def get_month(limit):
+    """
+    Gets the first or last month the user wants a report to cover.
+
+    Args:
+        limit: 'first' or 'last'. (str)
+
+    Returns:
+        month_input: The month as YYYY-MM. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the report shouldn't be limited by this month. (int)
+    """
+    while True:
+        print('')
+        month_input = input(f'''Please enter the {limit} month to show, as YYYY-MM. Press enter for no limit.
+Enter 0 to return to the previous menu.
+: ''').strip()
+        if month_input == '0':
+            return 1
+        if month_input == '':
+            return 2
+        if date_to_days(month_input + '-01') is not None:
+            return month_input
+        print("\nPlease enter a month as YYYY-MM.")
+
+def month_range(start, end):
+    """
+    Lists every month from one month to another, so a series can show the months with nothing in them.
+
+    Args:
+        start: The first month, as YYYY-MM. (str)
+        end: The last month, as YYYY-MM. (str)
+
+    Returns:
+        months: Each month from start to end as YYYY-MM, in order. (list of str)
+    """
+    year, month = int(start[:4]), int(start[5:7])
+    months = []
+    while f'{year:04d}-{month:02d}' <= end:
+        months.append(f'{year:04d}-{month:02d}')
+        month += 1
+        if month == 13:
+            year += 1
+            month = 1
+    return months
+
+def print_monthly_totals(monthly_totals, start, end):
+    """
+    Prints the number and total of the expenses or income in each month, including months with none.
+
+    Args:
+        monthly_totals: A tuple of (month, count, total) for each month with any rows, in order. (list of tuples of strs and ints)
+        start: The first month to print as YYYY-MM, or None to start at the first month with any rows. (str)
+        end: The last month to print as YYYY-MM, or None to end at the last month with any rows. (str)
+
+    Returns:
+        None
+    """
+    if start is None:
+        start = monthly_totals[0][0]
+    if end is None:
+        end = monthly_totals[-1][0]
+    totals_by_month = {}
+    for month, count, total in monthly_totals:
+        totals_by_month[month] = (count, total)
+    print("\nMonth -- Count -- Total")
+    for month in month_range(start, end):
+        count, total = totals_by_month.get(month, (0, 0))
+        print(f"{month} -- {count} -- {amount_format(total)}")
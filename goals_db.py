@@ -2,45 +2,10 @@
 
 ## Imports ##
 
-import sqlite3
-import os
+import tracker_db
 
 ## Functions ##
 
-# Creates database if it doesn't exist.
-def create():
-    """
-    Creates the goals database if it doesn't already exist.
-
-    Args:
-        None
-        
-    Returns:
-        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
-    """
-    try:
-        db = sqlite3.connect('data/tracker')
-    except sqlite3.OperationalError:
-        os.mkdir('data')
-    finally:
-        db = sqlite3.connect('data/tracker')
-    try:
-        cursor = db.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS goals(
-                        name TEXT UNIQUE PRIMARY KEY,
-                        category TEXT,
-                        amount FLOAT,
-                        progress FLOAT)''')
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        db.close()
-        return [1, e]
-    finally:
-        db.close()
-    return [0, 0]
-
 # Gets goal info based on a name.
 def get_goal_info(name):
     """
@@ -51,11 +16,11 @@ def get_goal_info(name):
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        goal_info: The goal information as a list. (list of str, float)
+        goal_info: The goal information as a list. (list of str, int)
     """
     goal_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
         cursor.execute('''SELECT * FROM goals WHERE
                        name = ?''',
@@ -63,13 +28,24 @@ def get_goal_info(name):
         for row in cursor:
             goal_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return goal_info  
 
+# Reads goals info based on the category.
+def iter_goals(category):
+    """
+    Reads the info for the goals in a category a few rows at a time.
+
+    Args:
+        category: The name of the category of goals to read the info of. (str)
+
+    Yields:
+        goal: The goal information as (name, category, amount, progress). (tuple of str, int)
+    """
+    yield from tracker_db.iter_rows('''SELECT * FROM goals WHERE
+                                    category = ?''',
+                                    (category,))
+
 # Gets goals info based on the category.
 def get_goals_list(category):
     """
@@ -80,24 +56,12 @@ def get_goals_list(category):
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        goals_info: The goal information as a list of tuples. (list of tuples of str, float)
+        goals_info: The goal information as a list of tuples. (list of tuples of str, int)
     """
-    goals_info = []
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''SELECT * FROM goals WHERE
-                       category = ?''',
-                       (category,))
-        for row in cursor:
-            goals_info.append(row)
+        return list(iter_goals(category))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
-    return goals_info   
 
 # Adds a goal.
 def add_goal(goal_info):
@@ -112,19 +76,14 @@ def add_goal(goal_info):
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''INSERT INTO goals
-                       (name, category, amount, progress)
-                       VALUES(?, ?, ?, ?)''',
-                       (goal_info[0], goal_info[1], goal_info[2], goal_info[3]))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''INSERT INTO goals
+                           (name, category, amount, progress)
+                           VALUES(?, ?, ?, ?)''',
+                           (goal_info[0], goal_info[1], goal_info[2], goal_info[3]))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Updates a goal.
@@ -141,19 +100,14 @@ def update_goal(name, updated_goal_info):
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''UPDATE goals SET
-                       name = ?, category = ?, amount = ?, progress = ?
-                       WHERE name = ?''',
-                       (updated_goal_info[0], updated_goal_info[1], updated_goal_info[2], updated_goal_info[3], name))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE goals SET
+                           name = ?, category = ?, amount = ?, progress = ?
+                           WHERE name = ?''',
+                           (updated_goal_info[0], updated_goal_info[1], updated_goal_info[2], updated_goal_info[3], name))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Updates the progress value of a saving goal.
@@ -163,25 +117,20 @@ def update_saving_goal_progress(goal_name, new_progress):
 
     Args:
         goal_name: The name of the goal to update. (str)
-        new_progress: The value of progress. (float)
+        new_progress: The value of progress in cents. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''UPDATE goals SET
-                       progress = ? WHERE name = ?''',
-                       (new_progress, goal_name))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE goals SET
+                           progress = ? WHERE name = ?''',
+                           (new_progress, goal_name))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Deletes a goal.
@@ -198,16 +147,11 @@ def delete_goal(name, category):
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM goals WHERE
-                       name = ? AND category = ?''',
-                       (name, category))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''DELETE FROM goals WHERE
+                           name = ? AND category = ?''',
+                           (name, category))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
\ No newline at end of file
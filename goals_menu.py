@@ -108,8 +108,8 @@ def create_saving_goal():
     else:
         new_goal_info.append(new_goal_amount)
 
-    # Adds 0.0 to the progress index of the saving goal.
-    new_goal_info.append(0.0)
+    # Adds 0 to the progress index of the saving goal.
+    new_goal_info.append(0)
 
     # Adds the new income to the tracker.
     add_new_goal_result = goals_db.add_goal(new_goal_info)
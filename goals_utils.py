@@ -8,7 +8,7 @@ def get_new_saving_goal_name(current_saving_goals):
     Gets the name of a new saving goal.
 
     Args:
-        current_saving_goals: A list of the existing saving goals. (list of tuples of str, floats)
+        current_saving_goals: A list of the existing saving goals. (list of tuples of str, ints)
         
     Returns:
         name_input: The name of the new saving goal. (str)
@@ -35,7 +35,7 @@ def get_new_goal_amount():
         None
         
     Returns:
-        amount: The target amount of the new saving goal. (float)
+        amount: The target amount of the new saving goal in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     while True:
@@ -44,12 +44,8 @@ def get_new_goal_amount():
 : ''').lower()
         if amount_input == '0':
             return 1
-        if len(amount_input[amount_input.rfind('.')+1:]) != 2:
-            print("\nPlease enter a valid amount.")
-            continue
-        try:
-            amount = float(amount_input)
-        except ValueError:
+        amount = global_utils.amount_to_cents(amount_input)
+        if amount is None:
             print("\nPlease enter a valid amount.")
             continue
         return amount
@@ -86,11 +82,11 @@ def get_income_of_category(category):
         category: The name of the income category. (str)
         
     Returns:
-        category_income: The name of the category of the new saving goal. (str)
+        category_income: The total income of the category in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     category_income = income_db.get_cat_income(category)
-    if type(category_income) == float:
+    if type(category_income) == int:
         return category_income
     # If get_income_from_category() has returned an error.
     if category_income[0] == 1:
@@ -144,7 +140,7 @@ def get_edit_goal_name(current_saving_goals, goal_name):
     Gets the new name of a saving goal.
 
     Args:
-        current_saving_goals: A list of the existing saving goals. (list of tuples of str, floats)
+        current_saving_goals: A list of the existing saving goals. (list of tuples of str, ints)
         goal_name: The name of the goal to be edited. (str)
         
     Returns:
@@ -188,10 +184,10 @@ def get_edit_goal_target(goal_target):
     Gets a new target amount for a goal.
 
     Args:
-        goal_target: The old target for the goal. (float)
+        goal_target: The old target for the goal in cents. (int)
         
     Returns:
-        new_amount: The new amount for the goal target. (float)
+        new_amount: The new amount for the goal target in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     # Checks if the user wants to edit the goal target.
@@ -214,12 +210,8 @@ Would you like to change it? Please enter yes or no.
 : ''').lower()
         if new_target_amount_input == '0':
             return 1
-        if len(new_target_amount_input[new_target_amount_input.rfind('.')+1:]) != 2:
-            print("Please enter a valid amount.")
-            continue
-        try:
-            new_amount = float(new_target_amount_input)
-        except ValueError:
+        new_amount = global_utils.amount_to_cents(new_target_amount_input)
+        if new_amount is None:
             print("Please enter a valid amount.")
             continue
         return new_amount
@@ -230,10 +222,10 @@ def get_edit_goal_progress(goal_progress):
     Gets a new progress amount for a goal.
 
     Args:
-        goal_progress: The current progress amount for a goal. (float)
+        goal_progress: The current progress amount for a goal in cents. (int)
         
     Returns:
-        new_amount: The new amount for the progress. (float)
+        new_amount: The new amount for the progress in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     # Checks if the user wants to edit the goal progress.
@@ -256,12 +248,8 @@ Would you like to change it? Please enter yes or no.
 : ''').lower()
         if new_progress_amount_input == '0':
             return 1
-        if len(new_progress_amount_input[new_progress_amount_input.rfind('.')+1:]) != 2:
-            print("Please enter a valid amount.")
-            continue
-        try:
-            new_amount = float(new_progress_amount_input)
-        except ValueError:
+        new_amount = global_utils.amount_to_cents(new_progress_amount_input)
+        if new_amount is None:
             print("Please enter a valid amount.")
             continue
         return new_amount
@@ -272,8 +260,8 @@ def get_goal_to_delete(income_goals, saving_goals):
     Gets the name of a goal to delete.
 
     Args:
-        income_goals: A list of the existing income goals. (list of tuples of str, floats)
-        saving_goals: A list of the existing saving goals. (list of tuples of str, floats)    
+        income_goals: A list of the existing income goals. (list of tuples of str, ints)
+        saving_goals: A list of the existing saving goals. (list of tuples of str, ints)    
         
     Returns:
         [name_input, choice_result]: A list of the name of the goal and the name of either income or saving. (list of str)
@@ -312,7 +300,7 @@ def get_goal_to_add_to(saving_goals):
     Gets the name of a goal to add money to.
 
     Args:
-        saving_goals: A list of the existing saving goals. (list of tuples of str, floats)    
+        saving_goals: A list of the existing saving goals. (list of tuples of str, ints)    
         
     Returns:
         goal_input: The name of the goal to add money to. (str)
@@ -339,7 +327,7 @@ def get_amount_to_add_to_goal():
         None    
         
     Returns:
-        amount: The amount of money to add to a goal. (float)
+        amount: The amount of money to add to a goal in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     while True:
@@ -348,12 +336,8 @@ def get_amount_to_add_to_goal():
 : ''').lower()
         if amount_input == '0':
             return 1
-        if len(amount_input[amount_input.rfind('.')+1:]) != 2:
-            print("\nPlease enter a valid amount.")
-            continue
-        try:
-            amount = float(amount_input)
-        except ValueError:
+        amount = global_utils.amount_to_cents(amount_input)
+        if amount is None:
             print("\nPlease enter a valid amount.")
             continue
         return amount
@@ -387,34 +371,33 @@ Enter 0 to return to the previous menu.
 # Updates the income goals when income is updated.
 def update_income_goals():
     """
-    Updates all income goals based on the latest database information.
+    Updates all income goals based on the latest database information. Call it inside a
+    tracker_db.transaction() to commit the updates together with the change that caused them.
 
     Args:
         None    
         
     Returns:
-        None
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, 0]: 0 shows that nothing has gone wrong.
     """
-    # Get list of current income categories.
-    current_income_cats = income_db.get_cat_list()
-    # If the list is not empty (there might be no categories added).
-    if len(current_income_cats) != 0:
-        # If the get_cat_list() function has returned an error.
-        if current_income_cats[0] == 1:
-            print("\nSorry, something went wrong accessing the income categories database.")
-            print(f"Error: {current_income_cats[1]}")
-            return
-    else:
-        # Returns if there are no income categories.
-        return
+    # Gets the total income of every income category from the running totals.
+    cat_totals = income_db.get_cat_totals()
+    # If the get_cat_totals() function has returned an error.
+    if len(cat_totals) != 0 and cat_totals[0] == 1:
+        return cat_totals
 
-    for cat in current_income_cats:
+    for cat_total in cat_totals:
+        cat = cat_total[0]
         # Gets the goal info for a category if it exists.
         old_goal_info = goals_db.get_goal_info(cat)
         if len(old_goal_info) == 0:
             continue
+        # If the get_goal_info() function has returned an error.
+        if old_goal_info[0] == 1:
+            return old_goal_info
         # Gets the total income for that category.
-        cat_income = income_db.get_cat_income(cat)
+        cat_income = cat_total[2]
         # Makes the tuple of old_goal_info into a list.
         new_goal_info = []
         for goal in old_goal_info:
@@ -428,6 +411,5 @@ def update_income_goals():
         update_goal_result = goals_db.update_goal(cat, new_goal_info)
         # If update_goal() has returned an error.
         if update_goal_result[0] == 1:
-            print(f"\nSorry, something went wrong updating the {global_utils.name_capitalise(cat)} goal.")
-            print(f"Error: {update_goal_result[1]}")
-             
\ No newline at end of file
+            return update_goal_result
+    return [0, 0]
@@ -0,0 +1,551 @@
+# Contains the functions that import bank statements into the expenses and income tables in the db.
+
+## Imports ##
+
+import csv
+import html
+import os
+import re
+import time
+import tracker_db
+import expenses_db
+import income_db
+import goals_utils
+import global_utils
+
+## Variables ##
+
+# The number of rows written in each transaction while importing.
+BATCH_SIZE = 5000
+
+# The most rejected rows an import keeps the details of, so a bad file can't fill up memory.
+MAX_REJECTED = 100
+
+# The number of characters read from an OFX file at a time.
+READ_SIZE = 65536
+
+# The date pattern of QIF files, which are usually written as MM/DD/YYYY.
+QIF_DATE_PATTERN = '%m/%d/%Y'
+
+# The QIF sections that hold transactions. Other sections, such as the category list, are skipped.
+QIF_TRANSACTION_TYPES = ('bank', 'cash', 'ccard', 'oth a', 'oth l')
+
+# Matches an OFX tag and the text after it, up to the next tag.
+OFX_TAG = re.compile(r'<([^<>]*)>([^<]*)')
+
+## Functions ##
+
+# Gets the categories of an import target.
+def get_target_cats(target):
+    """
+    Gets the names of the categories that rows can be imported into.
+
+    Args:
+        target: 'expenses' or 'income'. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        cat_names: The names of the categories. (set of str)
+    """
+    if target == 'expenses':
+        cat_names = expenses_db.get_cat_names()
+    else:
+        cat_names = income_db.get_cat_list()
+    if len(cat_names) != 0 and cat_names[0] == 1:
+        return cat_names
+    return set(cat_names)
+
+# Adds a category to an import target.
+def add_target_cat(target, name):
+    """
+    Adds a category that rows in an import belong to. Expense categories are added without a budget.
+
+    Args:
+        target: 'expenses' or 'income'. (str)
+        name: The name of the category. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, 0]: 0 shows that nothing has gone wrong.
+    """
+    if target == 'expenses':
+        return expenses_db.add_expense_cat(name, 0)
+    return income_db.add_income_cat(name)
+
+# Records a row that couldn't be imported.
+def reject(summary, line, reason):
+    """
+    Counts a row that couldn't be imported and keeps why, up to MAX_REJECTED rows.
+
+    Args:
+        summary: The summary of the import so far. (dict)
+        line: The line of the file the row was on. (int)
+        reason: Why the row couldn't be imported. (str)
+
+    Returns:
+        None
+    """
+    summary['rejected'] += 1
+    if len(summary['rejected_rows']) < MAX_REJECTED:
+        summary['rejected_rows'].append((line, reason))
+
+# Writes a batch of imported rows.
+def write_batch(target, batch, summary):
+    """
+    Adds a batch of rows to expenses or income in one transaction and counts the result of each row.
+    Income goals are brought up to date in the same transaction as a batch of income.
+
+    Args:
+        target: 'expenses' or 'income'. (str)
+        batch: The rows to add as (line, [category, name, amount, date_added]). (list of tuples)
+        summary: The summary of the import so far. (dict)
+
+    Returns:
+        None
+    """
+    rows = []
+    for line, row_info in batch:
+        rows.append(row_info)
+    if target == 'expenses':
+        add_result = expenses_db.add_expenses_many(rows)
+        if add_result[0] == 1:
+            raise add_result[1]
+    else:
+        # The progress of the income goals is committed together with the income it adds up.
+        with tracker_db.transaction():
+            add_result = income_db.add_income_many(rows)
+            if add_result[0] == 1:
+                raise add_result[1]
+            update_goals_result = goals_utils.update_income_goals()
+            if update_goals_result[0] == 1:
+                raise update_goals_result[1]
+    for (line, row_info), row_result in zip(batch, add_result[1]):
+        if row_result[0] == 0:
+            summary['added'] += 1
+        else:
+            reject(summary, line, str(row_result[1]))
+
+# Imports rows into expenses and income.
+def import_rows(rows, create_cats=False, progress=None):
+    """
+    Imports a stream of parsed rows, writing BATCH_SIZE rows per transaction with the bulk-load
+    storage profile. Only one batch for each target is held in memory at a time.
+
+    Args:
+        rows: The rows as (line, target, row_info), where target is 'expenses' or 'income' and row_info is
+              [category, name, amount, date_added], or a str saying why the row is invalid. (iterable of tuples)
+        create_cats: If True, categories that don't exist yet are added. Otherwise their rows are rejected. (bool)
+        progress: Called with the summary after each batch is written. (function)
+
+    Returns:
+        summary: The summary of the import, with the number of rows 'read', 'added' and 'rejected', the
+                 'rejected_rows' as (line, reason) and the 'seconds' it took. (dict)
+    """
+    start = time.perf_counter()
+    summary = {'read': 0, 'added': 0, 'rejected': 0, 'rejected_rows': [], 'seconds': 0.0}
+    known_cats = {}
+    batches = {'expenses': [], 'income': []}
+    for target in batches:
+        known_cats[target] = get_target_cats(target)
+        if type(known_cats[target]) != set:
+            raise known_cats[target][1]
+
+    previous_profile = tracker_db.set_profile('bulk-load')
+    try:
+        for line, target, row_info in rows:
+            summary['read'] += 1
+            if type(row_info) == str:
+                reject(summary, line, row_info)
+                continue
+            # Checks the category here so rows aren't sent to the db just to fail.
+            if row_info[0] not in known_cats[target]:
+                if not create_cats:
+                    reject(summary, line, f"There is no category called {row_info[0]}.")
+                    continue
+                add_cat_result = add_target_cat(target, row_info[0])
+                if add_cat_result[0] == 1:
+                    raise add_cat_result[1]
+                known_cats[target].add(row_info[0])
+            batches[target].append((line, row_info))
+            if len(batches[target]) == BATCH_SIZE:
+                write_batch(target, batches[target], summary)
+                batches[target] = []
+                summary['seconds'] = time.perf_counter() - start
+                if progress is not None:
+                    progress(summary)
+        for target in batches:
+            if len(batches[target]) != 0:
+                write_batch(target, batches[target], summary)
+                summary['seconds'] = time.perf_counter() - start
+                if progress is not None:
+                    progress(summary)
+    finally:
+        tracker_db.set_profile(previous_profile)
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+# Gets the column names of a CSV file.
+def get_csv_columns(path):
+    """
+    Gets the column names from the header row of a CSV file.
+
+    Args:
+        path: The path of the CSV file. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        columns: The names of the columns. (list of str)
+    """
+    try:
+        with open(path, newline='', encoding='utf-8-sig') as csv_file:
+            columns = next(csv.reader(csv_file), [])
+    except Exception as e:
+        return [1, e]
+    return columns
+
+# Reads the rows of a CSV file one at a time.
+def read_csv_rows(reader, target, mapping, date_pattern, default_category):
+    """
+    Parses the rows of a CSV file as they are read, validating amounts the same way as when an
+    expense or income is entered by hand.
+
+    Args:
+        reader: The reader for the CSV file. (csv.DictReader)
+        target: 'expenses' or 'income'. (str)
+        mapping: The column for each field, with keys 'category', 'name', 'amount' and 'date'. The
+                 category and date columns may be None. (dict)
+        date_pattern: A strptime pattern for the dates, or None if they are YYYY-MM-DD. (str)
+        default_category: The category for rows without one. (str)
+
+    Yields:
+        (line, target, row_info): row_info is [category, name, amount, date_added], or a str saying why the
+                                  row is invalid. (tuple)
+    """
+    today = global_utils.today()
+    for row in reader:
+        line = reader.line_num
+        category = default_category
+        if mapping['category'] is not None and (row[mapping['category']] or '').strip() != '':
+            category = row[mapping['category']].strip().lower()
+        if category is None:
+            yield (line, target, "The row has no category.")
+            continue
+        name = (row[mapping['name']] or '').strip().lower()
+        if name == '':
+            yield (line, target, "The row has no name.")
+            continue
+        amount_text = (row[mapping['amount']] or '').strip()
+        amount = global_utils.amount_to_cents(amount_text)
+        if amount is None:
+            yield (line, target, f"'{amount_text}' is not a valid amount.")
+            continue
+        date_added = today
+        if mapping['date'] is not None:
+            date_text = (row[mapping['date']] or '').strip()
+            date_added = global_utils.date_to_days(date_text, date_pattern)
+            if date_added is None:
+                yield (line, target, f"'{date_text}' is not a valid date.")
+                continue
+        yield (line, target, [category, name, amount, date_added])
+
+# Imports a CSV file.
+def import_csv(path, target, mapping, date_pattern=None, default_category=None, create_cats=False, progress=None):
+    """
+    Imports the rows of a CSV file into expenses or income. The file is read one row at a time, so
+    files of any size can be imported.
+
+    Args:
+        path: The path of the CSV file. It must have a header row. (str)
+        target: 'expenses' or 'income'. (str)
+        mapping: The column for each field, with keys 'category', 'name', 'amount' and 'date'. The
+                 category and date columns may be None. (dict)
+        date_pattern: A strptime pattern for the dates, or None if they are YYYY-MM-DD. (str)
+        default_category: The category for rows without one. (str)
+        create_cats: If True, categories that don't exist yet are added. Otherwise their rows are rejected. (bool)
+        progress: Called with the summary after each batch is written. (function)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        [0, summary]: 0 shows that nothing has gone wrong and summary is the summary of the import. (dict)
+    """
+    try:
+        with open(path, newline='', encoding='utf-8-sig') as csv_file:
+            reader = csv.DictReader(csv_file)
+            for column in mapping.values():
+                if column is not None and column not in (reader.fieldnames or []):
+                    raise ValueError(f"The file has no column called {column}.")
+            rows = read_csv_rows(reader, target, mapping, date_pattern, default_category)
+            summary = import_rows(rows, create_cats, progress)
+    except Exception as e:
+        return [1, e]
+    return [0, summary]
+
+# Converts an amount from a bank statement into cents.
+def statement_amount_to_cents(amount_text):
+    """
+    Converts an amount from a bank statement into cents. Banks leave out thousands separators and
+    trailing zeros inconsistently, so 1,250 and 1250.5 are read as 1250.00 and 1250.50.
+
+    Args:
+        amount_text: The amount from the statement, such as -1,250.00. (str)
+
+    Returns:
+        cents: The amount in cents, which is negative for money going out. (int)
+        None: If the amount isn't valid.
+    """
+    amount_text = amount_text.replace(',', '').strip()
+    if '.' not in amount_text:
+        amount_text += '.00'
+    elif len(amount_text) - amount_text.rfind('.') == 2:
+        amount_text += '0'
+    return global_utils.amount_to_cents(amount_text)
+
+# Turns a bank statement transaction into an import row.
+def statement_row(line, amount_text, date_added, name, category, default_cats):
+    """
+    Turns a transaction from a bank statement into a row for import_rows. Money going out is added
+    to expenses and money coming in is added to income.
+
+    Args:
+        line: The line of the file the transaction starts on. (int)
+        amount_text: The amount of the transaction. (str)
+        date_added: The date of the transaction in days, or a str saying why it is invalid. (int)
+        name: The payee or description of the transaction. (str)
+        category: The category of the transaction, or None if it doesn't have one. (str)
+        default_cats: The category for transactions without one, with keys 'expenses' and 'income'. (dict)
+
+    Returns:
+        (line, target, row_info): row_info is [category, name, amount, date_added], or a str saying why the
+                                  transaction is invalid. (tuple)
+    """
+    amount = statement_amount_to_cents(amount_text)
+    if amount is None:
+        return (line, 'expenses', f"'{amount_text}' is not a valid amount.")
+    if amount == 0:
+        return (line, 'expenses', "The transaction has no amount.")
+    if amount < 0:
+        target = 'expenses'
+        amount = -amount
+    else:
+        target = 'income'
+    if type(date_added) == str:
+        return (line, target, date_added)
+    name = name.strip().lower()
+    if name == '':
+        return (line, target, "The transaction has no name.")
+    if category is None or category.strip() == '':
+        category = default_cats.get(target)
+        if category is None:
+            return (line, target, f"The transaction has no category and there is no default {target} category.")
+    return (line, target, [category.strip().lower(), name, amount, date_added])
+
+# Turns a QIF record into an import row.
+def qif_row(line, record, date_pattern, default_cats):
+    """
+    Turns the fields of a QIF transaction into a row for import_rows. The category is taken from the
+    L field, leaving out any subcategory or class.
+
+    Args:
+        line: The line of the file the transaction starts on. (int)
+        record: The value of each field code in the transaction, such as 'T' for the amount. (dict)
+        date_pattern: A strptime pattern for the dates. (str)
+        default_cats: The category for transactions without one, with keys 'expenses' and 'income'. (dict)
+
+    Returns:
+        (line, target, row_info): row_info is [category, name, amount, date_added], or a str saying why the
+                                  transaction is invalid. (tuple)
+    """
+    category = record.get('L')
+    # Transfers between accounts are written as [Account] and would be counted twice.
+    if category is not None and category.startswith('['):
+        return (line, 'expenses', f"The transaction is a transfer to or from {category}.")
+    if category is not None:
+        category = category.split('/')[0].split(':')[0]
+
+    # QIF dates are often written as 1/31'24, so the apostrophe and two digit years are allowed.
+    date_text = record.get('D', '').replace("'", '/').replace(' ', '')
+    date_added = global_utils.date_to_days(date_text, date_pattern)
+    if date_added is None and '%Y' in date_pattern:
+        date_added = global_utils.date_to_days(date_text, date_pattern.replace('%Y', '%y'))
+    if date_added is None:
+        date_added = f"'{record.get('D', '')}' is not a valid date."
+
+    name = record.get('P') or record.get('M') or ''
+    return statement_row(line, record.get('T', record.get('U', '')), date_added, name, category, default_cats)
+
+# Reads the transactions of a QIF file one at a time.
+def read_qif_rows(qif_file, date_pattern, default_cats):
+    """
+    Parses the transactions of a QIF file as its lines are read. Only the sections that hold bank,
+    cash, credit card and other asset or liability transactions are read. Split lines are skipped as
+    the T field already holds the total.
+
+    Args:
+        qif_file: The QIF file. (file)
+        date_pattern: A strptime pattern for the dates. (str)
+        default_cats: The category for transactions without one, with keys 'expenses' and 'income'. (dict)
+
+    Yields:
+        (line, target, row_info): row_info is [category, name, amount, date_added], or a str saying why the
+                                  transaction is invalid. (tuple)
+    """
+    in_transactions = False
+    record = {}
+    start_line = None
+    for line, text in enumerate(qif_file, start=1):
+        text = text.strip()
+        if text == '':
+            continue
+        # A header starts a new section.
+        if text.startswith('!'):
+            header = text[1:].lower()
+            in_transactions = header.startswith('type:') and header[5:].strip() in QIF_TRANSACTION_TYPES
+            record = {}
+            start_line = None
+            continue
+        if not in_transactions:
+            continue
+        # A caret ends a transaction.
+        if text == '^':
+            if start_line is not None:
+                yield qif_row(start_line, record, date_pattern, default_cats)
+            record = {}
+            start_line = None
+            continue
+        if start_line is None:
+            start_line = line
+        if text[0] not in ('S', 'E', '$', '%'):
+            record[text[0]] = text[1:].strip()
+    # Reads the last transaction if the file doesn't end with a caret.
+    if in_transactions and start_line is not None:
+        yield qif_row(start_line, record, date_pattern, default_cats)
+
+# Reads the tags of an OFX file one at a time.
+def read_ofx_tags(ofx_file):
+    """
+    Splits an OFX file into tags as it is read, READ_SIZE characters at a time. This works for both
+    SGML OFX files, where most tags aren't closed and may all be on one line, and XML OFX files.
+
+    Args:
+        ofx_file: The OFX file. (file)
+
+    Yields:
+        (line, tag, text): The line the tag is on, the tag in upper case, such as STMTTRN or /STMTTRN, and
+                           the text after it. (tuple)
+    """
+    line = 1
+    buffer = ''
+    while True:
+        chunk = ofx_file.read(READ_SIZE)
+        buffer += chunk
+        # Keeps the last tag for the next chunk, as it may not have been read in full.
+        if chunk == '':
+            end = len(buffer)
+        else:
+            end = max(buffer.rfind('<'), 0)
+        position = 0
+        for match in OFX_TAG.finditer(buffer, 0, end):
+            line += buffer.count('\n', position, match.start())
+            position = match.start()
+            tag = match.group(1).strip()
+            # Skips the XML declaration and comments.
+            if tag.startswith('?') or tag.startswith('!'):
+                continue
+            yield (line, tag.upper(), html.unescape(match.group(2).strip()))
+        line += buffer.count('\n', position, end)
+        buffer = buffer[end:]
+        if chunk == '':
+            return
+
+# Reads the transactions of an OFX file one at a time.
+def read_ofx_rows(ofx_file, default_cats):
+    """
+    Parses the transactions of an OFX file as it is read. OFX transactions don't have categories, so
+    each one is added to the default category for its target.
+
+    Args:
+        ofx_file: The OFX file. (file)
+        default_cats: The category for transactions, with keys 'expenses' and 'income'. (dict)
+
+    Yields:
+        (line, target, row_info): row_info is [category, name, amount, date_added], or a str saying why the
+                                  transaction is invalid. (tuple)
+    """
+    transaction = None
+    start_line = None
+    for line, tag, text in read_ofx_tags(ofx_file):
+        if tag == 'STMTTRN':
+            transaction = {}
+            start_line = line
+        elif tag == '/STMTTRN':
+            if transaction is not None:
+                # Dates are written as YYYYMMDD, followed by an optional time and time zone.
+                date_text = transaction.get('DTPOSTED', '')
+                date_added = global_utils.date_to_days(date_text[:8], '%Y%m%d')
+                if date_added is None:
+                    date_added = f"'{date_text}' is not a valid date."
+                name = transaction.get('NAME') or transaction.get('MEMO') or ''
+                yield statement_row(start_line, transaction.get('TRNAMT', ''), date_added, name, None, default_cats)
+            transaction = None
+        elif transaction is not None and not tag.startswith('/'):
+            transaction[tag] = text
+
+# Gets the format of a bank statement.
+def get_statement_format(path):
+    """
+    Gets whether a bank statement is a QIF or OFX file, from its extension or else its first line.
+
+    Args:
+        path: The path of the statement. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        'qif' or 'ofx': The format of the statement. (str)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.qif':
+        return 'qif'
+    if extension in ('.ofx', '.qfx'):
+        return 'ofx'
+    try:
+        with open(path, encoding='utf-8-sig', errors='replace') as statement_file:
+            start = statement_file.read(1024).lstrip()
+    except Exception as e:
+        return [1, e]
+    if start.startswith('!'):
+        return 'qif'
+    if 'OFXHEADER' in start.upper() or '<OFX>' in start.upper():
+        return 'ofx'
+    return [1, ValueError("The file is not a QIF or OFX file.")]
+
+# Imports a QIF or OFX bank statement.
+def import_statement(path, statement_format, default_cats, date_pattern=None, create_cats=False, progress=None):
+    """
+    Imports the transactions of a QIF or OFX bank statement into expenses and income. The file is read
+    in a single pass, so statements of any size can be imported.
+
+    Args:
+        path: The path of the statement. (str)
+        statement_format: 'qif' or 'ofx'. (str)
+        default_cats: The category for transactions without one, with keys 'expenses' and 'income'. A
+                      value may be None to skip those transactions. (dict)
+        date_pattern: A strptime pattern for the dates of a QIF file, or None if they are MM/DD/YYYY. (str)
+        create_cats: If True, categories that don't exist yet are added. Otherwise their rows are rejected. (bool)
+        progress: Called with the summary after each batch is written. (function)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        [0, summary]: 0 shows that nothing has gone wrong and summary is the summary of the import. (dict)
+    """
+    if date_pattern is None:
+        date_pattern = QIF_DATE_PATTERN
+    try:
+        with open(path, newline='', encoding='utf-8-sig', errors='replace') as statement_file:
+            if statement_format == 'qif':
+                rows = read_qif_rows(statement_file, date_pattern, default_cats)
+            else:
+                rows = read_ofx_rows(statement_file, default_cats)
+            summary = import_rows(rows, create_cats, progress)
+    except Exception as e:
+        return [1, e]
+    return [0, summary]
@@ -3,73 +3,21 @@
 ## Imports ##
 
 import sqlite3
-import os
+import tracker_db
 
-## Functions ##
-
-# Creates income database if it doesn't exist.
-def create_income():
-    """
-    Creates the income database if it doesn't already exist.
-
-    Args:
-        None
-        
-    Returns:
-        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
-    """
-    try:
-        db = sqlite3.connect('data/tracker')
-    except sqlite3.OperationalError:
-        os.mkdir('data')
-    try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS income(
-                        category TEXT,
-                        name TEXT UNIQUE PRIMARY KEY,
-                        amount FLOAT,
-                        date_added TEXT)''')
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        db.close()
-        return [1, e]
-    finally:
-        db.close()
+## Variables ##
 
-    return [0, 0]
+# Selects income as (category, name, amount, date_added, id), with the category by name.
+INCOME_SELECT = '''SELECT income_cats.name, income.name, income.amount, income.date_added, income.id
+                   FROM income JOIN income_cats ON income_cats.id = income.category_id'''
 
-# Creates income_cats database if it doesn't exist.
-def create_income_cats():
-    """
-    Creates the income categories database if it doesn't already exist.
+# The number of rows add_income_many inserts with each executemany call.
+CHUNK_SIZE = 1000
 
-    Args:
-        None
-        
-    Returns:
-        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
-    """  
-    try:
-        db = sqlite3.connect('data/tracker')
-    except sqlite3.OperationalError:
-        os.mkdir('data')
-    try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('CREATE TABLE IF NOT EXISTS income_cats(name TEXT)')
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        db.close()
-        return [1, e]
-    finally:
-        db.close()
+# The most matches a search ranks by default. Only the newest are ranked when more income match.
+SEARCH_CANDIDATES = 2000
 
-    return [0, 0]
+## Functions ##
 
 # Gets a list of categories.
 def get_cat_list():
@@ -85,7 +33,7 @@ def get_cat_list():
     """
     cat_list = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
         cursor.execute('''SELECT name
                           FROM income_cats''')
@@ -93,11 +41,7 @@ def get_cat_list():
             for category in row:
                 cat_list.append(category)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return cat_list
 
 # Gets a list of income names.
@@ -114,77 +58,101 @@ def get_name_list():
     """
     name_list = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT name
+        cursor.execute('''SELECT DISTINCT name
                           FROM income''')
         for row in cursor:
             for name in row:
                 name_list.append(name)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return name_list
         
-# Gets specific income data.
-def get_income(search_term):
+# Gets an income by its id.
+def get_income_by_id(income_id):
     """
-    Gets data for a specific income.
+    Gets the data of the income with an id.
 
     Args:
-        search_term: The search term to search the database for. (str or float)
+        income_id: The id of the income. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        income_info: The info of a specific income. (list of strings and floats)
+        income_info: A list of the tuple of income data, empty if there is no such income. (list of a tuple of str and ints)
     """
     income_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT * FROM income WHERE 
-                       category = ? OR name = ? OR amount = ? OR date_added = ?''',
-                       (search_term, search_term, search_term, search_term))
+        cursor.execute(INCOME_SELECT + ''' WHERE
+                       income.id = ?''',
+                       (income_id,))
         for row in cursor:
             income_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return income_info
 
-# Gets all income data.
-def get_all_income():
+# Gets the income with a name.
+def get_income_by_name(name, limit=None):
     """
-    Gets data for all income.
+    Gets a list of income data for every income with a name.
 
     Args:
-        None
+        name: The name of the income. (str)
+        limit: The most income to get, or None for all of them. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        income_info: A list of info of a specific income. (list of tuples of strings and floats)
+        income_info: A list of tuples of income data. (list of tuples of strs and ints)
     """
     income_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('SELECT * FROM income')
+        query = INCOME_SELECT + ''' WHERE
+                       income.name = ?
+                       ORDER BY income.id'''
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        cursor.execute(query, (name,))
         for row in cursor:
             income_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return income_info
 
+# Reads all income data.
+def iter_all_income():
+    """
+    Reads the data of every income, oldest first, a few rows at a time.
+
+    Args:
+        None
+
+    Yields:
+        income: The income data as (category, name, amount, date_added, id). (tuple of strs and ints)
+    """
+    yield from tracker_db.iter_rows(INCOME_SELECT + ' ORDER BY income.id')
+
+# Gets all income data.
+def get_all_income():
+    """
+    Gets data for all income.
+
+    Args:
+        None
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        income_info: A list of info of a specific income. (list of tuples of strings and ints)
+    """
+    try:
+        return list(iter_all_income())
+    except Exception as e:
+        return [1, e]
+
 # Gets the total income amount of a category.
 def get_cat_income(category):
     """
@@ -195,26 +163,35 @@ def get_cat_income(category):
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        income_total: The total amount of income for an income category. (float)
+        income_total: The total amount of income for an income category in cents. (int)
     """
-    income_total = 0.0
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT amount FROM income WHERE
-                       category = ?''',
+        cursor.execute('''SELECT IFNULL(SUM(total), 0) FROM income_cat_totals WHERE
+                       category_id = (SELECT id FROM income_cats WHERE name = ?)''',
                        (category,))
-        for row in cursor:
-            for amount in row:
-                income_total += amount
+        income_total = cursor.fetchone()[0]
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return income_total
 
+# Reads income from a single category.
+def iter_income_from_category(category):
+    """
+    Reads the data of the income in a category, oldest first, a few rows at a time.
+
+    Args:
+        category: The name of the category we want the data for. (str)
+
+    Yields:
+        income: The income data as (category, name, amount, date_added, id). (tuple of strs and ints)
+    """
+    yield from tracker_db.iter_rows(INCOME_SELECT + ''' WHERE
+                                    income_cats.name = ?
+                                    ORDER BY income.id''',
+                                    (category,))
+
 # Gets income data from a single category.
 def get_income_from_category(category):
     """
@@ -225,24 +202,331 @@ def get_income_from_category(category):
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        income_info: The income information from the database. (list of str, floats)
+        income_info: The income information from the database. (list of str, ints)
+    """
+    try:
+        return list(iter_income_from_category(category))
+    except Exception as e:
+        return [1, e]
+
+# Gets a page of income.
+def get_income_page(category, after_id, before_id, page_size):
+    """
+    Gets a page of income data, oldest first, by seeking to the id of the income next to it rather
+    than counting past the income before it, so every page takes the same time to get.
+
+    Args:
+        category: The name of the category to get the income of, or None for every category. (str)
+        after_id: The page starts after the income with this id, or None. (int)
+        before_id: The page ends before the income with this id, or None. (int)
+        page_size: The number of lots of income on the page. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, income_info, more]: 0 shows that nothing has gone wrong, income_info is a list of tuples of
+                                income data and more is True if there is more income past the page
+                                in the direction it was got. (list)
+    """
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append('income.category_id = (SELECT id FROM income_cats WHERE name = ?)')
+        params.append(category)
+    # Pages before an income are got newest first and then put back in order.
+    if before_id is not None:
+        conditions.append('income.id < ?')
+        params.append(before_id)
+        order = 'DESC'
+    else:
+        if after_id is not None:
+            conditions.append('income.id > ?')
+            params.append(after_id)
+        order = 'ASC'
+    query = INCOME_SELECT
+    if len(conditions) != 0:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    # Gets one more income than fits on the page to see if there are more.
+    query += f' ORDER BY income.id {order} LIMIT ?'
+    params.append(page_size + 1)
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        income_info = cursor.fetchall()
+    except Exception as e:
+        return [1, e]
+    more = len(income_info) > page_size
+    income_info = income_info[:page_size]
+    if before_id is not None:
+        income_info.reverse()
+    return [0, income_info, more]
+
+# Gets income added between two dates.
+def get_income_between(start, end, limit=None):
+    """
+    Gets a list of income data for the income added between two dates, oldest first.
+
+    Args:
+        start: The first date to include, as the number of days since 1970-01-01. (int)
+        end: The last date to include, as the number of days since 1970-01-01. (int)
+        limit: The most income to get, or None for all of them. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        income_info: A list of tuples of income data. (list of tuples of strs and ints)
     """
     income_info = []
     try:
-        db = sqlite3.connect('data/tracker')
+        db = tracker_db.get_connection()
         cursor = db.cursor()
-        cursor.execute('''SELECT * FROM income WHERE
-                       category = ?''',
-                       (category,))
+        query = INCOME_SELECT + ''' WHERE
+                       date_added BETWEEN ? AND ?
+                       ORDER BY date_added'''
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        cursor.execute(query, (start, end))
+        for row in cursor:
+            income_info.append(row)
+    except Exception as e:
+        return [1, e]
+    return income_info
+
+# Gets income by an amount range.
+def get_income_by_amount(low, high, limit=None):
+    """
+    Gets a list of income data for the income with an amount in a range, smallest first.
+
+    Args:
+        low: The smallest amount to include in cents. (int)
+        high: The largest amount to include in cents. (int)
+        limit: The most income to get, or None for all of them. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        income_info: A list of tuples of income data. (list of tuples of strs and ints)
+    """
+    income_info = []
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        query = INCOME_SELECT + ''' WHERE
+                       amount BETWEEN ? AND ?
+                       ORDER BY amount, income.id'''
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        cursor.execute(query, (low, high))
         for row in cursor:
             income_info.append(row)
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
-    return income_info    
+    return income_info
+
+# Searches the names of income.
+def search_income(search_text, category=None, start=None, end=None, limit=None, candidates=SEARCH_CANDIDATES):
+    """
+    Searches the names of income with the full-text index, best matches first. Each word searched for
+    must be in the name, or start a word in it. Ranking takes time in proportion to the number of
+    matches, so at most candidates matches are ranked, newest first. When that many match, as with a
+    common word, the best of the newest are found rather than the best of all of them.
+
+    Args:
+        search_text: The words to search for. (str)
+        category: Only income in this category are found, or None for every category. (str)
+        start: The first date to include, as the number of days since 1970-01-01, or None. (int)
+        end: The last date to include, as the number of days since 1970-01-01, or None. (int)
+        limit: The most income to get, or None for all of them. (int)
+        candidates: The most matches to rank, or None to rank every match. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, income_info, capped]: 0 shows that nothing has gone wrong, income_info is a list of tuples
+                                  of income data and capped is True if at least candidates income matched, so
+                                  only the newest were ranked. (list)
+    """
+    income_info = []
+    capped = False
+    match = tracker_db.match_query(search_text)
+    if match is None:
+        return [0, income_info, capped]
+    conditions = []
+    params = [match]
+    if category is not None:
+        conditions.append('income_cats.name = ?')
+        params.append(category)
+    if start is not None:
+        conditions.append('income.date_added >= ?')
+        params.append(start)
+    if end is not None:
+        conditions.append('income.date_added <= ?')
+        params.append(end)
+    # Only the newest matches are ranked, as ranking every match of a common word takes time in
+    # proportion to the size of the table.
+    query = '''SELECT income_cats.name, income.name, income.amount, income.date_added AS date_added, income.id,
+                      income_fts.rank AS rank
+               FROM income_fts
+               JOIN income ON income.id = income_fts.rowid
+               JOIN income_cats ON income_cats.id = income.category_id
+               WHERE income_fts MATCH ?'''
+    for condition in conditions:
+        query += ' AND ' + condition
+    if candidates is not None:
+        query += ' ORDER BY income_fts.rowid DESC LIMIT ?'
+        params.append(candidates)
+    # Ties, such as income with the same name, are shown newest first. The number of matches ranked is
+    # counted to see if the candidates ran out.
+    query = f'SELECT *, COUNT(*) OVER () FROM ({query}) ORDER BY rank, date_added DESC'
+    if limit is not None:
+        query += f' LIMIT {int(limit)}'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        for row in cursor:
+            income_info.append(row[:5])
+            capped = candidates is not None and row[6] >= candidates
+    except Exception as e:
+        return [1, e]
+    return [0, income_info, capped]
+
+# Gets the total of the income added between two dates.
+def get_income_total_between(start, end):
+    """
+    Gets the total amount of the income added between two dates.
+
+    Args:
+        start: The first date to include, as the number of days since 1970-01-01. (int)
+        end: The last date to include, as the number of days since 1970-01-01. (int)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        income_total: The total amount of the income in cents. (int)
+    """
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute('''SELECT IFNULL(SUM(amount), 0) FROM income WHERE
+                       date_added BETWEEN ? AND ?''',
+                       (start, end))
+        income_total = cursor.fetchone()[0]
+    except Exception as e:
+        return [1, e]
+    return income_total
+
+# Gets the totals of each income category.
+def get_cat_totals(category=None):
+    """
+    Gets the number, total, smallest and largest amount of the income in each category, and the date
+    the latest was added. The count, total and date are read from income_cat_totals, which triggers keep
+    up to date, and the smallest and largest are two lookups in the category and amount index, so this
+    takes the same time however much income there is.
+
+    Args:
+        category: Only this category's totals are got, or None for every category. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        cat_totals: A tuple of (name, count, total, last_date, smallest, largest) for each category, with amounts
+                    in cents and the date as days since 1970-01-01. last_date, smallest and largest are None
+                    if a category has no income. (list of tuples of strs and ints)
+    """
+    cat_totals = []
+    query = '''SELECT income_cats.name, IFNULL(income_cat_totals.count, 0), IFNULL(income_cat_totals.total, 0),
+                      income_cat_totals.last_date,
+                      (SELECT MIN(amount) FROM income WHERE category_id = income_cats.id),
+                      (SELECT MAX(amount) FROM income WHERE category_id = income_cats.id)
+               FROM income_cats LEFT JOIN income_cat_totals ON income_cat_totals.category_id = income_cats.id'''
+    params = ()
+    if category is not None:
+        query += ' WHERE income_cats.name = ?'
+        params = (category,)
+    query += ' ORDER BY income_cats.name'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        for row in cursor:
+            cat_totals.append(row)
+    except Exception as e:
+        return [1, e]
+    return cat_totals
+
+# Gets the monthly totals of income.
+def get_monthly_totals(category=None, start=None, end=None):
+    """
+    Gets the number and total amount of the income added in each month, from income_monthly, which triggers
+    keep up to date. A series over ten years reads at most 120 rows for each category, however many
+    income there are. Months with no income are left out.
+
+    Args:
+        category: Only this category's income are counted, or None for every category. (str)
+        start: The first month to get, as YYYY-MM, or None. (str)
+        end: The last month to get, as YYYY-MM, or None. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        monthly_totals: A tuple of (month, count, total) for each month in order, with the month as YYYY-MM
+                        and the total in cents. (list of tuples of strs and ints)
+    """
+    monthly_totals = []
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append('category_id = (SELECT id FROM income_cats WHERE name = ?)')
+        params.append(category)
+    if start is not None:
+        conditions.append('month >= ?')
+        params.append(start)
+    if end is not None:
+        conditions.append('month <= ?')
+        params.append(end)
+    query = 'SELECT month, SUM(count), SUM(total) FROM income_monthly'
+    if len(conditions) != 0:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' GROUP BY month ORDER BY month'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, params)
+        for row in cursor:
+            monthly_totals.append(row)
+    except Exception as e:
+        return [1, e]
+    return monthly_totals
+
+# Gets the monthly totals of each income category.
+def get_monthly_cat_totals(start=None, end=None):
+    """
+    Gets the number and total amount of the income added in each month for every category, from
+    income_monthly. Months in which a category has no income are left out.
+
+    Args:
+        start: The first month to get, as YYYY-MM, or None. (str)
+        end: The last month to get, as YYYY-MM, or None. (str)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        monthly_totals: A tuple of (category, month, count, total) for each category and month, ordered by
+                        category then month. (list of tuples of strs and ints)
+    """
+    monthly_totals = []
+    query = '''SELECT income_cats.name, income_monthly.month, income_monthly.count, income_monthly.total
+               FROM income_monthly JOIN income_cats ON income_cats.id = income_monthly.category_id
+               WHERE income_monthly.month BETWEEN ? AND ?
+               ORDER BY income_cats.name, income_monthly.month'''
+    # Every YYYY-MM sorts between these.
+    if start is None:
+        start = '0000-00'
+    if end is None:
+        end = '9999-99'
+    try:
+        db = tracker_db.get_connection()
+        cursor = db.cursor()
+        cursor.execute(query, (start, end))
+        for row in cursor:
+            monthly_totals.append(row)
+    except Exception as e:
+        return [1, e]
+    return monthly_totals
 
 # Adds an income.
 def add_income(income_info):
@@ -250,160 +534,230 @@ def add_income(income_info):
     Adds an income to the database.
 
     Args:
-        income_info: A list of income information. (list of str, floats)
+        income_info: A list of income information. (list of str, ints)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
-        [0, 0]: 0 shows that nothing has gone wrong.
+        [0, income_id]: 0 shows that nothing has gone wrong and income_id is the id of the new income. (int)
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''INSERT INTO income
-                       (category, name, amount, date_added)
-                       VALUES(?, ?, ?, ?)''',
-                       (income_info[0], income_info[1], income_info[2], income_info[3]))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''INSERT INTO income
+                           (category_id, name, amount, date_added)
+                           VALUES((SELECT id FROM income_cats WHERE name = ?), ?, ?, ?)''',
+                           (income_info[0], income_info[1], income_info[2], income_info[3]))
+            income_id = cursor.lastrowid
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
-    return [0, 0]
+    return [0, income_id]
+
+# Adds many income in one transaction.
+def add_income_many(income_rows):
+    """
+    Adds many income in a single transaction, inserting CHUNK_SIZE rows with each executemany call.
+    A row that can't be added, for example because its category doesn't exist, is reported in the
+    results and doesn't stop the others from being added.
+
+    Args:
+        income_rows: The income to add, each as [category, name, amount, date_added]. (iterable of lists of strs and ints)
+        
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, results]: 0 shows that nothing has gone wrong and results has a result for each row in order, either
+                      [0, income_id] if it was added or [1, e] if it wasn't. (list of lists)
+    """
+    results = []
+    try:
+        with tracker_db.transaction() as db:
+            chunk = []
+            for income_info in income_rows:
+                chunk.append((income_info[0], income_info[1], income_info[2], income_info[3]))
+                if len(chunk) == CHUNK_SIZE:
+                    results.extend(add_income_chunk(db, chunk))
+                    chunk = []
+            if len(chunk) != 0:
+                results.extend(add_income_chunk(db, chunk))
+    except Exception as e:
+        return [1, e]
+    return [0, results]
+
+# Adds a chunk of income for add_income_many.
+def add_income_chunk(db, chunk):
+    """
+    Adds a chunk of income with one executemany call. If any row in the chunk breaks a constraint, the
+    chunk is rolled back and its rows are added one at a time so each gets its own result. This must
+    run inside a transaction.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        chunk: The income to add, each as (category, name, amount, date_added). (list of tuples of strs and ints)
+        
+    Returns:
+        results: A result for each row in order, either [0, income_id] or [1, e]. (list of lists)
+    """
+    insert_sql = '''INSERT INTO income
+                    (category_id, name, amount, date_added)
+                    VALUES((SELECT id FROM income_cats WHERE name = ?), ?, ?, ?)'''
+    try:
+        with tracker_db.transaction():
+            # Pauses the search index, category totals and monthly totals triggers so the chunk can be
+            # indexed and added to the totals in one statement each, which is much faster than a row at a time.
+            db.execute('INSERT INTO triggers_paused(paused) VALUES(1)')
+            db.executemany(insert_sql, chunk)
+            last_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+            chunk_ids = (last_id - len(chunk) + 1, last_id)
+            db.execute('''INSERT INTO income_fts(rowid, name)
+                          SELECT id, name FROM income WHERE id BETWEEN ? AND ?''',
+                       chunk_ids)
+            db.execute('''INSERT INTO income_cat_totals(category_id, count, total, last_date)
+                          SELECT category_id, COUNT(*), SUM(amount), MAX(date_added) FROM income
+                          WHERE id BETWEEN ? AND ? GROUP BY category_id
+                          ON CONFLICT(category_id) DO UPDATE SET count = count + excluded.count,
+                          total = total + excluded.total,
+                          last_date = MAX(IFNULL(last_date, excluded.last_date), excluded.last_date)''',
+                       chunk_ids)
+            db.execute('''INSERT INTO income_monthly(category_id, month, count, total)
+                          SELECT category_id, strftime('%Y-%m', date_added * 86400, 'unixepoch'), COUNT(*), SUM(amount)
+                          FROM income WHERE id BETWEEN ? AND ? GROUP BY 1, 2
+                          ON CONFLICT(category_id, month) DO UPDATE SET count = count + excluded.count,
+                          total = total + excluded.total''',
+                       chunk_ids)
+            db.execute('DELETE FROM triggers_paused')
+    except sqlite3.IntegrityError:
+        results = []
+        for row in chunk:
+            try:
+                cursor = db.execute(insert_sql, row)
+                results.append([0, cursor.lastrowid])
+            except sqlite3.IntegrityError as e:
+                results.append([1, e])
+        return results
+    # The write lock is held for the whole transaction, so the chunk's rows were given consecutive ids.
+    first_id = last_id - len(chunk) + 1
+    results = []
+    for income_id in range(first_id, last_id + 1):
+        results.append([0, income_id])
+    return results
 
 # Deletes an income.
-def delete_income(name):
+def delete_income(income_id):
     """
     Deletes an income from the database.
 
     Args:
-        name: The name of an income. (str)
+        income_id: The id of an income. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM income WHERE
-                       name = ?''',
-                       (name,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''DELETE FROM income WHERE
+                           id = ?''',
+                           (income_id,))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Updates the information of an income.
-def update_income(updated_income_info, income_name):
+def update_income(updated_income_info, income_id):
     """
     Updates the income information in the database.
 
     Args:
-        updated_income_info: A list of the new income information. (list of str, floats)
-        income_name: The name of the income to be updated. (str)
+        updated_income_info: A list of the new income information. (list of str, ints)
+        income_id: The id of the income to be updated. (int)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''UPDATE income SET
-                       category = ?, name = ?, amount = ?, date_added = ?
-                       WHERE name = ?''',
-                       (updated_income_info[0], updated_income_info[1], updated_income_info[2], updated_income_info[3], income_name))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE income SET
+                           category_id = (SELECT id FROM income_cats WHERE name = ?), name = ?, amount = ?, date_added = ?
+                           WHERE id = ?''',
+                           (updated_income_info[0], updated_income_info[1], updated_income_info[2], updated_income_info[3], income_id))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
-# Deletes income associated with a category.
-def delete_income_from_cat(category):
+# Adds a new income category.
+def add_income_cat(name):
     """
-    Deletes the income associated with a category from the database.
+    Adds an income category to the database.
 
     Args:
-        category: The category to delete the income from. (str)
+        name: The name of the new income category. (str)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM income WHERE
-                       category = ?''',
-                       (category,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''INSERT INTO income_cats(name)
+                              VALUES(?)''', (name,))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
-# Adds a new income category.
-def add_income_cat(name):
+# Renames an income category.
+def rename_income_cat(name, new_name):
     """
-    Adds an income category to the database.
+    Renames an income category, along with its income goal if it has one. The income in it points at
+    the category's id, so it doesn't change.
 
     Args:
-        name: The name of the new income category. (str)
+        name: The name of the income category to be renamed. (str)
+        new_name: The new name of the income category. (str)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''INSERT INTO income_cats(name)
-                          VALUES(?)''', (name,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''UPDATE income_cats SET
+                           name = ? WHERE name = ?''',
+                           (new_name, name))
+            # Income goals are named after their category.
+            cursor.execute('''UPDATE goals SET
+                           name = ? WHERE name = ? AND category = 'income' ''',
+                           (new_name, name))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
 
 # Deletes an income category.
 def delete_income_cat(name):
     """
-    Deletes an income category from the database.
+    Deletes an income category and its income goal from the database. The income in it is deleted
+    along with it by the foreign key.
 
     Args:
-        name: The name of the new income category. (str)
+        name: The name of the income category. (str)
         
     Returns:
         [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
         [0, 0]: 0 shows that nothing has gone wrong.
     """
     try:
-        db = sqlite3.connect('data/tracker')
-        cursor = db.cursor()
-        cursor.execute('''DELETE FROM income_cats WHERE
-                       name = ?''',
-                       (name,))
-        db.commit()
+        with tracker_db.transaction() as db:
+            cursor = db.cursor()
+            cursor.execute('''DELETE FROM income_cats WHERE
+                           name = ?''',
+                           (name,))
+            # Income goals are named after their category.
+            cursor.execute('''DELETE FROM goals WHERE
+                           name = ? AND category = 'income' ''',
+                           (name,))
     except Exception as e:
-        db.rollback()
-        db.close()
         return [1, e]
-    finally:
-        db.close()
     return [0, 0]
@@ -2,8 +2,7 @@ import income_db
 import income_utils
 import global_utils
 import goals_utils
-import goals_db
-import datetime
+import tracker_db
 
 # Contains all the menu functions for the income section of the tracker.
 
@@ -28,6 +27,9 @@ def main_menu():
 5 - View income by category
 6 - Add a new income category
 7 - Delete an income category                           
+8 - Rename an income category
+9 - Search income
+10 - View monthly income
 0 - Return to previous menu
 : ''')
 
@@ -59,6 +61,18 @@ def main_menu():
         elif user_input == '7':
             delete_category()
 
+        # Rename an income category.
+        elif user_input == '8':
+            rename_category()
+
+        # Search income.
+        elif user_input == '9':
+            search_income()
+
+        # View monthly income.
+        elif user_input == '10':
+            view_monthly()
+
         # Return to previous menu.
         elif user_input == '0':
             return
@@ -84,16 +98,6 @@ def add_income():
             print(f"Error: {current_income_cats[1]}")
             return
     
-    # Get list of current income names.
-    current_income_names = income_db.get_name_list()
-    # If the list is not empty (there might be no income added).
-    if len(current_income_names) != 0:
-        # If the get_cat_list() function has returned an error.
-        if current_income_names[0] == 1:
-            print("\nSorry, something went wrong retrieving the income names.")
-            print(f"Error: {current_income_names[1]}")
-            return
-    
     # Tells the user what's happening.
     print("\nAdding a new income.")
 
@@ -106,12 +110,6 @@ def add_income():
         print("\nYou can't add an income as you haven't added any income categories.")
         return
     
-    # If income names exist, print them.
-    if len(current_income_names) != 0:
-        print("\nList of current income:")
-        for income in current_income_names:
-            print(global_utils.name_capitalise(income))
-    
     # Create an empty list to add the new income data to.
     new_income_info = []
 
@@ -124,9 +122,9 @@ def add_income():
         new_income_info.append(new_income_cat)
 
     # Gets the name of the new income.
-    new_income_name = income_utils.get_new_income_name(current_income_names)
+    new_income_name = income_utils.get_new_income_name()
     # If the result is 1, return to the previous menu.
-    if new_income_cat == 1:
+    if new_income_name == 1:
         return
     else:
         new_income_info.append(new_income_name)
@@ -140,11 +138,20 @@ def add_income():
         new_income_info.append(new_income_amount)
 
     # Gets today's date.
-    new_income_date = datetime.datetime.today().strftime('%Y-%m-%d')
+    new_income_date = global_utils.today()
     new_income_info.append(new_income_date)
 
-    # Adds the new income to the tracker.
-    add_income_result = income_db.add_income(new_income_info)
+    # Adds the new income and updates the income goals in one transaction, so both are saved or neither is.
+    try:
+        with tracker_db.transaction():
+            add_income_result = income_db.add_income(new_income_info)
+            if add_income_result[0] == 1:
+                raise add_income_result[1]
+            update_goals_result = goals_utils.update_income_goals()
+            if update_goals_result[0] == 1:
+                raise update_goals_result[1]
+    except Exception as e:
+        add_income_result = [1, e]
     if add_income_result[0] == 1:
         print("\nSorry, something went wrong adding the income to the database.")
         print(f"Error: {add_income_result[1]}")
@@ -153,9 +160,86 @@ def add_income():
         print(f"\n{global_utils.name_capitalise(new_income_info[1])} was successfully added to the database.")
     else:
         print("\nSorry, an unexpected error has occurred and the income could not be added to the database.")
-    
-    # Updates income goals.
-    goals_utils.update_income_goals()
+
+# Finds the income the user is looking for.
+def find_income(action, current_income_cats):
+    """
+    Lets the user search for income by name, ID, category, amount range, date range or a
+    search of the names. Each search uses an index, and at most MATCH_LIMIT lots of income are shown to choose from.
+
+    Args:
+        action: What the user wants to do with the income, such as 'edit'. (str)
+        current_income_cats: A list of the names of the current income categories. (list of str)
+
+    Returns:
+        matching_income: The data of the income found. (list of tuples of strs and ints)
+        1: If the user wishes to return to the previous menu, or nothing was found. (int)
+    """
+    # Gets what to search by.
+    lookup_type = global_utils.get_lookup_type('income', action)
+    if lookup_type == 1:
+        return 1
+
+    # Gets what to search for and searches. One more lot of income than can be shown is got to see if there are more.
+    if lookup_type == 'name':
+        name = global_utils.get_lookup_name('income')
+        if name == 1:
+            return 1
+        matching_income = income_db.get_income_by_name(name, global_utils.MATCH_LIMIT + 1)
+    elif lookup_type == 'id':
+        income_id = global_utils.get_lookup_id('income')
+        if income_id == 1:
+            return 1
+        matching_income = income_db.get_income_by_id(income_id)
+    elif lookup_type == 'category':
+        if len(current_income_cats) == 0:
+            print("\nYou haven't added any income categories.")
+            return 1
+        category = global_utils.get_lookup_category(current_income_cats)
+        if category == 1:
+            return 1
+        income_page = income_db.get_income_page(category, None, None, global_utils.MATCH_LIMIT + 1)
+        if income_page[0] == 1:
+            matching_income = income_page
+        else:
+            matching_income = income_page[1]
+    elif lookup_type == 'amount':
+        amount_range = global_utils.get_amount_range()
+        if amount_range == 1:
+            return 1
+        matching_income = income_db.get_income_by_amount(amount_range[0], amount_range[1], global_utils.MATCH_LIMIT + 1)
+    elif lookup_type == 'search':
+        search_text = global_utils.get_search_text('income')
+        if search_text == 1:
+            return 1
+        search_result = income_db.search_income(search_text, limit=global_utils.MATCH_LIMIT + 1)
+        if search_result[0] == 1:
+            matching_income = search_result
+        else:
+            matching_income = search_result[1]
+            # If a common word matched too many to rank them all.
+            if search_result[2]:
+                print(f"\nYour search matched at least {income_db.SEARCH_CANDIDATES} income, so only the newest of them were ranked.")
+    else:
+        date_range = global_utils.get_date_range()
+        if date_range == 1:
+            return 1
+        matching_income = income_db.get_income_between(date_range[0], date_range[1], global_utils.MATCH_LIMIT + 1)
+
+    # If the search has returned an error.
+    if len(matching_income) != 0 and matching_income[0] == 1:
+        print("\nSorry, something went wrong accessing the income database.")
+        print(f"Error: {matching_income[1]}")
+        return 1
+    # If nothing was found.
+    if len(matching_income) == 0:
+        print("\nNo income matched your search.")
+        return 1
+    # If more income was found than can be shown.
+    if len(matching_income) > global_utils.MATCH_LIMIT:
+        print(f"\nOnly the first {global_utils.MATCH_LIMIT} lots of income found are shown. Search more narrowly to see the rest.")
+        matching_income = matching_income[:global_utils.MATCH_LIMIT]
+    return matching_income
 
 # Deletes an income
 def delete_income():
@@ -168,36 +252,46 @@ def delete_income():
     Returns:
         None
     """
-    # Get list of current income names.
-    current_income_names = income_db.get_name_list()
-    # If the list is not empty (there might be no income added).
-    if len(current_income_names) != 0:
+    # Get list of current income categories.
+    current_income_cats = income_db.get_cat_list()
+    # If the list is not empty (there might be no categories added).
+    if len(current_income_cats) != 0:
         # If the get_cat_list() function has returned an error.
-        if current_income_names[0] == 1:
-            print("\nSorry, something went wrong retrieving the income names.")
-            print(f"Error: {current_income_names[1]}")
+        if current_income_cats[0] == 1:
+            print("\nSorry, something went wrong accessing the income categories database.")
+            print(f"Error: {current_income_cats[1]}")
             return
 
     # Tells the user what's happening.
     print("\nDeleting an income.")
 
-    # If income names exist, print them.
-    if len(current_income_names) != 0:
-        print("\nList of current income:")
-        for income in current_income_names:
-            print(global_utils.name_capitalise(income))
+    # Finds the income the user is looking for.
+    matching_income = find_income('delete', current_income_cats)
+    # Returns to the previous menu if find_income returns 1.
+    if matching_income == 1:
+        return
 
-    # Get the name of the income to delete.
-    income_to_delete = income_utils.get_income_to_delete(current_income_names)
-    # Returns to the previous menu if income_to_delete returns 1.
-    if income_to_delete == 1:
+    # Gets the income to delete if more than one was found.
+    income_to_delete_info = income_utils.get_income_from_matches(matching_income)
+    # Returns to the previous menu if get_income_from_matches returns 1.
+    if income_to_delete_info == 1:
         return
+    income_to_delete = income_to_delete_info[1]
     
     # Tells the user what's happening.
     print(f"\nDeleting {global_utils.name_capitalise(income_to_delete)} from the database...")
 
-    # Deletes the existing income from the database.
-    delete_income_result = income_db.delete_income(income_to_delete)
+    # Deletes the existing income and updates the income goals in one transaction.
+    try:
+        with tracker_db.transaction():
+            delete_income_result = income_db.delete_income(income_to_delete_info[4])
+            if delete_income_result[0] == 1:
+                raise delete_income_result[1]
+            update_goals_result = goals_utils.update_income_goals()
+            if update_goals_result[0] == 1:
+                raise update_goals_result[1]
+    except Exception as e:
+        delete_income_result = [1, e]
     # Handles unexpected behaviour of the function not returning a list/anything.
     if len(delete_income_result) == 0:
         print(f"\nAn unexpected error occurred while trying to delete {global_utils.name_capitalise(income_to_delete)} from the database.")
@@ -215,9 +309,6 @@ def delete_income():
     else:
         print(f"\nAn unexpected error occurred while trying to delete {global_utils.name_capitalise(income_to_delete)} from the database.")
         return
-    
-    # Updates income goals.
-    goals_utils.update_income_goals()
 
 # Edits an income.
 def edit_income():
@@ -240,91 +331,80 @@ def edit_income():
             print(f"Error: {current_income_cats[1]}")
             return
     
-    # Get list of current income names.
-    current_income_names = income_db.get_name_list()
-    # If the list is not empty (there might be no income added).
-    if len(current_income_names) != 0:
-        # If the get_cat_list() function has returned an error.
-        if current_income_names[0] == 1:
-            print("\nSorry, something went wrong retrieving the income names.")
-            print(f"Error: {current_income_names[1]}")
-            return
-
-    # If income names exist, print them.
-    if len(current_income_names) != 0:
-        print("\nList of current income:")
-        for income in current_income_names:
-            print(global_utils.name_capitalise(income))
+    # Finds the income the user is looking for.
+    matching_income = find_income('edit', current_income_cats)
+    # If the result is 1, return to the previous menu.
+    if matching_income == 1:
+        return
 
-    # Gets the name of the income to edit from the user.
-    income_name_to_edit = income_utils.get_income_to_edit(current_income_names)
+    # Gets the current info of the income that's going to be edited, if more than one was found.
+    income_to_edit_current_info = income_utils.get_income_from_matches(matching_income)
     # If the result is 1, return to the previous menu.
-    if income_name_to_edit == 1:
+    if income_to_edit_current_info == 1:
         return
 
     # Tells the user what's happening.
-    print(f"\nYou are editing the {global_utils.name_capitalise(income_name_to_edit)} income.")
-
-    # Gets the current info from the database of the income that's going to be edited.
-    income_to_edit_current_info = income_db.get_income(income_name_to_edit)
-    # If the list is not empty.
-    if len(income_to_edit_current_info) != 0:
-        # If the get_income() function has returned an error.
-        if income_to_edit_current_info[0] == 1:
-            print(f"\nSorry, something went wrong retrieving {global_utils.name_capitalise(income_to_edit_current_info)}'s information.")
-            print(f"Error: {income_to_edit_current_info[1]}")
-            return
+    print(f"\nYou are editing the {global_utils.name_capitalise(income_to_edit_current_info[1])} income.")
 
     # Create an empty list to add the new income data to.    
     new_income_info = []
 
     # Gets the change of income category if required.
-    edited_income_cat = income_utils.get_edit_income_cat(current_income_cats, income_to_edit_current_info[0])
+    edited_income_cat = income_utils.get_edit_income_cat(current_income_cats, income_to_edit_current_info)
     # If the result is 1, return to the previous menu.
     if edited_income_cat == 1:
         return
     # If the result is 2, no change so add current info to new_income_info
     elif edited_income_cat == 2:
-        new_income_info.append(income_to_edit_current_info[0][0])
+        new_income_info.append(income_to_edit_current_info[0])
     # Otherwise add the new income category to new_income_info.
     else:
         new_income_info.append(edited_income_cat)
 
     # Gets the change of name if required.
-    edited_income_name = income_utils.get_edit_income_name(current_income_names, income_to_edit_current_info[0])
+    edited_income_name = income_utils.get_edit_income_name(income_to_edit_current_info)
     # If the result is 1, return to the previous menu.
     if edited_income_name == 1:
         return
     # If the result is 2, no change so add current info to new_income_info
     elif edited_income_name == 2:
-        new_income_info.append(income_to_edit_current_info[0][1])
+        new_income_info.append(income_to_edit_current_info[1])
     # Otherwise add the new name to new_income_info.
     else:
         new_income_info.append(edited_income_name)
 
     # Gets the change of value if required.
-    edited_income_amount = income_utils.get_edit_income_amount(income_to_edit_current_info[0])
+    edited_income_amount = income_utils.get_edit_income_amount(income_to_edit_current_info)
     # If the result is 1, return to the previous menu.
     if edited_income_amount == 1:
         return
     # If the result is 2, no change so add current info to new_income_info
     elif edited_income_amount == 2:
-        new_income_info.append(income_to_edit_current_info[0][2])
+        new_income_info.append(income_to_edit_current_info[2])
     # Otherwise add the new amount to new_income_info.
     else:
         new_income_info.append(edited_income_amount)
 
     # Gets today's date.
-    new_income_date = datetime.datetime.today().strftime('%Y-%m-%d')
+    new_income_date = global_utils.today()
     new_income_info.append(new_income_date)
 
     # Checks if anything has changed. If not, returns.
-    if list(income_to_edit_current_info[0][0:3]) == new_income_info[0:3]:
+    if list(income_to_edit_current_info[0:3]) == new_income_info[0:3]:
         print("\nNo changes were made to the income.")
         return
 
-    # Updates the income with the new info.
-    edit_income_result = income_db.update_income(new_income_info, income_to_edit_current_info[0][1])
+    # Updates the income with the new info and updates the income goals in one transaction.
+    try:
+        with tracker_db.transaction():
+            edit_income_result = income_db.update_income(new_income_info, income_to_edit_current_info[4])
+            if edit_income_result[0] == 1:
+                raise edit_income_result[1]
+            update_goals_result = goals_utils.update_income_goals()
+            if update_goals_result[0] == 1:
+                raise update_goals_result[1]
+    except Exception as e:
+        edit_income_result = [1, e]
     if edit_income_result[0] == 1:
         print("\nSorry, something went wrong while updating the income.")
         print(f"Error: {edit_income_result[1]}")
@@ -334,9 +414,6 @@ def edit_income():
     else:
         print("\nSorry, an unexpected error has occurred and the income could not be updated.")    
 
-    # Updates income goals.
-    goals_utils.update_income_goals()
-
 # Views all income.
 def view_all():
     """
@@ -348,31 +425,11 @@ def view_all():
     Returns:
         None
     """
-    # Get list of all income.
-    income_info = income_db.get_all_income()
-    # If the list is empty.
-    if len(income_info) == 0:
+    # Lets the user browse the income a page at a time.
+    browse_result = global_utils.browse_pages(income_db.get_income_page, None, 'all income', 'income')
+    # If no income has been added.
+    if browse_result == 2:
         print("\nYou haven't added any income.")
-        return
-    # If get_all_income() has returned an error.
-    if income_info[0] == 1:
-        print("\nSorry, something went wrong accessing the income database.")
-        print(f"Error: {income_info[1]}")
-        return
-
-    # Tells the user what's happening.
-    print("\nViewing all income:\n")
-
-    # Prints all the income.
-    print("Name -- Category -- Amount -- Date Added")
-    for income in income_info:
-        print(f"{global_utils.name_capitalise(income[1])} -- {global_utils.name_capitalise(income[0])} -- {global_utils.amount_format(income[2])} -- {income[3]}")
-    
-    # Prints how many income have been added.
-    if len(income_info) == 1:
-        print(f"\nYou have added 1 income to the database.")
-    else:
-        print(f"\n{len(income_info)} lots of income are present in the database.")
 
 # Views income by category.
 def view_by_category():
@@ -413,33 +470,139 @@ def view_by_category():
         if cat_to_view == 1:
             return
 
-        # Gets the income in that category.
-        income_info = income_db.get_income_from_category(cat_to_view)
-
-        # If the category list is empty.
-        if len(income_info) == 0:
+        # Lets the user browse the income in that category a page at a time.
+        browse_result = global_utils.browse_pages(income_db.get_income_page, cat_to_view,
+                                                  f"income in the {global_utils.name_capitalise(cat_to_view)} category",
+                                                  'income')
+        # If the category is empty.
+        if browse_result == 2:
             print("\nYou haven't added any income to this category.")
             continue
-        # If get_all_income() has returned an error.
-        if income_info[0] == 1:
-            print("\nSorry, something went wrong accessing the income database.")
-            print(f"Error: {income_info[1]}")
+        return
+
+# Searches income.
+def search_income():
+    """
+    Lets the user search the names of income, optionally in one category or between two dates, and
+    prints the best matches first.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Get list of current income categories.
+    current_income_cats = income_db.get_cat_list()
+    # If the list is not empty (there might be no categories added).
+    if len(current_income_cats) != 0:
+        # If the get_cat_list() function has returned an error.
+        if current_income_cats[0] == 1:
+            print("\nSorry, something went wrong accessing the income categories database.")
+            print(f"Error: {current_income_cats[1]}")
             return
-        break
+    else:
+        print("\nYou haven't added any income categories.")
+        return
 
-    # Tells the user what's happening.
-    print(f"\nViewing income in the {global_utils.name_capitalise(cat_to_view)} category:\n")
+    # Gets what to search for.
+    search_text = global_utils.get_search_text('income')
+    if search_text == 1:
+        return
 
-    # Prints all the income in the category.
+    # Gets the category and dates to search between.
+    category = global_utils.get_search_category(current_income_cats)
+    if category == 1:
+        return
+    elif category == 2:
+        category = None
+    dates = {'first': None, 'last': None}
+    for limit in dates:
+        date_added = global_utils.get_search_date(limit)
+        if date_added == 1:
+            return
+        elif date_added != 2:
+            dates[limit] = date_added
+
+    # Searches, getting one more than can be shown to see if there are more.
+    search_result = income_db.search_income(search_text, category, dates['first'], dates['last'], global_utils.MATCH_LIMIT + 1)
+    # If the search has returned an error.
+    if search_result[0] == 1:
+        print("\nSorry, something went wrong accessing the income database.")
+        print(f"Error: {search_result[1]}")
+        return
+    matching_income = search_result[1]
+    # If nothing was found.
+    if len(matching_income) == 0:
+        print("\nNo income matched your search.")
+        return
+
+    # Prints the matches, best first.
+    print(f"\nIncome matching '{search_text}':\n")
     print("Name -- Category -- Amount -- Date Added")
-    for income in income_info:
-        print(f"{global_utils.name_capitalise(income[1])} -- {global_utils.name_capitalise(income[0])} -- {global_utils.amount_format(income[2])} -- {income[3]}")
-    
-    # Prints how many income have been added.
-    if len(income_info) == 1:
-        print(f"\nThere is 1 income in this category.")
+    for row in matching_income[:global_utils.MATCH_LIMIT]:
+        print(f"{global_utils.name_capitalise(row[1])} -- {global_utils.name_capitalise(row[0])} -- {global_utils.amount_format(row[2])} -- {global_utils.date_format(row[3])}")
+    # If more were found than can be shown.
+    if len(matching_income) > global_utils.MATCH_LIMIT:
+        print(f"\nOnly the best {global_utils.MATCH_LIMIT} lots of income found are shown. Search more narrowly to see the rest.")
+    # If a common word matched too many to rank them all.
+    if search_result[2]:
+        print(f"\nYour search matched at least {income_db.SEARCH_CANDIDATES} income, so only the newest of them were ranked.")
+        print("Search with more words, in one category or between two dates for fewer matches.")
+
+# Views income for each month.
+def view_monthly():
+    """
+    Shows how much income came in each month, in every category or in one, from the monthly totals.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Get list of current income categories.
+    current_income_cats = income_db.get_cat_list()
+    # If the list is empty.
+    if len(current_income_cats) == 0:
+        print("\nYou haven't added any income categories.")
+        return
+    # If the get_cat_list() function has returned an error.
+    if current_income_cats[0] == 1:
+        print("\nSorry, something went wrong accessing the income categories database.")
+        print(f"Error: {current_income_cats[1]}")
+        return
+
+    # Gets the category and months to show.
+    category = global_utils.get_search_category(current_income_cats, 'show')
+    if category == 1:
+        return
+    elif category == 2:
+        category = None
+    months = {'first': None, 'last': None}
+    for limit in months:
+        month = global_utils.get_month(limit)
+        if month == 1:
+            return
+        elif month != 2:
+            months[limit] = month
+
+    # Gets the totals of each month.
+    monthly_totals = income_db.get_monthly_totals(category, months['first'], months['last'])
+    if len(monthly_totals) != 0 and monthly_totals[0] == 1:
+        print("\nSorry, something went wrong accessing the income database.")
+        print(f"Error: {monthly_totals[1]}")
+        return
+    if len(monthly_totals) == 0:
+        print("\nThere is no income in those months.")
+        return
+
+    # Prints the totals.
+    if category is None:
+        print("\nMonthly income in every category:")
     else:
-        print(f"\n{len(income_info)} lots of income have been added to this category.")
+        print(f"\nMonthly income in the {global_utils.name_capitalise(category)} category:")
+    global_utils.print_monthly_totals(monthly_totals, months['first'], months['last'])
 
 # Adds a new income category.
 def add_category():
@@ -549,7 +712,8 @@ def delete_category():
     
     # If successful, the first index of the result list is 0.
     if delete_cat_result[0] == 0:
-        print(f"\n{global_utils.name_capitalise(income_cat_to_delete)} was successfully deleted from the income categories database.")
+        print(f"\n{global_utils.name_capitalise(income_cat_to_delete)} and everything in it were successfully deleted from the database.")
+        return
     # If unsuccessful, the first index will be 1.
     elif delete_cat_result[0] == 1:
         print(f"\nSorry, something went wrong and {global_utils.name_capitalise(income_cat_to_delete)} could not be deleted from the database.")
@@ -559,41 +723,59 @@ def delete_category():
     else:
         print(f"\nAn unexpected error occurred while trying to delete {global_utils.name_capitalise(income_cat_to_delete)} from the database.")
         return
-    
-    # Deletes the income associated with the category from the database.
-    delete_income_result = income_db.delete_income_from_cat(income_cat_to_delete)
-    # Handles unexpected behaviour of the function not returning a list/anything.
-    if len(delete_income_result) == 0:
-        print(f"\nAn unexpected error occurred while trying to delete income from the database.")
+
+# Renames an income category.
+def rename_category():
+    """
+    Lets the user rename an income category.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Get list of current income categories.
+    current_income_cats = income_db.get_cat_list()
+    # If the list is empty.
+    if len(current_income_cats) == 0:
+        print("\nYou haven't added any income categories.")
         return
-    
+    # If the get_cat_list() function has returned an error.
+    if current_income_cats[0] == 1:
+        print("\nSorry, something went wrong accessing the income categories database.")
+        print(f"Error: {current_income_cats[1]}")
+        return
+
+    # Tells the user what's happening.
+    print("\nRenaming an income category.")
+
+    # Prints the current categories.
+    print("\nThe current income categories are:")
+    for income_cat in current_income_cats:
+        print(global_utils.name_capitalise(income_cat))
+
+    # Get the name of the income category to rename.
+    income_cat_to_rename = income_utils.get_cat_to_rename(current_income_cats)
+    # Returns to the previous menu if get_cat_to_rename returns 1.
+    if income_cat_to_rename == 1:
+        return
+
+    # Get the new name of the income category.
+    new_income_cat_name = income_utils.get_new_cat_name(current_income_cats)
+    # Returns to the previous menu if get_new_cat_name returns 1.
+    if new_income_cat_name == 1:
+        return
+
+    # Renames the income category in the database.
+    rename_cat_result = income_db.rename_income_cat(income_cat_to_rename, new_income_cat_name)
     # If successful, the first index of the result list is 0.
-    if delete_income_result[0] == 0:
-        print(f"\nAny income associated with {global_utils.name_capitalise(income_cat_to_delete)} was successfully deleted from the income categories database.")
+    if rename_cat_result[0] == 0:
+        print(f"\n{global_utils.name_capitalise(income_cat_to_rename)} was successfully renamed to {global_utils.name_capitalise(new_income_cat_name)}.")
     # If unsuccessful, the first index will be 1.
-    elif delete_cat_result[0] == 1:
-        print(f"\nSorry, something went wrong and the income could not be deleted from the database.")
-        print(f"Error: {delete_cat_result[1]}")
-        return
+    elif rename_cat_result[0] == 1:
+        print(f"\nSorry, something went wrong and {global_utils.name_capitalise(income_cat_to_rename)} could not be renamed.")
+        print(f"Error: {rename_cat_result[1]}")
     # Handles behaviour if the result contains anything other than the expected conditions.
     else:
-        print(f"\nAn unexpected error occurred while trying to delete income from the database.")
-        return    
-    
-    # Deletes the goal associated with the income from the goals database if one exists.
-    income_goals_list = goals_db.get_goals_list(income_cat_to_delete)
-    # If the list is not empty.
-    if len(income_goals_list) != 0:
-        # If the get_goals_list() function has returned an error.
-        if income_goals_list[0] == 1:
-            print("\nSorry, something went wrong getting the income goals from the database.")
-            print(f"Error: {income_goals_list[1]}")
-            return
-        
-    if income_cat_to_delete in income_goals_list:
-        delete_goal_result = goals_db.delete_goal(income_cat_to_delete, 'income')
-        if delete_goal_result[0] == 0:
-            print(f"\nAny goals associated with {global_utils.name_capitalise(income_cat_to_delete)} were successfully deleted from the database.")
-        if delete_goal_result[0] == 1:
-            print("\nSorry, something went wrong deleting the income goal.")
-            print(f"Error: {delete_goal_result[1]}")
\ No newline at end of file
+        print(f"\nAn unexpected error occurred while trying to rename {global_utils.name_capitalise(income_cat_to_rename)}.")
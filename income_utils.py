@@ -49,12 +49,12 @@ def get_new_income_cat(current_income_cats):
             print("\nYou did not enter the name of a category.")
 
 # Gets the name of a new income.
-def get_new_income_name(current_income_names):
+def get_new_income_name():
     """
     Gets the name of a new income.
 
     Args:
-        current_income_names: A list of the existing income names. (list of strings)
+        None
         
     Returns:
         name_input: The name for the new saving goal. (str)
@@ -62,14 +62,11 @@ def get_new_income_name(current_income_names):
     """
     while True:
         print('')
-        name_input = input('''Please describe the income. The name must be unique.
+        name_input = input('''Please describe the income.
 Enter 0 to return to the previous menu.
 : ''').lower()
         if name_input == '0':
             return 1
-        if name_input in current_income_names:
-            print("\nThe income name you entered matches an existing name.")
-            continue
         return name_input
 
 # Gets the amount of a new income.
@@ -81,7 +78,7 @@ def get_new_income_amount():
         None
         
     Returns:
-        amount: The amount of the new income. (float)
+        amount: The amount of the new income in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     while True:
@@ -90,12 +87,8 @@ def get_new_income_amount():
 : ''').lower()
         if amount_input == '0':
             return 1
-        if len(amount_input[amount_input.rfind('.')+1:]) != 2:
-            print("\nPlease enter a valid amount.")
-            continue
-        try:
-            amount = float(amount_input)
-        except ValueError:
+        amount = global_utils.amount_to_cents(amount_input)
+        if amount is None:
             print("\nPlease enter a valid amount.")
             continue
         return amount
@@ -107,7 +100,7 @@ def get_edit_income_cat(current_income_cats, current_income_info):
 
     Args:
         current_income_cats: A list of the existing income categories. (list of strings)
-        current_income_info: A list of the information of the current income. (list of strings, floats)
+        current_income_info: A list of the information of the current income. (list of strings, ints)
         
     Returns:
         new_cat_input: The new name of the income category for a goal. (str)
@@ -144,13 +137,12 @@ Would you like to change it? Please enter yes or no.
             print("\nYou did not enter the name of a category.")
 
 # Gets a new name for an income edit.
-def get_edit_income_name(current_income_names, current_income_info):
+def get_edit_income_name(current_income_info):
     """
     Gets the new name of an income when editing.
 
     Args:
-        current_income_names: A list of the existing income names. (list of strings)
-        current_income_info: A list of the information of the current income. (list of strings, floats)
+        current_income_info: A list of the information of the current income. (list of strings, ints)
         
     Returns:
         new_name_input: The new name of the saving goal. (str)
@@ -169,22 +161,14 @@ Would you like to change it? Please enter yes or no.
         else:
             print("\nPlease enter yes or no.")
 
-    # Prints a list of current income names.
-    print('\nThe current income names are:')
-    for name in current_income_names:
-        print(global_utils.name_capitalise(name))
-
     # Gets a new name if needed.
     while True:
         print('')
-        new_name_input = input(f'''Please enter a new name for the income. It must be unique.
+        new_name_input = input(f'''Please enter a new name for the income.
 Enter 0 to return to the previous menu.
 : ''').lower()
         if new_name_input == '0':
             return 1
-        if new_name_input in current_income_names:
-            print("\nThe income name you entered matches an existing name.")
-            continue
         return new_name_input
 
 # Gets a new amount for an income edit.
@@ -193,10 +177,10 @@ def get_edit_income_amount(current_income_info):
     Gets the new amount for an income when editing.
 
     Args:
-        current_income_info: A list of the information of the current income. (list of strings, floats)
+        current_income_info: A list of the information of the current income. (list of strings, ints)
         
     Returns:
-        new_amount: The new amount for the saving goal. (float)
+        new_amount: The new amount for the saving goal in cents. (int)
         1: If the user wishes to return to the previous menu. (int)
     """
     # Checks if the user wants to edit the income amount.
@@ -219,84 +203,89 @@ Would you like to change it? Please enter yes or no.
 : ''').lower()
         if new_amount_input == '0':
             return 1
-        if len(new_amount_input[new_amount_input.rfind('.')+1:]) != 2:
-            print("Please enter a valid amount.")
-            continue
-        try:
-            new_amount = float(new_amount_input)
-        except ValueError:
+        new_amount = global_utils.amount_to_cents(new_amount_input)
+        if new_amount is None:
             print("Please enter a valid amount.")
             continue
         return new_amount
         
-# Gets the name of the income to edit.        
-def get_income_to_edit(current_income_names):   
+# Gets one income from the income found by a search.
+def get_income_from_matches(matching_income):
     """
-    Gets the name of the income to edit.
+    Gets the income the user means when their search found more than one.
 
     Args:
-        current_income_names: A list of the names of the current income. (list of strings)
+        matching_income: A list of the data of the income found. (list of tuples of strs and ints)
         
     Returns:
-        name_input: The name of the income to edit. (str)
+        income_info: The data of the chosen income. (tuple of strs and ints)
         1: If the user wishes to return to the previous menu. (int)
     """
+    if len(matching_income) == 1:
+        return matching_income[0]
+
+    # Prints the matching income so the user can pick one by id.
+    print(f'\n{len(matching_income)} lots of income were found.')
+    print('ID -- Name -- Category -- Amount -- Date Added')
+    for income_info in matching_income:
+        print(f'{income_info[4]} -- {global_utils.name_capitalise(income_info[1])} -- {global_utils.name_capitalise(income_info[0])} -- {global_utils.amount_format(income_info[2])} -- {global_utils.date_format(income_info[3])}')
+
     while True:
         print('')
-        name_input = input('''Please enter the name of the income you want to edit. Enter 0 to return to the previous menu.
+        id_input = input('''Please enter the ID of the income. Enter 0 to return to the previous menu.
 : ''').lower()
-        if name_input == '0':
+        if id_input == '0':
             return 1
-        if name_input in current_income_names:
-            return name_input
-        else:
-            print("\nYou did not enter the name of a income.")     
+        for income_info in matching_income:
+            if str(income_info[4]) == id_input:
+                return income_info
+        print("\nYou did not enter one of the IDs shown.")
 
-# Gets the name of the income to delete.
-def get_income_to_delete(current_income_names):
+# Gets the name of the category to view.
+def get_cat_to_view(current_income_cats):
     """
-    Gets the name of the income to delete.
+    Gets the name of the category to view.
 
     Args:
-        current_income_names: A list of the names of the current income. (list of strings)
+        current_income_cats: A list of the names of the current income categories. (list of strings)
         
     Returns:
-        name_input: The name of the income to delete. (str)
+        cat_input: The name of the income category to view. (str)
         1: If the user wishes to return to the previous menu. (int)
     """
     while True:
         print('')
-        name_input = input('''Please enter the name of the income you want to delete. Enter 0 to return to the previous menu.
+        cat_input = input('''Please enter the name of the category you want to view. Enter 0 to return to the previous menu.
 : ''').lower()
-        if name_input == '0':
+        if cat_input == '0':
             return 1
-        if name_input in current_income_names:
-            return name_input
+        if cat_input in current_income_cats:
+            return cat_input
         else:
-            print("\nYou did not enter the name of a income.")   
+            print("\nYou did not enter the name of a category.") 
 
-# Gets the name of the category to view.
-def get_cat_to_view(current_income_cats):
+# Gets the name of the category to rename.
+def get_cat_to_rename(current_income_cats):
     """
-    Gets the name of the category to view.
+    Gets the name of the income category the user wants to rename.
 
     Args:
         current_income_cats: A list of the names of the current income categories. (list of strings)
         
     Returns:
-        cat_input: The name of the income category to view. (str)
+        cat_input: The name of the income category to rename. (str)
         1: If the user wishes to return to the previous menu. (int)
     """
     while True:
         print('')
-        cat_input = input('''Please enter the name of the category you want to view. Enter 0 to return to the previous menu.
+        cat_input = input('''Please enter the name of the category you want to rename. Enter 0 to return to the previous menu.
 : ''').lower()
         if cat_input == '0':
             return 1
         if cat_input in current_income_cats:
             return cat_input
         else:
-            print("\nYou did not enter the name of a category.") 
+            print("\nYou did not enter the name of a category.")
 
 # Gets the name of the category to delete.
 def get_cat_to_delete(current_income_cats):
@@ -0,0 +1,146 @@
+# Contains the functions that register, remove and switch between the ledgers, the separate tracker
+# dbs kept for different households or businesses.
+
+## Imports ##
+
+import json
+import os
+import re
+import tracker_db
+import schema_db
+
+## Variables ##
+
+# The characters a ledger's name can be made of.
+NAME_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+## Functions ##
+
+# Gets the names of the ledgers.
+def get_ledger_names():
+    """
+    Gets the names of every registered ledger, the default one first.
+
+    Args:
+        None
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        ledger_names: The names of the ledgers. (list of str)
+    """
+    try:
+        return list(tracker_db.get_ledgers())
+    except Exception as e:
+        return [1, e]
+
+# Saves the registry of ledgers.
+def save_ledgers(ledgers):
+    """
+    Writes the registry of ledgers to a temporary file and then moves it over the old one, so the
+    registry is never left half written. The default ledger isn't saved as it is always there.
+
+    Args:
+        ledgers: The path of each ledger's db file by its name. (dict of str: str)
+
+    Returns:
+        None
+    """
+    os.makedirs(tracker_db.DATA_DIR, exist_ok=True)
+    registry = {}
+    for name, path in ledgers.items():
+        if name == tracker_db.DEFAULT_LEDGER:
+            continue
+        # Paths inside the data folder are kept relative, so the folder can be moved.
+        if os.path.dirname(os.path.abspath(path)) == os.path.abspath(tracker_db.DATA_DIR):
+            path = os.path.basename(path)
+        registry[name] = path
+    temp_path = tracker_db.LEDGERS_PATH + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as ledgers_file:
+        json.dump(registry, ledgers_file, indent=4)
+    os.replace(temp_path, tracker_db.LEDGERS_PATH)
+
+# Adds a ledger.
+def add_ledger(name, path=None):
+    """
+    Registers a new ledger and creates the tables in its db.
+
+    Args:
+        name: The name of the ledger. (str)
+        path: The path of the ledger's db file, or None to keep it in the data folder. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        [0, 0]: 0 shows that nothing has gone wrong.
+    """
+    try:
+        if NAME_PATTERN.match(name) is None:
+            raise ValueError("A ledger's name can only use lowercase letters, numbers, - and _.")
+        ledgers = tracker_db.get_ledgers()
+        if name in ledgers:
+            raise ValueError(f"There is already a ledger called '{name}'.")
+        if path is None:
+            path = os.path.join(tracker_db.DATA_DIR, f'tracker-{name}')
+        path = os.path.abspath(path)
+        if path in (os.path.abspath(ledger_path) for ledger_path in ledgers.values()):
+            raise ValueError(f"Another ledger already uses {path}.")
+        # The tables are created on a connection of their own, so no thread's ledger is switched, and
+        # the ledger is only registered once they're there.
+        with tracker_db.connect_to(path):
+            schema_result = schema_db.create_schema()
+        if schema_result[0] == 1:
+            return schema_result
+        ledgers[name] = path
+        save_ledgers(ledgers)
+    except Exception as e:
+        return [1, e]
+    return [0, 0]
+
+# Removes a ledger.
+def remove_ledger(name):
+    """
+    Removes a ledger from the registry, closing the connections to it first. Its db file is left
+    where it is, so it can be added again.
+
+    Args:
+        name: The name of the ledger. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        [0, 0]: 0 shows that nothing has gone wrong.
+    """
+    try:
+        if name == tracker_db.DEFAULT_LEDGER:
+            raise ValueError(f"The '{name}' ledger can't be removed.")
+        if name == tracker_db.get_ledger():
+            raise ValueError("The ledger in use can't be removed. Switch to another ledger first.")
+        ledgers = tracker_db.get_ledgers()
+        if name not in ledgers:
+            raise ValueError(f"There is no ledger called '{name}'.")
+        tracker_db.close_ledger(name)
+        del ledgers[name]
+        save_ledgers(ledgers)
+    except Exception as e:
+        return [1, e]
+    return [0, 0]
+
+# Switches to another ledger.
+def switch_ledger(name):
+    """
+    Switches every db module to another ledger and creates or upgrades its tables if needed.
+
+    Args:
+        name: The name of the ledger. (str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the error. (str)
+        [0, steps]: 0 shows that nothing has gone wrong and steps is a list of the migrations that were
+                    applied as (version, description, seconds). (list of tuples)
+    """
+    try:
+        previous = tracker_db.set_ledger(name)
+    except Exception as e:
+        return [1, e]
+    schema_result = schema_db.create_schema()
+    if schema_result[0] == 1:
+        tracker_db.set_ledger(previous)
+    return schema_result
@@ -0,0 +1,250 @@
+import ledgers_db
+import ledgers_utils
+import report_db
+import tracker_db
+import global_utils
+
+# Contains all the menu functions for the ledgers section.
+
+def main_menu():
+    """
+    Lets the user select a ledger option.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    print("\nLedger Options")
+
+    while True:
+        user_input = input(f'''\nThe current ledger is {tracker_db.get_ledger()}.
+Please select from one of the following options:
+1 - View all ledgers
+2 - Add a ledger
+3 - Switch to another ledger
+4 - Remove a ledger
+5 - View the consolidated totals of several ledgers
+0 - Return to previous menu
+: ''')
+
+        # Views all ledgers.
+        if user_input == '1':
+            view_all_ledgers()
+
+        # Adds a ledger.
+        elif user_input == '2':
+            add_ledger()
+
+        # Switches to another ledger.
+        elif user_input == '3':
+            switch_ledger()
+
+        # Removes a ledger.
+        elif user_input == '4':
+            remove_ledger()
+
+        # Views the consolidated totals.
+        elif user_input == '5':
+            view_consolidated_totals()
+
+        # Return to previous menu.
+        elif user_input == '0':
+            return
+
+# Gets the names of the ledgers, telling the user if something went wrong.
+def get_current_ledgers():
+    """
+    Gets the names of the registered ledgers.
+
+    Args:
+        None
+
+    Returns:
+        current_ledgers: The names of the ledgers. (list of str)
+        None: If the registry couldn't be read.
+    """
+    current_ledgers = ledgers_db.get_ledger_names()
+    if len(current_ledgers) != 0 and current_ledgers[0] == 1:
+        print("\nSorry, something went wrong reading the ledgers.")
+        print(f"Error: {current_ledgers[1]}")
+        return None
+    return current_ledgers
+
+# Views all ledgers.
+def view_all_ledgers():
+    """
+    Prints the name and db file of every ledger.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    try:
+        ledgers = tracker_db.get_ledgers()
+    except Exception as e:
+        print("\nSorry, something went wrong reading the ledgers.")
+        print(f"Error: {e}")
+        return
+    print("\nLedger -- Database File")
+    for name, path in ledgers.items():
+        if name == tracker_db.get_ledger():
+            print(f"{name} (current) -- {path}")
+        else:
+            print(f"{name} -- {path}")
+
+# Adds a ledger.
+def add_ledger():
+    """
+    Lets the user add a new ledger.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    # Tells the user what's happening.
+    print("\nAdding a ledger.")
+
+    current_ledgers = get_current_ledgers()
+    if current_ledgers is None:
+        return
+
+    # Gets the name and file of the new ledger.
+    name = ledgers_utils.get_new_ledger_name(current_ledgers)
+    if name == 1:
+        return
+    path = ledgers_utils.get_ledger_path()
+    if path == 1:
+        return
+    elif path == 2:
+        path = None
+
+    # Adds the ledger.
+    add_result = ledgers_db.add_ledger(name, path)
+    if add_result[0] == 1:
+        print(f"\nSorry, something went wrong adding the {name} ledger.")
+        print(f"Error: {add_result[1]}")
+        return
+    print(f"\nThe {name} ledger has been added. Switch to it to add expenses and income to it.")
+
+# Switches to another ledger.
+def switch_ledger():
+    """
+    Lets the user switch every section of the tracker to another ledger.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    current_ledgers = get_current_ledgers()
+    if current_ledgers is None:
+        return
+    print("\nThe ledgers are:")
+    for ledger in current_ledgers:
+        print(ledger)
+
+    name = ledgers_utils.get_ledger_name(current_ledgers, 'switch to')
+    if name == 1:
+        return
+
+    switch_result = ledgers_db.switch_ledger(name)
+    if switch_result[0] == 1:
+        print(f"\nSorry, something went wrong opening the {name} ledger.")
+        print(f"Error: {switch_result[1]}")
+        return
+    for version, description, seconds in switch_result[1]:
+        print(f"\nUpgraded the {name} ledger to version {version}: {description} ({seconds:.2f}s)")
+    print(f"\nSwitched to the {name} ledger.")
+
+# Removes a ledger.
+def remove_ledger():
+    """
+    Lets the user remove a ledger from the tracker. Its database file is kept.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    current_ledgers = get_current_ledgers()
+    if current_ledgers is None:
+        return
+    removable = [ledger for ledger in current_ledgers
+                 if ledger != tracker_db.DEFAULT_LEDGER and ledger != tracker_db.get_ledger()]
+    if len(removable) == 0:
+        print("\nThere are no ledgers that can be removed. The main ledger and the one in use are kept.")
+        return
+    print("\nThe ledgers that can be removed are:")
+    for ledger in removable:
+        print(ledger)
+
+    name = ledgers_utils.get_ledger_name(removable, 'remove')
+    if name == 1:
+        return
+
+    remove_result = ledgers_db.remove_ledger(name)
+    if remove_result[0] == 1:
+        print(f"\nSorry, something went wrong removing the {name} ledger.")
+        print(f"Error: {remove_result[1]}")
+        return
+    print(f"\nThe {name} ledger has been removed. Its database file has been kept.")
+
+# Views the consolidated totals of several ledgers.
+def view_consolidated_totals():
+    """
+    Prints the totals of each expense and income category added up across several ledgers, and the
+    totals of each ledger.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    current_ledgers = get_current_ledgers()
+    if current_ledgers is None:
+        return
+    print("\nThe ledgers are:")
+    for ledger in current_ledgers:
+        print(ledger)
+
+    ledger_names = ledgers_utils.get_report_ledgers(current_ledgers)
+    if ledger_names == 1:
+        return
+    elif ledger_names == 2:
+        ledger_names = current_ledgers
+
+    totals_result = report_db.get_consolidated_totals(ledger_names)
+    if totals_result[0] == 1:
+        print("\nSorry, something went wrong adding up the ledgers.")
+        print(f"Error: {totals_result[1]}")
+        return
+    totals = totals_result[1]
+
+    # Prints the categories across the ledgers.
+    for title, key in (('Expenses', 'expense_cats'), ('Income', 'income_cats')):
+        print(f"\n{title} across {', '.join(ledger_names)}:")
+        if len(totals[key]) == 0:
+            print("No categories added.")
+            continue
+        print("Category -- Count -- Total")
+        for name, count, total in totals[key]:
+            print(f"{global_utils.name_capitalise(name)} -- {count} -- {global_utils.amount_format(total)}")
+
+    # Prints each ledger's totals.
+    print("\nLedger -- Income -- Expenses -- Balance")
+    for ledger, expense_count, expense_total, income_count, income_total in totals['ledgers']:
+        print(f"{ledger} -- {global_utils.amount_format(income_total)} -- {global_utils.amount_format(expense_total)} -- {global_utils.amount_format(income_total - expense_total)}")
+    expense_total = sum(ledger[2] for ledger in totals['ledgers'])
+    income_total = sum(ledger[4] for ledger in totals['ledgers'])
+    print(f"\nTotal Income: {global_utils.amount_format(income_total)}")
+    print(f"Total Expenses: {global_utils.amount_format(expense_total)}")
+    print(f"Balance: {global_utils.amount_format(income_total - expense_total)}")
@@ -0,0 +1,115 @@
+# Utility functions for the ledgers part of the tracker.
+import os
+import ledgers_db
+
+# Gets the name of a new ledger.
+def get_new_ledger_name(current_ledgers):
+    """
+    Gets the name of a new ledger.
+
+    Args:
+        current_ledgers: A list of the names of the existing ledgers. (list of str)
+
+    Returns:
+        name_input: The name of the new ledger. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        name_input = input('''Please enter a name for the ledger, such as home or shop. The name must be unique.
+Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if name_input == '0':
+            return 1
+        if name_input in current_ledgers:
+            print("\nThe name you entered matches an existing ledger.")
+            continue
+        if ledgers_db.NAME_PATTERN.match(name_input) is None:
+            print("\nPlease only use lowercase letters, numbers, - and _.")
+            continue
+        return name_input
+
+# Gets the path of a new ledger's db file.
+def get_ledger_path():
+    """
+    Gets where the db file of a new ledger should be kept.
+
+    Args:
+        None
+
+    Returns:
+        path_input: The path of the db file. (str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If the file should be kept in the data folder. (int)
+    """
+    while True:
+        print('')
+        path_input = input('''Please enter the path of the ledger's database file. Press enter to keep it in the data folder.
+Enter 0 to return to the previous menu.
+: ''').strip()
+        if path_input == '0':
+            return 1
+        if path_input == '':
+            return 2
+        directory = os.path.dirname(os.path.abspath(path_input))
+        if not os.path.isdir(directory):
+            print("\nThere is no folder at that path.")
+            continue
+        return path_input
+
+# Gets an existing ledger.
+def get_ledger_name(current_ledgers, action):
+    """
+    Gets the name of an existing ledger.
+
+    Args:
+        current_ledgers: A list of the names of the ledgers. (list of str)
+        action: What will be done with the ledger, such as 'switch to'. (str)
+
+    Returns:
+        name_input: The name of the ledger. (str)
+        1: If the user wishes to return to the previous menu. (int)
+    """
+    while True:
+        print('')
+        name_input = input(f'''Please enter the name of the ledger to {action}. Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if name_input == '0':
+            return 1
+        if name_input in current_ledgers:
+            return name_input
+        print("\nYou did not enter the name of a ledger.")
+
+# Gets the ledgers to report on.
+def get_report_ledgers(current_ledgers):
+    """
+    Gets which ledgers to add up in a consolidated report.
+
+    Args:
+        current_ledgers: A list of the names of the ledgers. (list of str)
+
+    Returns:
+        ledger_names: The names of the ledgers to report on. (list of str)
+        1: If the user wishes to return to the previous menu. (int)
+        2: If every ledger should be reported on. (int)
+    """
+    while True:
+        print('')
+        names_input = input('''Please enter the names of the ledgers to report on, separated by commas. Press enter to report on every ledger.
+Enter 0 to return to the previous menu.
+: ''').strip().lower()
+        if names_input == '0':
+            return 1
+        if names_input == '':
+            return 2
+        ledger_names = []
+        for name in names_input.split(','):
+            name = name.strip()
+            if name != '' and name not in ledger_names:
+                ledger_names.append(name)
+        missing = [name for name in ledger_names if name not in current_ledgers]
+        if len(missing) != 0:
+            print(f"\nThere is no ledger called {', '.join(missing)}.")
+            continue
+        if len(ledger_names) != 0:
+            return ledger_names
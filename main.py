@@ -1,11 +1,20 @@
 ## Overview ##
 # The program has been split into multiple files to try and keep the main program clean.
-# The main.py program calls functions to create the database tables and then calls functions from other modules, depending on what the user selects.
+# The main.py program calls schema_db.py to create the database tables and then calls functions from other modules, depending on what the user selects.
 # Each section contains a menu.py, utils.py and db.py file (the budget section imports the expenses_db.py file).
 # - db.py files interact with the database for that section.
 # - menu.py files contain the menu functions for that section of the app.
 # - utils.py files contain utility functions that generally get information from the user. 
 # The global_utils.py file contains useful utility functions for capitalisation and formatting money.
+# The data section imports bank statements through import_db.py, which writes through expenses_db.py and income_db.py.
+# The tracker_db.py file holds the shared database connection that every db.py file uses.
+# The report_db.py file reads reports across every table from one read-only snapshot of the database.
+# The async_db.py file runs the expenses, income and goals db functions as coroutines on threads of their own, for asyncio services.
+# The ledgers section keeps separate databases for different households or businesses. ledgers_db.py registers them and
+# tracker_db.py routes every db.py file to the one in use. Reports across ledgers attach them all to one connection.
+# The databases are kept in the data folder next to main.py, or in the folder set by the TRACKER_DATA_DIR environment variable.
+# Set the TRACKER_LEDGER environment variable to choose which ledger the tracker starts with.
+# Set the TRACKER_PROFILE environment variable to 'safe', 'fast' or 'bulk-load' to choose how the database is stored.
 
 
 ## Imports ##
@@ -13,55 +22,32 @@ import expenses_menu
 import income_menu
 import budget_menu
 import goals_menu
-import expenses_db
-import income_db
-import goals_db
+import data_menu
+import ledgers_menu
+import schema_db
+import tracker_db
             
 ## Main Code ##
 
 # Introduction.
 print('\nSaving and Expense Tracker')
 
-# db creation error count.
-db_errors = 0
-
-# Expenses table.
-db_expenses_result = expenses_db.create_expenses()
-if db_expenses_result[0] == 1:
-    print("\nSorry, we couldn't create the expenses database table.")
-    print(f"Error: {db_expenses_result[1]}")
-    db_errors += 1
-# Expense categories table.
-db_expense_cat_result = expenses_db.create_expense_cats()
-if db_expense_cat_result[0] == 1:
-    print("\nSorry, we couldn't create the expense category database table.")
-    print(f"Error: {db_expense_cat_result[1]}")
-    db_errors += 1
-
-# Income table.
-db_income_result = income_db.create_income()
-if db_income_result[0] == 1:
-    print("\nSorry, we couldn't create the income database table.")
-    print(f"Error: {db_income_result[1]}")
-    db_errors += 1
-# Income categories table.
-db_income_cat_result = income_db.create_income_cats()
-if db_income_cat_result[0] == 1:
-    print("\nSorry, we couldn't create the income category database table.")
-    print(f"Error: {db_income_cat_result[1]}")
-    db_errors += 1
-
-# Goals db.
-db_goals_result = goals_db.create()
-if db_goals_result[0] == 1:
-    print("\nSorry, we couldn't create the goals database.")
-    print(f"Error: {db_goals_result[1]}")
-    db_errors += 1
-
-# Quits if errors found.
-if db_errors != 0:
+# Creates the database tables if this is the first time the program has been run.
+db_schema_result = schema_db.create_schema()
+if db_schema_result[0] == 1:
+    print("\nSorry, we couldn't create the database tables.")
+    print(f"Error: {db_schema_result[1]}")
     print("\nErrors have been found when creating the databases. The program will quit.")
     quit()
+# Tells the user about any upgrades made to the database.
+for version, description, seconds in db_schema_result[1]:
+    print(f"\nUpgraded the database to version {version}: {description} ({seconds:.2f}s)")
+# Tells the user which storage profile the database is using.
+profile = tracker_db.get_profile()
+profile_settings = ', '.join(f'{pragma} {value}' for pragma, value in tracker_db.PROFILES[profile].items())
+print(f"\nStorage profile: {profile} ({profile_settings})")
+# Tells the user which ledger is open.
+print(f"Ledger: {tracker_db.get_ledger()} ({tracker_db.get_db_path()})")
 
 # Main menu.
 while True:
@@ -70,6 +56,8 @@ while True:
 2 - View income options
 3 - View budgeting options
 4 - View financial goal options
+5 - View data options
+6 - View ledger options
 0 - Exit the program
 : ''')
 
@@ -89,6 +77,14 @@ while True:
     elif user_input == '4':
         goals_menu.main_menu()    
 
+    # View data options.
+    elif user_input == '5':
+        data_menu.main_menu()
+
+    # View ledger options.
+    elif user_input == '6':
+        ledgers_menu.main_menu()
+
     # Exit program.
     elif user_input == '0':
         print('\nLogging off...')
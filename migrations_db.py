@@ -0,0 +1,726 @@
+# Contains the migrations that upgrade an existing tracker db from one schema version to the next.
+
+## Imports ##
+
+import sqlite3
+import sys
+import time
+import tracker_db
+import schema_db
+
+## Variables ##
+
+# The number of rows copied in each transaction when a migration rebuilds a table, so large
+# ledgers don't hold the write lock for the whole rebuild.
+BATCH_SIZE = 5000
+
+# The tables as the tracker created them before the schema was versioned (version 1).
+BASE_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS expenses(
+       category TEXT,
+       name TEXT UNIQUE PRIMARY KEY,
+       amount FLOAT,
+       date_added TEXT)''',
+    'CREATE TABLE IF NOT EXISTS expense_cats(name TEXT, budget FLOAT)',
+    '''CREATE TABLE IF NOT EXISTS income(
+       category TEXT,
+       name TEXT UNIQUE PRIMARY KEY,
+       amount FLOAT,
+       date_added TEXT)''',
+    'CREATE TABLE IF NOT EXISTS income_cats(name TEXT)',
+    '''CREATE TABLE IF NOT EXISTS goals(
+       name TEXT UNIQUE PRIMARY KEY,
+       category TEXT,
+       amount FLOAT,
+       progress FLOAT)''',
+    'CREATE TABLE IF NOT EXISTS schema_version(version INTEGER)',
+]
+
+## Functions ##
+
+# Gets the migrations that haven't been applied yet.
+def get_pending(version):
+    """
+    Gets the migrations that still need applying to a db at a given version.
+
+    Args:
+        version: The schema version of the db. (int)
+
+    Returns:
+        pending: The migrations newer than the version, oldest first. (list of tuples)
+    """
+    pending = []
+    for migration in MIGRATIONS:
+        if migration[0] > version:
+            pending.append(migration)
+    return pending
+
+# Applies any migrations the db is missing.
+def migrate(dry_run=False):
+    """
+    Applies the pending migrations to the tracker db in order, timing each one.
+
+    Args:
+        dry_run: If True, the pending migrations are only listed and the db isn't changed. (bool)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, steps]: 0 shows that nothing has gone wrong and steps is a list of the migrations that were
+                    applied (or would be, for a dry run) as (version, description, seconds). (list of tuples)
+    """
+    steps = []
+    try:
+        db = tracker_db.get_connection()
+        pending = get_pending(schema_db.get_version(db))
+        # Dropping a table that is being rebuilt would otherwise delete, or cascade to, the rows that
+        # point at it. The foreign keys are checked instead once each migration is applied.
+        db.execute('PRAGMA foreign_keys = OFF')
+        for version, description, prepare, apply in pending:
+            if dry_run:
+                steps.append((version, description, 0.0))
+                continue
+            start = time.perf_counter()
+            if prepare is not None:
+                prepare()
+            with tracker_db.transaction() as db:
+                # Another process may have applied this migration while it was being prepared.
+                if schema_db.get_version(db) >= version:
+                    continue
+                apply(db)
+                if db.execute('PRAGMA foreign_key_check').fetchone() is not None:
+                    raise sqlite3.IntegrityError(f'Migration {version} left rows pointing at missing rows')
+                schema_db.set_version(db, version)
+            steps.append((version, description, time.perf_counter() - start))
+    except Exception as e:
+        return [1, e]
+    finally:
+        tracker_db.get_connection().execute('PRAGMA foreign_keys = ON')
+    return [0, steps]
+
+# Starts a rebuild of a table by creating its replacement.
+def start_rebuild(table, create_sql):
+    """
+    Creates an empty replacement for a table that is being rebuilt, dropping any left over from an
+    earlier rebuild that didn't finish. Triggers record the rowid of every row added, changed or
+    deleted in the old table from then on in {table}_changes, so finish_rebuild can copy those rows
+    again however the writes landed around the batches.
+
+    Args:
+        table: The name of the table being rebuilt. (str)
+        create_sql: The CREATE TABLE statement for the replacement, named {table}_new. (str)
+
+    Returns:
+        None
+    """
+    with tracker_db.transaction() as db:
+        db.execute(f'DROP TABLE IF EXISTS {table}_new')
+        db.execute(create_sql)
+        db.execute(f'DROP TABLE IF EXISTS {table}_changes')
+        db.execute(f'CREATE TABLE {table}_changes(changed_rowid INTEGER PRIMARY KEY)')
+        db.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_rebuild_insert AFTER INSERT ON {table} BEGIN
+                       INSERT OR IGNORE INTO {table}_changes VALUES(new.rowid);
+                       END''')
+        db.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_rebuild_update AFTER UPDATE ON {table} BEGIN
+                       INSERT OR IGNORE INTO {table}_changes VALUES(old.rowid);
+                       INSERT OR IGNORE INTO {table}_changes VALUES(new.rowid);
+                       END''')
+        db.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_rebuild_delete AFTER DELETE ON {table} BEGIN
+                       INSERT OR IGNORE INTO {table}_changes VALUES(old.rowid);
+                       END''')
+
+# Copies the rows of a table being rebuilt into its replacement.
+def copy_in_batches(table, columns, select):
+    """
+    Copies rows from a table into its replacement, BATCH_SIZE rows per transaction. Rowids are kept
+    so the copy can pick up from the last rowid copied.
+
+    Args:
+        table: The name of the table being rebuilt. (str)
+        columns: The columns of {table}_new that are filled, not including rowid. (str)
+        select: The expressions selected from the old table for those columns. (str)
+
+    Returns:
+        copied: The number of rows copied. (int)
+    """
+    copied = 0
+    while True:
+        with tracker_db.transaction() as db:
+            cursor = db.execute(f'''INSERT INTO {table}_new(rowid, {columns})
+                                    SELECT rowid, {select} FROM {table}
+                                    WHERE rowid > (SELECT IFNULL(MAX(rowid), 0) FROM {table}_new)
+                                    ORDER BY rowid LIMIT ?''',
+                                (BATCH_SIZE,))
+        copied += cursor.rowcount
+        if cursor.rowcount < BATCH_SIZE:
+            return copied
+
+# Finishes a rebuild of a table by swapping in its replacement.
+def finish_rebuild(db, table, columns, select):
+    """
+    Copies again every row recorded in {table}_changes since the rebuild started, so rows that were
+    edited, deleted or added (even with a reused rowid) while the batches were copied match the old
+    table, and copies any rows past the last batch. Then replaces the old table with the new one.
+    This must run inside the migration's transaction, which keeps out any more writes.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        table: The name of the table being rebuilt. (str)
+        columns: The columns of {table}_new that are filled, not including rowid. (str)
+        select: The expressions selected from the old table for those columns. (str)
+
+    Returns:
+        None
+    """
+    db.execute(f'DELETE FROM {table}_new WHERE rowid IN (SELECT changed_rowid FROM {table}_changes)')
+    db.execute(f'''INSERT INTO {table}_new(rowid, {columns})
+                   SELECT rowid, {select} FROM {table}
+                   WHERE rowid IN (SELECT changed_rowid FROM {table}_changes)
+                   OR rowid > (SELECT IFNULL(MAX(rowid), 0) FROM {table}_new)''')
+    # Dropping the old table drops the triggers that filled the change log.
+    db.execute(f'DROP TABLE {table}')
+    db.execute(f'DROP TABLE {table}_changes')
+    db.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+
+# Starts every rebuild in a list.
+def prepare_rebuilds(rebuilds):
+    """
+    Creates the replacement for each table in a list of rebuilds and copies its rows in batches.
+
+    Args:
+        rebuilds: The tables to rebuild as (table, create_sql, columns, select). (list of tuples of str)
+
+    Returns:
+        None
+    """
+    for table, create_sql, columns, select in rebuilds:
+        start_rebuild(table, create_sql)
+        copy_in_batches(table, columns, select)
+
+# Finishes every rebuild in a list.
+def finish_rebuilds(db, rebuilds):
+    """
+    Swaps in the replacement for each table in a list of rebuilds. This must run inside the
+    migration's transaction.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        rebuilds: The tables to rebuild as (table, create_sql, columns, select). (list of tuples of str)
+
+    Returns:
+        None
+    """
+    for table, create_sql, columns, select in rebuilds:
+        finish_rebuild(db, table, columns, select)
+
+# Rebuilds a small table all at once.
+def rebuild_table(db, table, create_sql, columns, select):
+    """
+    Replaces a table with a rebuilt copy in one go. This is for small tables such as the categories
+    and must run inside the migration's transaction.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        table: The name of the table being rebuilt. (str)
+        create_sql: The CREATE TABLE statement for the replacement, named {table}_new. (str)
+        columns: The columns of {table}_new that are filled. (str)
+        select: The SELECT statement that gives the rows of {table}_new. (str)
+
+    Returns:
+        None
+    """
+    db.execute(f'DROP TABLE IF EXISTS {table}_new')
+    db.execute(create_sql)
+    db.execute(f'INSERT INTO {table}_new({columns}) {select}')
+    db.execute(f'DROP TABLE {table}')
+    db.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+
+## Migrations ##
+
+# Version 2: indexes the columns that the db modules filter on.
+def add_indexes(db):
+    """
+    Creates the indexes on the category, date and category name columns.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    db.execute('CREATE INDEX IF NOT EXISTS expenses_category_idx ON expenses(category)')
+    db.execute('CREATE INDEX IF NOT EXISTS expenses_date_added_idx ON expenses(date_added)')
+    db.execute('CREATE INDEX IF NOT EXISTS income_category_idx ON income(category)')
+    db.execute('CREATE INDEX IF NOT EXISTS income_date_added_idx ON income(date_added)')
+    db.execute('CREATE INDEX IF NOT EXISTS goals_category_idx ON goals(category)')
+    db.execute('CREATE INDEX IF NOT EXISTS expense_cats_name_idx ON expense_cats(name)')
+    db.execute('CREATE INDEX IF NOT EXISTS income_cats_name_idx ON income_cats(name)')
+
+# Version 3: stores money as whole cents instead of floats. Each table is rebuilt as
+# (table, new table, columns, select).
+CENTS_TABLES = [
+    ('expenses',
+     '''CREATE TABLE expenses_new(
+        category TEXT,
+        name TEXT UNIQUE PRIMARY KEY,
+        amount INTEGER,
+        date_added TEXT)''',
+     'category, name, amount, date_added',
+     'category, name, CAST(ROUND(amount * 100) AS INTEGER), date_added'),
+    ('income',
+     '''CREATE TABLE income_new(
+        category TEXT,
+        name TEXT UNIQUE PRIMARY KEY,
+        amount INTEGER,
+        date_added TEXT)''',
+     'category, name, amount, date_added',
+     'category, name, CAST(ROUND(amount * 100) AS INTEGER), date_added'),
+    ('expense_cats',
+     'CREATE TABLE expense_cats_new(name TEXT, budget INTEGER)',
+     'name, budget',
+     'name, CAST(ROUND(budget * 100) AS INTEGER)'),
+    ('goals',
+     '''CREATE TABLE goals_new(
+        name TEXT UNIQUE PRIMARY KEY,
+        category TEXT,
+        amount INTEGER,
+        progress INTEGER)''',
+     'name, category, amount, progress',
+     'name, category, CAST(ROUND(amount * 100) AS INTEGER), CAST(ROUND(progress * 100) AS INTEGER)'),
+]
+
+def prepare_cents():
+    """
+    Copies the tables with money columns into replacements that store cents.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    prepare_rebuilds(CENTS_TABLES)
+
+def apply_cents(db):
+    """
+    Swaps in the tables that store cents.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    finish_rebuilds(db, CENTS_TABLES)
+    # The indexes were dropped along with the old tables.
+    add_indexes(db)
+
+# Version 4: stores dates as the number of days since 1970-01-01 instead of YYYY-MM-DD text.
+DAYS_TABLES = [
+    ('expenses',
+     '''CREATE TABLE expenses_new(
+        category TEXT,
+        name TEXT UNIQUE PRIMARY KEY,
+        amount INTEGER,
+        date_added INTEGER)''',
+     'category, name, amount, date_added',
+     'category, name, amount, CAST(julianday(date_added) - 2440587.5 AS INTEGER)'),
+    ('income',
+     '''CREATE TABLE income_new(
+        category TEXT,
+        name TEXT UNIQUE PRIMARY KEY,
+        amount INTEGER,
+        date_added INTEGER)''',
+     'category, name, amount, date_added',
+     'category, name, amount, CAST(julianday(date_added) - 2440587.5 AS INTEGER)'),
+]
+
+def prepare_days():
+    """
+    Copies the expenses and income tables into replacements that store dates as days.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    prepare_rebuilds(DAYS_TABLES)
+
+def apply_days(db):
+    """
+    Swaps in the expenses and income tables that store dates as days.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    finish_rebuilds(db, DAYS_TABLES)
+    db.execute('CREATE INDEX expenses_category_idx ON expenses(category)')
+    db.execute('CREATE INDEX expenses_date_added_idx ON expenses(date_added)')
+    db.execute('CREATE INDEX income_category_idx ON income(category)')
+    db.execute('CREATE INDEX income_date_added_idx ON income(date_added)')
+
+# Version 5: keys expenses and income by an integer id instead of by name. The old rowids become
+# the ids.
+ID_TABLES = [
+    ('expenses',
+     '''CREATE TABLE expenses_new(
+        category TEXT,
+        name TEXT,
+        amount INTEGER,
+        date_added INTEGER,
+        id INTEGER PRIMARY KEY)''',
+     'category, name, amount, date_added',
+     'category, name, amount, date_added'),
+    ('income',
+     '''CREATE TABLE income_new(
+        category TEXT,
+        name TEXT,
+        amount INTEGER,
+        date_added INTEGER,
+        id INTEGER PRIMARY KEY)''',
+     'category, name, amount, date_added',
+     'category, name, amount, date_added'),
+]
+
+def prepare_ids():
+    """
+    Copies the expenses and income tables into replacements keyed by an integer id.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    prepare_rebuilds(ID_TABLES)
+
+def apply_ids(db):
+    """
+    Swaps in the expenses and income tables keyed by an integer id and indexes their names.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    finish_rebuilds(db, ID_TABLES)
+    db.execute('CREATE INDEX expenses_category_idx ON expenses(category)')
+    db.execute('CREATE INDEX expenses_date_added_idx ON expenses(date_added)')
+    db.execute('CREATE INDEX expenses_name_idx ON expenses(name)')
+    db.execute('CREATE INDEX income_category_idx ON income(category)')
+    db.execute('CREATE INDEX income_date_added_idx ON income(date_added)')
+    db.execute('CREATE INDEX income_name_idx ON income(name)')
+
+# Version 6: gives categories integer ids and points expenses and income at them instead of
+# repeating the category name in every row. Categories keep their old rowids as ids.
+CATEGORY_ID_TABLES = [
+    ('expenses',
+     '''CREATE TABLE expenses_new(
+        category_id INTEGER NOT NULL REFERENCES expense_cats(id),
+        name TEXT,
+        amount INTEGER,
+        date_added INTEGER,
+        id INTEGER PRIMARY KEY)''',
+     'category_id, name, amount, date_added',
+     '(SELECT MIN(rowid) FROM expense_cats WHERE name = expenses.category), name, amount, date_added'),
+    ('income',
+     '''CREATE TABLE income_new(
+        category_id INTEGER NOT NULL REFERENCES income_cats(id),
+        name TEXT,
+        amount INTEGER,
+        date_added INTEGER,
+        id INTEGER PRIMARY KEY)''',
+     'category_id, name, amount, date_added',
+     '(SELECT MIN(rowid) FROM income_cats WHERE name = income.category), name, amount, date_added'),
+]
+
+def add_missing_cats(db):
+    """
+    Adds back the category of any expense or income whose category was deleted without it, so every
+    row has a category id to point at. Expense categories added back have no budget.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    db.execute('''INSERT INTO expense_cats(name, budget)
+                  SELECT DISTINCT category, 0 FROM expenses
+                  WHERE category NOT IN (SELECT name FROM expense_cats)''')
+    db.execute('''INSERT INTO income_cats(name)
+                  SELECT DISTINCT category FROM income
+                  WHERE category NOT IN (SELECT name FROM income_cats)''')
+
+def prepare_category_ids():
+    """
+    Copies the expenses and income tables into replacements that store category ids.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    with tracker_db.transaction() as db:
+        add_missing_cats(db)
+    prepare_rebuilds(CATEGORY_ID_TABLES)
+
+def apply_category_ids(db):
+    """
+    Swaps in the expenses and income tables that store category ids and gives the category tables an
+    id column. If a category name was added more than once, its first row is kept.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    # Expenses or income added since the copy may have brought back a deleted category.
+    add_missing_cats(db)
+    finish_rebuilds(db, CATEGORY_ID_TABLES)
+    rebuild_table(db, 'expense_cats',
+                  '''CREATE TABLE expense_cats_new(
+                     id INTEGER PRIMARY KEY,
+                     name TEXT UNIQUE,
+                     budget INTEGER)''',
+                  'id, name, budget',
+                  'SELECT MIN(rowid), name, budget FROM expense_cats GROUP BY name')
+    rebuild_table(db, 'income_cats',
+                  '''CREATE TABLE income_cats_new(
+                     id INTEGER PRIMARY KEY,
+                     name TEXT UNIQUE)''',
+                  'id, name',
+                  'SELECT MIN(rowid), name FROM income_cats GROUP BY name')
+    db.execute('CREATE INDEX expenses_category_id_idx ON expenses(category_id)')
+    db.execute('CREATE INDEX expenses_date_added_idx ON expenses(date_added)')
+    db.execute('CREATE INDEX expenses_name_idx ON expenses(name)')
+    db.execute('CREATE INDEX income_category_id_idx ON income(category_id)')
+    db.execute('CREATE INDEX income_date_added_idx ON income(date_added)')
+    db.execute('CREATE INDEX income_name_idx ON income(name)')
+
+# Version 7: deletes the expenses and income in a category along with the category.
+CASCADE_TABLES = [
+    ('expenses',
+     '''CREATE TABLE expenses_new(
+        category_id INTEGER NOT NULL REFERENCES expense_cats(id) ON DELETE CASCADE,
+        name TEXT,
+        amount INTEGER,
+        date_added INTEGER,
+        id INTEGER PRIMARY KEY)''',
+     'category_id, name, amount, date_added',
+     'category_id, name, amount, date_added'),
+    ('income',
+     '''CREATE TABLE income_new(
+        category_id INTEGER NOT NULL REFERENCES income_cats(id) ON DELETE CASCADE,
+        name TEXT,
+        amount INTEGER,
+        date_added INTEGER,
+        id INTEGER PRIMARY KEY)''',
+     'category_id, name, amount, date_added',
+     'category_id, name, amount, date_added'),
+]
+
+def prepare_cascade():
+    """
+    Copies the expenses and income tables into replacements whose category ids cascade deletes.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    prepare_rebuilds(CASCADE_TABLES)
+
+def apply_cascade(db):
+    """
+    Swaps in the expenses and income tables whose category ids cascade deletes.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    finish_rebuilds(db, CASCADE_TABLES)
+    db.execute('CREATE INDEX expenses_category_id_idx ON expenses(category_id)')
+    db.execute('CREATE INDEX expenses_date_added_idx ON expenses(date_added)')
+    db.execute('CREATE INDEX expenses_name_idx ON expenses(name)')
+    db.execute('CREATE INDEX income_category_id_idx ON income(category_id)')
+    db.execute('CREATE INDEX income_date_added_idx ON income(date_added)')
+    db.execute('CREATE INDEX income_name_idx ON income(name)')
+
+# Version 8: indexes the amounts so expenses and income can be looked up by an amount range.
+def add_amount_indexes(db):
+    """
+    Creates the indexes on the amount columns of the expenses and income tables.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    db.execute('CREATE INDEX IF NOT EXISTS expenses_amount_idx ON expenses(amount)')
+    db.execute('CREATE INDEX IF NOT EXISTS income_amount_idx ON income(amount)')
+
+# Version 9: adds full-text indexes of the expense and income names, kept up to date by triggers.
+def add_search(db):
+    """
+    Creates the full-text indexes of the expense and income names and their triggers, and indexes the
+    names already in the db.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    for statement in schema_db.SEARCH_SCHEMA:
+        db.execute(statement)
+    db.execute("INSERT INTO expenses_fts(expenses_fts) VALUES('rebuild')")
+    db.execute("INSERT INTO income_fts(income_fts) VALUES('rebuild')")
+
+# Version 10: lets the totals of each category be summed from an index that holds the category and
+# amount of every row, without reading the rows themselves.
+def add_category_amount_indexes(db):
+    """
+    Creates the indexes on the category and amount columns of the expenses and income tables.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    db.execute('CREATE INDEX IF NOT EXISTS expenses_category_amount_idx ON expenses(category_id, amount)')
+    db.execute('CREATE INDEX IF NOT EXISTS income_category_amount_idx ON income(category_id, amount)')
+
+# Version 11: keeps the count, total and last date of each category in a table of its own, kept up to
+# date by triggers, so budgets and goals don't have to add up every row.
+# Fills the category totals tables from the expenses and income.
+def rebuild_totals(db):
+    """
+    Empties the category totals tables and fills them again by adding up the expenses and income. This
+    repairs the totals if they have drifted from the rows, such as after rows were changed with the
+    triggers missing.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    db.execute('DELETE FROM expense_cat_totals')
+    db.execute('''INSERT INTO expense_cat_totals(category_id, count, total, last_date)
+                  SELECT category_id, COUNT(*), SUM(amount), MAX(date_added) FROM expenses
+                  GROUP BY category_id''')
+    db.execute('DELETE FROM income_cat_totals')
+    db.execute('''INSERT INTO income_cat_totals(category_id, count, total, last_date)
+                  SELECT category_id, COUNT(*), SUM(amount), MAX(date_added) FROM income
+                  GROUP BY category_id''')
+
+def add_totals(db):
+    """
+    Creates the category totals tables and their triggers, and fills them from the rows already in
+    the db.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    for statement in schema_db.TOTALS_SCHEMA:
+        db.execute(statement)
+    rebuild_totals(db)
+
+# Version 12: keeps the count and total of each category for each month, kept up to date by triggers
+# the same way as the category totals, so monthly reports read one row per category a month.
+# Fills the monthly totals tables from the expenses and income.
+def rebuild_monthly(db):
+    """
+    Empties the monthly totals tables and fills them again by adding up the expenses and income.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    db.execute('DELETE FROM expense_monthly')
+    db.execute('''INSERT INTO expense_monthly(category_id, month, count, total)
+                  SELECT category_id, strftime('%Y-%m', date_added * 86400, 'unixepoch'), COUNT(*), SUM(amount)
+                  FROM expenses GROUP BY 1, 2''')
+    db.execute('DELETE FROM income_monthly')
+    db.execute('''INSERT INTO income_monthly(category_id, month, count, total)
+                  SELECT category_id, strftime('%Y-%m', date_added * 86400, 'unixepoch'), COUNT(*), SUM(amount)
+                  FROM income GROUP BY 1, 2''')
+
+def add_monthly(db):
+    """
+    Creates the monthly totals tables and their triggers, and fills them from the rows already in the db.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        None
+    """
+    for statement in schema_db.MONTHLY_SCHEMA:
+        db.execute(statement)
+    rebuild_monthly(db)
+
+# The migrations in the order they are applied, as (version, description, prepare, apply).
+# prepare() runs first, outside of any transaction, and may be None. It is where a migration copies
+# large tables in batches. apply(db) then runs in a single transaction along with recording the new
+# version.
+MIGRATIONS = [
+    (2, 'Index the category and date columns', None, add_indexes),
+    (3, 'Store money as whole cents', prepare_cents, apply_cents),
+    (4, 'Store dates as days since 1970-01-01', prepare_days, apply_days),
+    (5, 'Give expenses and income integer ids', prepare_ids, apply_ids),
+    (6, 'Point expenses and income at category ids', prepare_category_ids, apply_category_ids),
+    (7, 'Delete rows along with their category', prepare_cascade, apply_cascade),
+    (8, 'Index the amount columns', None, add_amount_indexes),
+    (9, 'Add full-text search of names', None, add_search),
+    (10, 'Index the amounts of each category', None, add_category_amount_indexes),
+    (11, 'Keep running totals for each category', None, add_totals),
+    (12, 'Keep monthly totals for each category', None, add_monthly),
+]
+
+## Main Code ##
+
+# Lets the migrations be checked or applied without starting the tracker, or the category totals be
+# rebuilt with --rebuild-totals.
+if __name__ == '__main__':
+    if '--rebuild-totals' in sys.argv[1:]:
+        rebuild_result = schema_db.rebuild_totals()
+        if rebuild_result[0] == 1:
+            print("Sorry, something went wrong rebuilding the category totals.")
+            print(f"Error: {rebuild_result[1]}")
+            sys.exit(1)
+        print("The category totals have been rebuilt.")
+        sys.exit(0)
+    dry_run = '--dry-run' in sys.argv[1:]
+    if dry_run:
+        migrate_result = migrate(dry_run=True)
+    else:
+        migrate_result = schema_db.create_schema()
+    if migrate_result[0] == 1:
+        print("Sorry, something went wrong upgrading the database.")
+        print(f"Error: {migrate_result[1]}")
+        sys.exit(1)
+    if len(migrate_result[1]) == 0:
+        print("The database is up to date.")
+    for version, description, seconds in migrate_result[1]:
+        if dry_run:
+            print(f"Would apply {version}: {description}")
+        else:
+            print(f"Applied {version}: {description} ({seconds:.2f}s)")
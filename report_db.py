@@ -0,0 +1,127 @@
+# Contains the functions that read reports across the expenses, income, categories and goals tables
+# from a single snapshot of the db, and across every ledger at once.
+
+## Imports ##
+
+import sqlite3
+import pathlib
+import tracker_db
+import expenses_db
+import income_db
+import goals_db
+
+## Functions ##
+
+# Gets an overview of the whole tracker.
+def get_overview():
+    """
+    Gets the totals of every expense and income category and every goal from one read-only snapshot,
+    so the numbers agree with each other even if rows are being added by another process while the
+    report runs, and the report doesn't hold up those writes.
+
+    Args:
+        None
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, overview]: 0 shows that nothing has gone wrong and overview is a dict with:
+            'expense_cats': (name, count, total, last_date, smallest, largest) for each expense category. (list of tuples)
+            'income_cats': (name, count, total, last_date, smallest, largest) for each income category. (list of tuples)
+            'saving_goals': (name, category, amount, progress) for each saving goal. (list of tuples)
+            'income_goals': (name, category, amount, progress) for each income goal. (list of tuples)
+            'expense_total': The total of every expense in cents. (int)
+            'income_total': The total of all income in cents. (int)
+    """
+    overview = {}
+    try:
+        with tracker_db.snapshot():
+            for key, result in (('expense_cats', expenses_db.get_cat_totals()),
+                                ('income_cats', income_db.get_cat_totals()),
+                                ('saving_goals', goals_db.get_goals_list('saving')),
+                                ('income_goals', goals_db.get_goals_list('income'))):
+                # The getters return their errors instead of raising them.
+                if len(result) != 0 and result[0] == 1:
+                    return result
+                overview[key] = result
+    except Exception as e:
+        return [1, e]
+    overview['expense_total'] = sum(cat[2] for cat in overview['expense_cats'])
+    overview['income_total'] = sum(cat[2] for cat in overview['income_cats'])
+    return [0, overview]
+
+# Gets the totals of several ledgers with one query.
+def get_consolidated_totals(ledger_names=None):
+    """
+    Attaches each ledger's db read-only to one connection with ATTACH DATABASE and adds up their
+    category totals in a single query, so the consolidated totals are worked out by SQLite rather
+    than by reading each ledger in turn. The queries run in one read transaction, so they see every
+    ledger as it was at the same moment. SQLite can only attach a few dbs to a connection (10 by
+    default), so only that many ledgers can be reported on at once.
+
+    Args:
+        ledger_names: The names of the ledgers to report on, or None for every ledger. (list of str)
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, totals]: 0 shows that nothing has gone wrong and totals is a dict with:
+            'expense_cats': (name, count, total) for each expense category across the ledgers. (list of tuples)
+            'income_cats': (name, count, total) for each income category across the ledgers. (list of tuples)
+            'ledgers': (ledger, expense_count, expense_total, income_count, income_total) for each ledger. (list of tuples)
+    """
+    try:
+        ledgers = tracker_db.get_ledgers()
+        if ledger_names is None:
+            ledger_names = list(ledgers)
+        for name in ledger_names:
+            if name not in ledgers:
+                raise ValueError(f"There is no ledger called '{name}'.")
+        db = sqlite3.connect('file::memory:', uri=True, isolation_level=None)
+    except Exception as e:
+        return [1, e]
+    try:
+        limit = db.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if len(ledger_names) > limit:
+            raise ValueError(f"Only {limit} ledgers can be reported on at once.")
+        for number, name in enumerate(ledger_names):
+            uri = pathlib.Path(ledgers[name]).absolute().as_uri() + '?mode=ro'
+            db.execute(f'ATTACH DATABASE ? AS ledger_{number}', (uri,))
+
+        # Each kind of category's totals in every ledger, one SELECT for each ledger.
+        def union(kind):
+            selects = []
+            for number in range(len(ledger_names)):
+                selects.append(f'''SELECT ? AS ledger, c.name AS name, t.count AS count, t.total AS total
+                                  FROM ledger_{number}.{kind}_cats c
+                                  JOIN ledger_{number}.{kind}_cat_totals t ON t.category_id = c.id''')
+            return ' UNION ALL '.join(selects)
+        expense_union = union('expense')
+        income_union = union('income')
+
+        totals = {}
+        db.execute('BEGIN')
+        try:
+            totals['expense_cats'] = db.execute(f'''SELECT name, SUM(count), SUM(total) FROM ({expense_union})
+                                                  GROUP BY name ORDER BY SUM(total) DESC, name''',
+                                                ledger_names).fetchall()
+            totals['income_cats'] = db.execute(f'''SELECT name, SUM(count), SUM(total) FROM ({income_union})
+                                                 GROUP BY name ORDER BY SUM(total) DESC, name''',
+                                               ledger_names).fetchall()
+            ledger_totals = db.execute(f'''SELECT ledger,
+                                          IFNULL(SUM(CASE WHEN kind = 'expense' THEN count END), 0),
+                                          IFNULL(SUM(CASE WHEN kind = 'expense' THEN total END), 0),
+                                          IFNULL(SUM(CASE WHEN kind = 'income' THEN count END), 0),
+                                          IFNULL(SUM(CASE WHEN kind = 'income' THEN total END), 0)
+                                          FROM (SELECT 'expense' AS kind, * FROM ({expense_union})
+                                                UNION ALL
+                                                SELECT 'income' AS kind, * FROM ({income_union}))
+                                          GROUP BY ledger''', ledger_names + ledger_names).fetchall()
+        finally:
+            db.execute('ROLLBACK')
+        # Ledgers without any categories yet still get a row, and the rows follow the order asked for.
+        by_ledger = {row[0]: row for row in ledger_totals}
+        totals['ledgers'] = [by_ledger.get(name, (name, 0, 0, 0, 0)) for name in ledger_names]
+    except Exception as e:
+        return [1, e]
+    finally:
+        db.close()
+    return [0, totals]
@@ -0,0 +1,312 @@
+# Contains the schema of the tracker db and the function that creates it when the program starts.
+
+## Imports ##
+
+import sqlite3
+import tracker_db
+import migrations_db
+
+## Variables ##
+
+# The version of the schema that SCHEMA creates. This must be bumped whenever SCHEMA changes.
+SCHEMA_VERSION = 12
+
+# The tables and indexes of the tracker db. Money is stored in cents and dates as the number of days
+# since 1970-01-01. Expenses and income are keyed by an integer id, so names don't have to be unique,
+# and point at their category by its id. Deleting a category deletes its rows.
+TABLES_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS expense_cats(
+       id INTEGER PRIMARY KEY,
+       name TEXT UNIQUE,
+       budget INTEGER)''',
+    '''CREATE TABLE IF NOT EXISTS expenses(
+       category_id INTEGER NOT NULL REFERENCES expense_cats(id) ON DELETE CASCADE,
+       name TEXT,
+       amount INTEGER,
+       date_added INTEGER,
+       id INTEGER PRIMARY KEY)''',
+    '''CREATE TABLE IF NOT EXISTS income_cats(
+       id INTEGER PRIMARY KEY,
+       name TEXT UNIQUE)''',
+    '''CREATE TABLE IF NOT EXISTS income(
+       category_id INTEGER NOT NULL REFERENCES income_cats(id) ON DELETE CASCADE,
+       name TEXT,
+       amount INTEGER,
+       date_added INTEGER,
+       id INTEGER PRIMARY KEY)''',
+    '''CREATE TABLE IF NOT EXISTS goals(
+       name TEXT UNIQUE PRIMARY KEY,
+       category TEXT,
+       amount INTEGER,
+       progress INTEGER)''',
+    'CREATE TABLE IF NOT EXISTS schema_version(version INTEGER)',
+    'CREATE INDEX IF NOT EXISTS expenses_category_id_idx ON expenses(category_id)',
+    'CREATE INDEX IF NOT EXISTS expenses_date_added_idx ON expenses(date_added)',
+    'CREATE INDEX IF NOT EXISTS expenses_name_idx ON expenses(name)',
+    'CREATE INDEX IF NOT EXISTS expenses_amount_idx ON expenses(amount)',
+    'CREATE INDEX IF NOT EXISTS expenses_category_amount_idx ON expenses(category_id, amount)',
+    'CREATE INDEX IF NOT EXISTS income_category_id_idx ON income(category_id)',
+    'CREATE INDEX IF NOT EXISTS income_date_added_idx ON income(date_added)',
+    'CREATE INDEX IF NOT EXISTS income_name_idx ON income(name)',
+    'CREATE INDEX IF NOT EXISTS income_amount_idx ON income(amount)',
+    'CREATE INDEX IF NOT EXISTS income_category_amount_idx ON income(category_id, amount)',
+    'CREATE INDEX IF NOT EXISTS goals_category_idx ON goals(category)',
+]
+
+# The statements below are run by the migrations that added them as well as by SCHEMA, so a fresh db
+# and an upgraded one end up the same. Changing one of them therefore needs a new migration too.
+
+# Full-text indexes of the expense and income names, kept up to date by triggers (version 9). Bulk
+# inserts add a row to search_paused while they index their rows in one statement instead.
+SEARCH_SCHEMA = [
+    'CREATE TABLE search_paused(paused INTEGER)',
+    '''CREATE VIRTUAL TABLE expenses_fts USING fts5(
+       name, content='expenses', content_rowid='id')''',
+    '''CREATE TRIGGER expenses_fts_insert AFTER INSERT ON expenses
+       WHEN NOT EXISTS (SELECT 1 FROM search_paused) BEGIN
+       INSERT INTO expenses_fts(rowid, name) VALUES(new.id, new.name);
+       END''',
+    '''CREATE TRIGGER expenses_fts_delete AFTER DELETE ON expenses BEGIN
+       INSERT INTO expenses_fts(expenses_fts, rowid, name) VALUES('delete', old.id, old.name);
+       END''',
+    '''CREATE TRIGGER expenses_fts_update AFTER UPDATE OF name ON expenses BEGIN
+       INSERT INTO expenses_fts(expenses_fts, rowid, name) VALUES('delete', old.id, old.name);
+       INSERT INTO expenses_fts(rowid, name) VALUES(new.id, new.name);
+       END''',
+    '''CREATE VIRTUAL TABLE income_fts USING fts5(
+       name, content='income', content_rowid='id')''',
+    '''CREATE TRIGGER income_fts_insert AFTER INSERT ON income
+       WHEN NOT EXISTS (SELECT 1 FROM search_paused) BEGIN
+       INSERT INTO income_fts(rowid, name) VALUES(new.id, new.name);
+       END''',
+    '''CREATE TRIGGER income_fts_delete AFTER DELETE ON income BEGIN
+       INSERT INTO income_fts(income_fts, rowid, name) VALUES('delete', old.id, old.name);
+       END''',
+    '''CREATE TRIGGER income_fts_update AFTER UPDATE OF name ON income BEGIN
+       INSERT INTO income_fts(income_fts, rowid, name) VALUES('delete', old.id, old.name);
+       INSERT INTO income_fts(rowid, name) VALUES(new.id, new.name);
+       END''',
+]
+
+# The count, total and last date of each category, kept up to date by triggers so budgets and goals
+# don't have to add up every row (version 11). Deleting a category deletes its totals, so the delete
+# triggers skip rows whose category has already gone. search_paused is renamed triggers_paused as bulk
+# inserts pause the totals triggers along with the search ones, and the search triggers follow it.
+TOTALS_SCHEMA = [
+    'ALTER TABLE search_paused RENAME TO triggers_paused',
+    '''CREATE TABLE expense_cat_totals(
+       category_id INTEGER PRIMARY KEY REFERENCES expense_cats(id) ON DELETE CASCADE,
+       count INTEGER NOT NULL,
+       total INTEGER NOT NULL,
+       last_date INTEGER)''',
+    '''CREATE TRIGGER expenses_totals_insert AFTER INSERT ON expenses
+       WHEN NOT EXISTS (SELECT 1 FROM triggers_paused) BEGIN
+       INSERT INTO expense_cat_totals(category_id, count, total, last_date)
+       VALUES(new.category_id, 1, new.amount, new.date_added)
+       ON CONFLICT(category_id) DO UPDATE SET count = count + 1, total = total + excluded.total,
+       last_date = MAX(IFNULL(last_date, excluded.last_date), excluded.last_date);
+       END''',
+    '''CREATE TRIGGER expenses_totals_delete AFTER DELETE ON expenses
+       WHEN EXISTS (SELECT 1 FROM expense_cats WHERE id = old.category_id) BEGIN
+       UPDATE expense_cat_totals SET count = count - 1, total = total - old.amount,
+       last_date = CASE WHEN old.date_added < last_date THEN last_date
+                   ELSE (SELECT MAX(date_added) FROM expenses WHERE category_id = old.category_id) END
+       WHERE category_id = old.category_id;
+       END''',
+    '''CREATE TRIGGER expenses_totals_update AFTER UPDATE OF category_id, amount, date_added ON expenses BEGIN
+       UPDATE expense_cat_totals SET count = count - 1, total = total - old.amount,
+       last_date = CASE WHEN old.date_added < last_date THEN last_date
+                   ELSE (SELECT MAX(date_added) FROM expenses WHERE category_id = old.category_id) END
+       WHERE category_id = old.category_id;
+       INSERT INTO expense_cat_totals(category_id, count, total, last_date)
+       VALUES(new.category_id, 1, new.amount, new.date_added)
+       ON CONFLICT(category_id) DO UPDATE SET count = count + 1, total = total + excluded.total,
+       last_date = MAX(IFNULL(last_date, excluded.last_date), excluded.last_date);
+       END''',
+    '''CREATE TABLE income_cat_totals(
+       category_id INTEGER PRIMARY KEY REFERENCES income_cats(id) ON DELETE CASCADE,
+       count INTEGER NOT NULL,
+       total INTEGER NOT NULL,
+       last_date INTEGER)''',
+    '''CREATE TRIGGER income_totals_insert AFTER INSERT ON income
+       WHEN NOT EXISTS (SELECT 1 FROM triggers_paused) BEGIN
+       INSERT INTO income_cat_totals(category_id, count, total, last_date)
+       VALUES(new.category_id, 1, new.amount, new.date_added)
+       ON CONFLICT(category_id) DO UPDATE SET count = count + 1, total = total + excluded.total,
+       last_date = MAX(IFNULL(last_date, excluded.last_date), excluded.last_date);
+       END''',
+    '''CREATE TRIGGER income_totals_delete AFTER DELETE ON income
+       WHEN EXISTS (SELECT 1 FROM income_cats WHERE id = old.category_id) BEGIN
+       UPDATE income_cat_totals SET count = count - 1, total = total - old.amount,
+       last_date = CASE WHEN old.date_added < last_date THEN last_date
+                   ELSE (SELECT MAX(date_added) FROM income WHERE category_id = old.category_id) END
+       WHERE category_id = old.category_id;
+       END''',
+    '''CREATE TRIGGER income_totals_update AFTER UPDATE OF category_id, amount, date_added ON income BEGIN
+       UPDATE income_cat_totals SET count = count - 1, total = total - old.amount,
+       last_date = CASE WHEN old.date_added < last_date THEN last_date
+                   ELSE (SELECT MAX(date_added) FROM income WHERE category_id = old.category_id) END
+       WHERE category_id = old.category_id;
+       INSERT INTO income_cat_totals(category_id, count, total, last_date)
+       VALUES(new.category_id, 1, new.amount, new.date_added)
+       ON CONFLICT(category_id) DO UPDATE SET count = count + 1, total = total + excluded.total,
+       last_date = MAX(IFNULL(last_date, excluded.last_date), excluded.last_date);
+       END''',
+]
+
+# The count and total of each category for each month, as YYYY-MM, kept up to date by triggers the
+# same way as the category totals (version 12).
+MONTHLY_SCHEMA = [
+    '''CREATE TABLE expense_monthly(
+       category_id INTEGER REFERENCES expense_cats(id) ON DELETE CASCADE,
+       month TEXT,
+       count INTEGER NOT NULL,
+       total INTEGER NOT NULL,
+       PRIMARY KEY(category_id, month)) WITHOUT ROWID''',
+    'CREATE INDEX expense_monthly_month_idx ON expense_monthly(month)',
+    '''CREATE TRIGGER expenses_monthly_insert AFTER INSERT ON expenses
+       WHEN NOT EXISTS (SELECT 1 FROM triggers_paused) BEGIN
+       INSERT INTO expense_monthly(category_id, month, count, total)
+       VALUES(new.category_id, strftime('%Y-%m', new.date_added * 86400, 'unixepoch'), 1, new.amount)
+       ON CONFLICT(category_id, month) DO UPDATE SET count = count + 1, total = total + excluded.total;
+       END''',
+    '''CREATE TRIGGER expenses_monthly_delete AFTER DELETE ON expenses
+       WHEN EXISTS (SELECT 1 FROM expense_cats WHERE id = old.category_id) BEGIN
+       UPDATE expense_monthly SET count = count - 1, total = total - old.amount
+       WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch');
+       DELETE FROM expense_monthly WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch') AND count = 0;
+       END''',
+    '''CREATE TRIGGER expenses_monthly_update AFTER UPDATE OF category_id, amount, date_added ON expenses BEGIN
+       UPDATE expense_monthly SET count = count - 1, total = total - old.amount
+       WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch');
+       DELETE FROM expense_monthly WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch') AND count = 0;
+       INSERT INTO expense_monthly(category_id, month, count, total)
+       VALUES(new.category_id, strftime('%Y-%m', new.date_added * 86400, 'unixepoch'), 1, new.amount)
+       ON CONFLICT(category_id, month) DO UPDATE SET count = count + 1, total = total + excluded.total;
+       END''',
+    '''CREATE TABLE income_monthly(
+       category_id INTEGER REFERENCES income_cats(id) ON DELETE CASCADE,
+       month TEXT,
+       count INTEGER NOT NULL,
+       total INTEGER NOT NULL,
+       PRIMARY KEY(category_id, month)) WITHOUT ROWID''',
+    'CREATE INDEX income_monthly_month_idx ON income_monthly(month)',
+    '''CREATE TRIGGER income_monthly_insert AFTER INSERT ON income
+       WHEN NOT EXISTS (SELECT 1 FROM triggers_paused) BEGIN
+       INSERT INTO income_monthly(category_id, month, count, total)
+       VALUES(new.category_id, strftime('%Y-%m', new.date_added * 86400, 'unixepoch'), 1, new.amount)
+       ON CONFLICT(category_id, month) DO UPDATE SET count = count + 1, total = total + excluded.total;
+       END''',
+    '''CREATE TRIGGER income_monthly_delete AFTER DELETE ON income
+       WHEN EXISTS (SELECT 1 FROM income_cats WHERE id = old.category_id) BEGIN
+       UPDATE income_monthly SET count = count - 1, total = total - old.amount
+       WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch');
+       DELETE FROM income_monthly WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch') AND count = 0;
+       END''',
+    '''CREATE TRIGGER income_monthly_update AFTER UPDATE OF category_id, amount, date_added ON income BEGIN
+       UPDATE income_monthly SET count = count - 1, total = total - old.amount
+       WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch');
+       DELETE FROM income_monthly WHERE category_id = old.category_id AND month = strftime('%Y-%m', old.date_added * 86400, 'unixepoch') AND count = 0;
+       INSERT INTO income_monthly(category_id, month, count, total)
+       VALUES(new.category_id, strftime('%Y-%m', new.date_added * 86400, 'unixepoch'), 1, new.amount)
+       ON CONFLICT(category_id, month) DO UPDATE SET count = count + 1, total = total + excluded.total;
+       END''',
+]
+
+# Every statement needed to create the tracker db from nothing.
+SCHEMA = TABLES_SCHEMA + SEARCH_SCHEMA + TOTALS_SCHEMA + MONTHLY_SCHEMA
+
+## Functions ##
+
+# Gets the schema version recorded in the db.
+def get_version(db):
+    """
+    Gets the schema version recorded in the db.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+
+    Returns:
+        version: The recorded schema version, or 0 if the schema has never been created. (int)
+    """
+    try:
+        row = db.execute('SELECT version FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    if row is not None:
+        return row[0]
+    # Dbs created before the schema was versioned have the tables but no version.
+    cursor = db.execute("""SELECT 1 FROM sqlite_master
+                          WHERE type = 'table' AND name = 'expenses'""")
+    if cursor.fetchone() is not None:
+        return 1
+    return 0
+
+# Sets the schema version recorded in the db.
+def set_version(db, version):
+    """
+    Records a schema version in the db.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        version: The schema version to record. (int)
+
+    Returns:
+        None
+    """
+    db.execute('DELETE FROM schema_version')
+    db.execute('INSERT INTO schema_version(version) VALUES(?)', (version,))
+
+# Creates the schema if the db doesn't have it yet.
+def create_schema():
+    """
+    Creates every table in the tracker db if it is new, or applies any migrations it is missing.
+    If the db already records the current schema version, only the version is checked.
+
+    Args:
+        None
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, steps]: 0 shows that nothing has gone wrong and steps is a list of the migrations that were
+                    applied as (version, description, seconds). (list of tuples)
+    """
+    try:
+        with tracker_db.transaction() as db:
+            version = get_version(db)
+            if version == 0:
+                for statement in SCHEMA:
+                    db.execute(statement)
+                set_version(db, SCHEMA_VERSION)
+                version = SCHEMA_VERSION
+            elif version == 1 and SCHEMA_VERSION > 1:
+                # Fills in any tables missing from an old db and records its version so it can be migrated.
+                for statement in migrations_db.BASE_SCHEMA:
+                    db.execute(statement)
+                set_version(db, 1)
+    except Exception as e:
+        return [1, e]
+    if version < SCHEMA_VERSION:
+        return migrations_db.migrate()
+    return [0, []]
+
+# Rebuilds the category totals from the rows.
+def rebuild_totals():
+    """
+    Repairs the running totals and monthly totals of each expense and income category by adding them
+    up again from the rows. The triggers keep them up to date, so this is only needed if they have drifted.
+
+    Args:
+        None
+
+    Returns:
+        [1, e]: 1 is a fault code to show something has gone wrong and e is the sqlite3 error. (str)
+        [0, 0]: 0 shows that nothing has gone wrong.
+    """
+    try:
+        with tracker_db.transaction() as db:
+            migrations_db.rebuild_totals(db)
+            migrations_db.rebuild_monthly(db)
+    except Exception as e:
+        return [1, e]
+    return [0, 0]
@@ -0,0 +1,38 @@
+# Tests the category breakdown in budget_utils.py.
+# Run with python -m unittest.
+
+## Imports ##
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# The tests use a db of their own, which has to be chosen before tracker_db is imported.
+os.environ.setdefault('TRACKER_DATA_DIR', tempfile.mkdtemp())
+
+import budget_utils
+
+## Tests ##
+
+class CatBreakdownTest(unittest.TestCase):
+
+    # Shows the breakdown of a category whose expenses are made up, returning what was printed.
+    def breakdown(self, cat, expenses):
+        with mock.patch('expenses_db.iter_expenses_from_category', return_value=iter(expenses)), \
+             mock.patch('builtins.print') as fake_print:
+            budget_utils.cat_breakdown(cat[0], [cat])
+        return [call.args[0] for call in fake_print.call_args_list]
+
+    def test_amounts_are_shown(self):
+        cat = ['food', 5000, 1500, 2, 19000, 500, 1000, 'Comment']
+        lines = self.breakdown(cat, [(1, 'lunch', 500, 19000), (1, 'dinner', 1000, 19000)])
+        self.assertIn('Smallest Expense: 5.00', lines)
+        self.assertIn('Largest Expense: 10.00', lines)
+
+    def test_totals_read_while_the_category_was_empty(self):
+        cat = ['food', 5000, 0, 0, None, None, None, 'Comment']
+        lines = self.breakdown(cat, [(1, 'lunch', 500, 19000)])
+        self.assertIn('Smallest Expense: -', lines)
+        self.assertIn('Largest Expense: -', lines)
+        self.assertIn('Latest Expense Added: -', lines)
@@ -0,0 +1,43 @@
+# Tests the prompts in global_utils.py that the expense and income menus share.
+# Run with python -m unittest.
+
+## Imports ##
+
+import unittest
+from unittest import mock
+import global_utils
+
+## Tests ##
+
+class PageSizeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.page_size = global_utils.PAGE_SIZE
+        global_utils.PAGE_SIZE = 20
+        self.pages = []
+
+    def tearDown(self):
+        global_utils.PAGE_SIZE = self.page_size
+
+    # Gets a page of three made-up rows, recording the size asked for.
+    def get_page(self, category, after_id, before_id, page_size):
+        self.pages.append(page_size)
+        rows = [('food', f'expense {number}', 100, 19000, number) for number in range(1, 4)]
+        return [0, rows[:page_size], page_size < len(rows)]
+
+    def browse(self, inputs):
+        with mock.patch('builtins.input', side_effect=inputs), mock.patch('builtins.print'):
+            return global_utils.browse_pages(self.get_page, None, 'all expenses', 'expenses')
+
+    def test_page_size_of_one_can_be_chosen(self):
+        self.assertEqual(self.browse(['s', '1', '0']), 0)
+        self.assertEqual(global_utils.PAGE_SIZE, 1)
+        self.assertEqual(self.pages, [20, 1])
+
+    def test_zero_keeps_the_page_size(self):
+        self.assertEqual(self.browse(['s', '0', '0']), 0)
+        self.assertEqual(global_utils.PAGE_SIZE, 20)
+        self.assertEqual(self.pages, [20])
+
+if __name__ == '__main__':
+    unittest.main()
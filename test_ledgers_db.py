@@ -0,0 +1,78 @@
+# Tests that adding and removing ledgers leaves every thread's connections and the registry right.
+# Run with python -m unittest.
+
+## Imports ##
+
+import os
+import tempfile
+import threading
+import unittest
+
+# The tests use a db of their own, which has to be chosen before tracker_db is imported.
+os.environ.setdefault('TRACKER_DATA_DIR', tempfile.mkdtemp())
+
+import tracker_db
+import ledgers_db
+
+## Tests ##
+
+class LedgerTest(unittest.TestCase):
+
+    def setUp(self):
+        tracker_db.set_ledger(tracker_db.DEFAULT_LEDGER)
+        ledgers_db.save_ledgers({})
+        self.paths = [os.path.join(tracker_db.DATA_DIR, f'tracker-test-{number}') for number in (1, 2)]
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def tearDown(self):
+        tracker_db.set_ledger(tracker_db.DEFAULT_LEDGER)
+        for name in ledgers_db.get_ledger_names():
+            if name != tracker_db.DEFAULT_LEDGER:
+                ledgers_db.remove_ledger(name)
+
+    def test_adding_a_ledger_leaves_the_ledger_in_use(self):
+        self.assertEqual(ledgers_db.add_ledger('test', self.paths[0]), [0, 0])
+        self.assertEqual(tracker_db.get_ledger(), tracker_db.DEFAULT_LEDGER)
+        tracker_db.set_ledger('test')
+        tables = tracker_db.get_connection().execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        self.assertIn('expenses', [row[0] for row in tables])
+
+    def test_a_ledger_whose_tables_fail_is_not_registered(self):
+        # A file stands where the new db's folder would have to be.
+        with open(self.paths[0], 'w', encoding='utf-8'):
+            pass
+        path = os.path.join(self.paths[0], 'tracker')
+        self.assertEqual(ledgers_db.add_ledger('test', path)[0], 1)
+        self.assertNotIn('test', tracker_db.get_ledgers())
+
+    def test_removing_a_ledger_reopens_other_threads_connections(self):
+        ledgers_db.add_ledger('test', self.paths[0])
+        opened = threading.Event()
+        removed = threading.Event()
+        paths = []
+
+        # Gets the file this thread's connection to the ledger is open on.
+        def get_path():
+            previous = tracker_db.set_ledger('test')
+            path = tracker_db.get_connection().execute('PRAGMA database_list').fetchone()[2]
+            tracker_db.set_ledger(previous)
+            return path
+
+        # Connects to the ledger, then again once it has been added back with another file.
+        def use_ledger():
+            paths.append(get_path())
+            opened.set()
+            removed.wait()
+            paths.append(get_path())
+            tracker_db.close_connection()
+
+        thread = threading.Thread(target=use_ledger)
+        thread.start()
+        opened.wait()
+        self.assertEqual(ledgers_db.remove_ledger('test'), [0, 0])
+        self.assertEqual(ledgers_db.add_ledger('test', self.paths[1]), [0, 0])
+        removed.set()
+        thread.join()
+        self.assertEqual(paths, [os.path.abspath(path) for path in self.paths])
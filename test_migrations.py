@@ -0,0 +1,105 @@
+# Tests that the migrations which rebuild tables keep writes made while the rows were being copied,
+# and that migrating an old db gives the same schema as creating a new one.
+# Run with python -m unittest.
+
+## Imports ##
+
+import os
+import re
+import tempfile
+import unittest
+
+# The tests use a db of their own, which has to be chosen before tracker_db is imported.
+os.environ.setdefault('TRACKER_DATA_DIR', tempfile.mkdtemp())
+
+import tracker_db
+import migrations_db
+import schema_db
+
+## Tests ##
+
+# Removes the current ledger's db files.
+def remove_db():
+    tracker_db.close_connection()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(tracker_db.DB_PATH + suffix):
+            os.remove(tracker_db.DB_PATH + suffix)
+
+class RebuildTest(unittest.TestCase):
+
+    def setUp(self):
+        remove_db()
+        db = tracker_db.get_connection()
+        for statement in migrations_db.BASE_SCHEMA:
+            db.execute(statement)
+        db.execute('INSERT INTO schema_version(version) VALUES(2)')
+        for number in range(1, 11):
+            db.execute('INSERT INTO expenses VALUES(?, ?, ?, ?)',
+                       ('food', f'expense {number}', number + 0.5, '2024-01-01'))
+        db.execute("INSERT INTO goals VALUES('holiday', 'saving', 100.0, 10.25)")
+        # Copies a few rows at a time, so the writes below land on copied and uncopied rows alike.
+        self.batch_size = migrations_db.BATCH_SIZE
+        migrations_db.BATCH_SIZE = 3
+
+    def tearDown(self):
+        migrations_db.BATCH_SIZE = self.batch_size
+        tracker_db.close_connection()
+
+    def test_writes_between_prepare_and_apply(self):
+        migrations_db.prepare_cents()
+        db = tracker_db.get_connection()
+        db.execute("UPDATE expenses SET amount = 99.99 WHERE name = 'expense 2'")
+        db.execute("DELETE FROM expenses WHERE name = 'expense 5'")
+        db.execute("UPDATE expenses SET name = 'renamed' WHERE name = 'expense 7'")
+        # Deleting the newest row lets the next insert reuse its rowid, below the last one copied.
+        db.execute("DELETE FROM expenses WHERE name = 'expense 10'")
+        db.execute("INSERT INTO expenses VALUES('food', 'reused', 1.25, '2024-01-02')")
+        db.execute("INSERT INTO expenses VALUES('food', 'added', 2.5, '2024-01-03')")
+        db.execute("UPDATE goals SET progress = 20.5")
+        with tracker_db.transaction() as db:
+            migrations_db.apply_cents(db)
+
+        rows = dict(db.execute('SELECT name, amount FROM expenses').fetchall())
+        self.assertEqual(rows['expense 2'], 9999)
+        self.assertNotIn('expense 5', rows)
+        self.assertNotIn('expense 7', rows)
+        self.assertEqual(rows['renamed'], 750)
+        self.assertNotIn('expense 10', rows)
+        self.assertEqual(rows['reused'], 125)
+        self.assertEqual(rows['added'], 250)
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(db.execute('SELECT progress FROM goals').fetchone()[0], 2050)
+        # The change logs and their triggers are gone along with the old tables.
+        leftovers = db.execute('''SELECT name FROM sqlite_master
+                                  WHERE name LIKE '%_changes' OR name LIKE '%_rebuild_%' ''').fetchall()
+        self.assertEqual(leftovers, [])
+
+class SchemaTest(unittest.TestCase):
+
+    def tearDown(self):
+        tracker_db.close_connection()
+
+    # Gets every table, index and trigger in the db, ignoring the quoting and spacing of their SQL.
+    def get_schema(self):
+        schema = {}
+        cursor = tracker_db.get_connection().execute('SELECT type, name, tbl_name, sql FROM sqlite_master')
+        for kind, name, table, sql in cursor:
+            if sql is not None:
+                sql = re.sub(r'\s+', ' ', sql.replace('IF NOT EXISTS ', '').replace('"', ''))
+            schema[name] = (kind, table, sql)
+        return schema
+
+    def test_migrated_db_matches_new_db(self):
+        remove_db()
+        self.assertEqual(schema_db.create_schema(), [0, []])
+        new_schema = self.get_schema()
+        remove_db()
+        db = tracker_db.get_connection()
+        for statement in migrations_db.BASE_SCHEMA:
+            db.execute(statement)
+        self.assertEqual(schema_db.create_schema()[0], 0)
+        self.assertEqual(schema_db.get_version(db), schema_db.SCHEMA_VERSION)
+        self.assertEqual(self.get_schema(), new_schema)
+
+if __name__ == '__main__':
+    unittest.main()
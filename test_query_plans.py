@@ -0,0 +1,232 @@
+# Tests that the queries of the db modules use the indexes instead of scanning whole tables.
+# Run with python -m unittest.
+
+## Imports ##
+
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+# The tests use a db of their own, which has to be chosen before tracker_db is imported.
+os.environ.setdefault('TRACKER_DATA_DIR', tempfile.mkdtemp())
+
+import tracker_db
+import schema_db
+import expenses_db
+import income_db
+import goals_db
+import report_db
+import export_db
+
+## Variables ##
+
+# The modules whose queries are checked.
+DB_MODULES = (expenses_db, income_db, goals_db, report_db, export_db)
+
+# Functions that don't run queries of their own, so aren't called.
+NO_QUERIES = {'write_csv', 'write_jsonl'}
+
+# Functions that read every row of a table on purpose, so a full scan is the right plan for them.
+FULL_SCANS = {'get_cat_list', 'iter_all_expenses', 'get_all_expenses', 'iter_all_income', 'get_all_income',
+              'get_consolidated_totals', 'iter_export_rows', 'export_table'}
+
+# Table names and the aliases they are given after FROM or JOIN.
+TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN)\s+(?:\w+\.)?(\w+)(?:\s+(?:AS\s+)?(?!WHERE|JOIN|ON|GROUP|ORDER|LIMIT|LEFT|INNER|USING)(\w+))?',
+                           re.IGNORECASE)
+
+## Functions ##
+
+# Gets the calls that exercise every query, with arguments that match the test data.
+def get_calls(export_path):
+    """
+    Gets a call for every function in DB_MODULES that runs a query, using the rows made by setUp.
+
+    Args:
+        export_path: A file the export functions can write to. (str)
+
+    Returns:
+        calls: The calls as (function, args). (list of tuples)
+    """
+    calls = [
+        (expenses_db.get_cat_names, ()),
+        (expenses_db.get_cat_list, ()),
+        (expenses_db.get_name_list, ()),
+        (expenses_db.get_expense_by_id, (5,)),
+        (expenses_db.get_expenses_by_name, ('expense 5', 10)),
+        (expenses_db.iter_all_expenses, ()),
+        (expenses_db.get_all_expenses, ()),
+        (expenses_db.iter_expenses_from_category, ('food',)),
+        (expenses_db.get_expenses_from_category, ('food',)),
+        (expenses_db.get_expense_page, ('food', None, None, 20)),
+        (expenses_db.get_expense_page, ('food', 50, None, 20)),
+        (expenses_db.get_expense_page, (None, None, 50, 20)),
+        (expenses_db.get_expenses_between, (19000, 19030, 20)),
+        (expenses_db.get_expenses_by_amount, (100, 500, 20)),
+        (expenses_db.search_expenses, ('expense', 'food', 19000, 19300, 20)),
+        (expenses_db.get_expense_total_between, (19000, 19030)),
+        (expenses_db.get_cat_totals, ()),
+        (expenses_db.get_cat_totals, ('food',)),
+        (expenses_db.get_monthly_totals, ('food', '2022-01', '2022-06')),
+        (expenses_db.get_monthly_cat_totals, ('2022-01', '2022-06')),
+        (expenses_db.add_expense, (['food', 'new expense', 250, 19100],)),
+        (expenses_db.add_expenses_many, ([['rent', 'many expense', 300, 19101]],)),
+        (expenses_db.update_expense, (['rent', 'changed expense', 350, 19102], 6)),
+        (expenses_db.delete_expense, (7,)),
+        (expenses_db.add_expense_cat, ('travel', 10000)),
+        (expenses_db.update_cat_budget, ('travel', 20000)),
+        (expenses_db.rename_expense_cat, ('travel', 'holidays')),
+        (expenses_db.delete_expense_cat, ('holidays',)),
+        (income_db.get_cat_list, ()),
+        (income_db.get_name_list, ()),
+        (income_db.get_income_by_id, (5,)),
+        (income_db.get_income_by_name, ('income 5', 10)),
+        (income_db.iter_all_income, ()),
+        (income_db.get_all_income, ()),
+        (income_db.get_cat_income, ('salary',)),
+        (income_db.iter_income_from_category, ('salary',)),
+        (income_db.get_income_from_category, ('salary',)),
+        (income_db.get_income_page, ('salary', None, None, 20)),
+        (income_db.get_income_page, ('salary', 50, None, 20)),
+        (income_db.get_income_page, (None, None, 50, 20)),
+        (income_db.get_income_between, (19000, 19030, 20)),
+        (income_db.get_income_by_amount, (100, 500, 20)),
+        (income_db.search_income, ('income', 'salary', 19000, 19300, 20)),
+        (income_db.get_income_total_between, (19000, 19030)),
+        (income_db.get_cat_totals, ()),
+        (income_db.get_cat_totals, ('salary',)),
+        (income_db.get_monthly_totals, ('salary', '2022-01', '2022-06')),
+        (income_db.get_monthly_cat_totals, ('2022-01', '2022-06')),
+        (income_db.add_income, (['salary', 'new income', 250, 19100],)),
+        (income_db.add_income_many, ([['bonus', 'many income', 300, 19101]],)),
+        (income_db.update_income, (['bonus', 'changed income', 350, 19102], 6)),
+        (income_db.delete_income, (7,)),
+        (income_db.add_income_cat, ('gifts',)),
+        (income_db.rename_income_cat, ('gifts', 'presents')),
+        (income_db.delete_income_cat, ('presents',)),
+        (goals_db.get_goal_info, ('house',)),
+        (goals_db.iter_goals, ('saving',)),
+        (goals_db.get_goals_list, ('saving',)),
+        (goals_db.add_goal, (['car', 'saving', 50000, 0],)),
+        (goals_db.update_goal, ('car', ['car', 'saving', 60000, 100])),
+        (goals_db.update_saving_goal_progress, ('car', 200)),
+        (goals_db.delete_goal, ('car', 'saving')),
+        (report_db.get_overview, ()),
+        (report_db.get_consolidated_totals, ()),
+        (export_db.iter_export_rows, ('expenses', 'food', 19000, 19030)),
+        (export_db.export_table, ('income', export_path, 'csv', 'salary')),
+    ]
+    return calls
+
+# Gets the tables each name in a query stands for.
+def get_table_names(sql):
+    """
+    Maps each table named in a query, and each alias given to one, to the table.
+
+    Args:
+        sql: The query. (str)
+
+    Returns:
+        tables: The table for each name or alias. (dict of str: str)
+    """
+    tables = {}
+    for table, alias in TABLE_PATTERN.findall(sql):
+        tables[table] = table
+        if alias != '':
+            tables[alias] = table
+    return tables
+
+## Tests ##
+
+class QueryPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        tracker_db.close_connection()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(tracker_db.DB_PATH + suffix):
+                os.remove(tracker_db.DB_PATH + suffix)
+        self.assertEqual(schema_db.create_schema()[0], 0)
+        for cat in ('food', 'rent'):
+            expenses_db.add_expense_cat(cat, 100000)
+        for cat in ('salary', 'bonus'):
+            income_db.add_income_cat(cat)
+        expenses = [[('food', 'rent')[number % 2], f'expense {number}', number * 7 % 1000, 19000 + number % 300]
+                    for number in range(1, 2001)]
+        self.assertEqual(expenses_db.add_expenses_many(expenses)[0], 0)
+        income = [[('salary', 'bonus')[number % 2], f'income {number}', number * 7 % 1000, 19000 + number % 300]
+                  for number in range(1, 2001)]
+        self.assertEqual(income_db.add_income_many(income)[0], 0)
+        goals_db.add_goal(['house', 'saving', 1000000, 500])
+        goals_db.add_goal(['salary', 'income', 1000000, 0])
+        self.export_path = os.path.join(tracker_db.DATA_DIR, 'export.csv')
+
+    def tearDown(self):
+        tracker_db.close_connection()
+        if os.path.exists(self.export_path):
+            os.remove(self.export_path)
+
+    # Runs a function and records the statements it ran on any connection.
+    def trace(self, func, args):
+        statements = []
+        connect = sqlite3.connect
+        def traced_connect(*connect_args, **connect_kwargs):
+            db = connect(*connect_args, **connect_kwargs)
+            db.set_trace_callback(statements.append)
+            return db
+        tracker_db.get_connection().set_trace_callback(statements.append)
+        try:
+            with mock.patch('sqlite3.connect', traced_connect):
+                result = func(*args)
+                if hasattr(result, '__next__'):
+                    result = list(result)
+        finally:
+            tracker_db.get_connection().set_trace_callback(None)
+        # The db functions return their errors instead of raising them.
+        if type(result) == list and len(result) == 2 and result[0] == 1:
+            self.fail(f'{func.__name__}{args} returned {result[1]!r}')
+        return statements
+
+    # Gets the full table scans in the plan of a statement.
+    def get_full_scans(self, explain_db, sql, indexed_tables):
+        tables = get_table_names(sql)
+        full_scans = []
+        for row in explain_db.execute(f'EXPLAIN QUERY PLAN {sql}'):
+            match = re.fullmatch(r'SCAN (\w+)', row[3])
+            if match is None:
+                continue
+            table = tables.get(match.group(1), match.group(1))
+            if table in indexed_tables:
+                full_scans.append(row[3])
+        return full_scans
+
+    def test_every_function_is_checked(self):
+        called = {func for func, args in get_calls(self.export_path)}
+        for module in DB_MODULES:
+            for name, func in vars(module).items():
+                if callable(func) and getattr(func, '__module__', None) == module.__name__ and not name.startswith('_'):
+                    if name in NO_QUERIES or name.endswith('_chunk'):
+                        continue
+                    self.assertIn(func, called, f'{module.__name__}.{name} has no call in get_calls()')
+
+    def test_no_full_scans_of_indexed_tables(self):
+        explain_db = sqlite3.connect(tracker_db.DB_PATH)
+        # The consolidated report reads the ledger through an attached schema.
+        explain_db.execute('ATTACH DATABASE ? AS ledger_0', (tracker_db.DB_PATH,))
+        indexed_tables = {row[0] for row in explain_db.execute(
+            "SELECT DISTINCT tbl_name FROM sqlite_master WHERE type = 'index'")}
+        try:
+            for func, args in get_calls(self.export_path):
+                if func.__name__ in FULL_SCANS:
+                    continue
+                for sql in self.trace(func, args):
+                    if re.match(r'\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b', sql, re.IGNORECASE) is None:
+                        continue
+                    with self.subTest(function=func.__name__, sql=' '.join(sql.split())):
+                        self.assertEqual(self.get_full_scans(explain_db, sql, indexed_tables), [])
+        finally:
+            explain_db.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,509 @@
+# Contains the shared connection to the tracker db that all the *_db modules use.
+
+## Imports ##
+
+import sqlite3
+import json
+import os
+import pathlib
+import re
+import threading
+import atexit
+from contextlib import contextmanager
+
+## Variables ##
+
+# The folder the ledgers are kept in. It defaults to the data folder next to the program, so the
+# tracker finds its data whichever directory it is started from, and can be chosen with the
+# TRACKER_DATA_DIR environment variable.
+DATA_DIR = os.environ.get('TRACKER_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
+# The registry of ledgers, a JSON object mapping each ledger's name to its db file. Relative paths
+# are inside DATA_DIR.
+LEDGERS_PATH = os.path.join(DATA_DIR, 'ledgers.json')
+
+# The ledger that is always there, even before any others are registered, and its db file.
+DEFAULT_LEDGER = 'main'
+DB_PATH = os.path.join(DATA_DIR, 'tracker')
+
+# The number of rows iter_rows fetches from the db at a time.
+FETCH_SIZE = 500
+
+# The storage profiles the tracker db can be opened with, as the pragmas each one sets. All of them
+# use WAL so readers don't block the writer. 'safe' syncs every commit to disk, 'fast' syncs less
+# often and memory-maps reads, and 'bulk-load' doesn't wait for the disk at all while importing.
+PROFILES = {
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -256000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+}
+
+# The profile new connections are opened with. It can be chosen with the TRACKER_PROFILE
+# environment variable.
+_profile = os.environ.get('TRACKER_PROFILE', 'safe')
+
+# The ledger that connections are made to. It can be chosen with the TRACKER_LEDGER environment variable.
+_ledger = os.environ.get('TRACKER_LEDGER', DEFAULT_LEDGER)
+
+# Holds the connection to each ledger for each thread.
+_local = threading.local()
+# Every connection that has been opened, so they can all be closed on exit.
+_connections = []
+_connections_lock = threading.Lock()
+# How many times each ledger has been closed by close_ledger(). A thread holding a connection opened
+# before the latest close opens a new one.
+_generations = {}
+
+## Functions ##
+
+# Gets the registered ledgers.
+def get_ledgers():
+    """
+    Reads the ledger registry. The default ledger is always included.
+
+    Args:
+        None
+
+    Returns:
+        ledgers: The path of each ledger's db file by its name. (dict of str: str)
+    """
+    ledgers = {DEFAULT_LEDGER: DB_PATH}
+    if os.path.isfile(LEDGERS_PATH):
+        with open(LEDGERS_PATH, encoding='utf-8') as ledgers_file:
+            for name, path in json.load(ledgers_file).items():
+                ledgers[name] = os.path.join(DATA_DIR, path)
+    return ledgers
+
+# Gets the path of a ledger's db file.
+def get_db_path(ledger=None):
+    """
+    Gets the path of the db file of a ledger.
+
+    Args:
+        ledger: The name of the ledger, or None for the current one. (str)
+
+    Returns:
+        path: The path of the ledger's db file. (str)
+    """
+    if ledger is None:
+        ledger = _ledger
+    ledgers = get_ledgers()
+    if ledger not in ledgers:
+        raise ValueError(f"There is no ledger called '{ledger}'. Choose from: {', '.join(ledgers)}")
+    return ledgers[ledger]
+
+# Gets the name of the ledger in use.
+def get_ledger():
+    """
+    Gets the name of the ledger that the db modules read and write.
+
+    Args:
+        None
+
+    Returns:
+        _ledger: The name of the ledger. (str)
+    """
+    return _ledger
+
+# Switches to another ledger.
+def set_ledger(name):
+    """
+    Switches the ledger that every db module reads and writes, on every thread. Each thread keeps its
+    connection to the ledgers it has used, so switching back doesn't reopen them. Its schema isn't
+    checked, so call schema_db.create_schema() after switching to a ledger for the first time.
+
+    Args:
+        name: The name of the ledger, one of the keys of get_ledgers(). (str)
+
+    Returns:
+        previous: The name of the ledger that was in use, so it can be switched back. (str)
+    """
+    global _ledger
+    ledgers = get_ledgers()
+    if name not in ledgers:
+        raise ValueError(f"There is no ledger called '{name}'. Choose from: {', '.join(ledgers)}")
+    previous = _ledger
+    _ledger = name
+    return previous
+
+# Gets the connections this thread has open.
+def get_thread_connections():
+    """
+    Gets this thread's connections by ledger, forgetting any inherited from the parent of a forked
+    process, as a forked process can't share its parent's connections.
+
+    Args:
+        None
+
+    Returns:
+        connections: This thread's connection to each ledger it has used. (dict of str: sqlite3.Connection)
+    """
+    if getattr(_local, 'pid', None) != os.getpid():
+        _local.connections = {}
+        # How many transaction() blocks are open on each connection.
+        _local.depths = {}
+        # The generation of each ledger when this thread connected to it.
+        _local.generations = {}
+        _local.pid = os.getpid()
+    return _local.connections
+
+# Opens a connection to a db file.
+def open_connection(db_path):
+    """
+    Opens a connection to a db file with foreign keys on and the current storage profile, creating
+    its folder if needed.
+
+    Args:
+        db_path: The path of the db file. (str)
+
+    Returns:
+        db: The connection. (sqlite3.Connection)
+    """
+    if not os.path.isdir(os.path.dirname(db_path)):
+        os.makedirs(os.path.dirname(db_path))
+    # Transactions are started explicitly by transaction(), so sqlite3 is left in autocommit mode.
+    db = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    # sqlite3 only enforces foreign keys, and so only cascades deletes, when asked to.
+    db.execute('PRAGMA foreign_keys = ON')
+    try:
+        apply_profile(db, _profile)
+    except Exception:
+        db.close()
+        raise
+    return db
+
+# Gets the connection for the current thread.
+def get_connection():
+    """
+    Gets the long-lived connection to the current ledger's db for the current thread, opening it if
+    needed. This is the router every db module goes through, so they all follow set_ledger().
+    Inside a snapshot() block, the snapshot's read-only connection is returned instead, and inside a
+    connect_to() block, its connection.
+
+    Args:
+        None
+
+    Returns:
+        db: The connection to the tracker db. (sqlite3.Connection)
+    """
+    # Inside snapshot(), every read on this thread sees the snapshot.
+    snapshot_db = getattr(_local, 'snapshot', None)
+    if snapshot_db is not None:
+        return snapshot_db
+    connected_db = getattr(_local, 'connected', None)
+    if connected_db is not None:
+        return connected_db
+    connections = get_thread_connections()
+    db = connections.get(_ledger)
+    if db is not None:
+        # A connection to a ledger closed since it was opened is replaced, once no transaction is open.
+        if _local.generations[_ledger] == _generations.get(_ledger, 0) or _local.depths[db] != 0:
+            return db
+        forget_connection(_ledger)
+    db = open_connection(get_db_path())
+    connections[_ledger] = db
+    _local.depths[db] = 0
+    _local.generations[_ledger] = _generations.get(_ledger, 0)
+    with _connections_lock:
+        _connections.append(db)
+    return db
+
+# Applies a storage profile to a connection.
+def apply_profile(db, name):
+    """
+    Sets the pragmas of a storage profile on a connection. This can't be done inside a transaction.
+
+    Args:
+        db: The connection to the tracker db. (sqlite3.Connection)
+        name: The name of the profile, one of the keys of PROFILES. (str)
+
+    Returns:
+        None
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Unknown storage profile '{name}'. Choose from: {', '.join(PROFILES)}")
+    for pragma, value in PROFILES[name].items():
+        db.execute(f'PRAGMA {pragma} = {value}')
+
+# Gets the name of the storage profile in use.
+def get_profile():
+    """
+    Gets the name of the storage profile that connections are opened with.
+
+    Args:
+        None
+
+    Returns:
+        _profile: The name of the profile. (str)
+    """
+    return _profile
+
+# Switches to another storage profile.
+def set_profile(name):
+    """
+    Switches the storage profile, applying it to the current thread's connections if any are open.
+    Connections opened by other threads afterwards use it too.
+
+    Args:
+        name: The name of the profile, one of the keys of PROFILES. (str)
+
+    Returns:
+        previous: The name of the profile that was in use, so it can be switched back. (str)
+    """
+    global _profile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown storage profile '{name}'. Choose from: {', '.join(PROFILES)}")
+    previous = _profile
+    _profile = name
+    for db in get_thread_connections().values():
+        apply_profile(db, name)
+    return previous
+
+# Runs a block of statements in a single transaction.
+@contextmanager
+def transaction():
+    """
+    Opens a transaction on the current thread's connection. It is committed if the block
+    finishes and rolled back if the block raises an exception.
+
+    Transactions can be nested, so a caller can group several *_db calls into one unit of work
+    that is committed once. A nested block runs in a savepoint: if it raises, only its own
+    statements are rolled back, and nothing is committed until the outermost block finishes.
+    Inside a snapshot() block, it raises sqlite3.OperationalError, as the snapshot is read-only.
+
+    Args:
+        None
+
+    Yields:
+        db: The connection to the tracker db. (sqlite3.Connection)
+    """
+    if getattr(_local, 'snapshot', None) is not None:
+        raise sqlite3.OperationalError('attempt to write inside a read-only snapshot')
+    db = get_connection()
+    depth = _local.depths[db]
+    savepoint = f'unit_{depth}'
+    if depth == 0:
+        db.execute('BEGIN')
+    else:
+        db.execute(f'SAVEPOINT {savepoint}')
+    _local.depths[db] = depth + 1
+    try:
+        yield db
+    except BaseException:
+        _local.depths[db] = depth
+        if depth == 0:
+            db.execute('ROLLBACK')
+        else:
+            db.execute(f'ROLLBACK TO {savepoint}')
+            db.execute(f'RELEASE {savepoint}')
+        raise
+    _local.depths[db] = depth
+    if depth == 0:
+        db.execute('COMMIT')
+    else:
+        db.execute(f'RELEASE {savepoint}')
+
+# Routes this thread's db calls to another db file.
+@contextmanager
+def connect_to(db_path):
+    """
+    Opens a separate connection to a db file and, for the block, routes this thread's db calls to it,
+    so a db that isn't the current ledger, such as a ledger that isn't registered yet, can have its
+    schema created without switching the ledger of every thread. The connection is closed afterwards.
+
+    Args:
+        db_path: The path of the db file. (str)
+
+    Yields:
+        db: The connection. (sqlite3.Connection)
+    """
+    get_thread_connections()
+    db = open_connection(db_path)
+    _local.depths[db] = 0
+    _local.connected = db
+    try:
+        yield db
+    finally:
+        _local.connected = None
+        _local.depths.pop(db, None)
+        db.close()
+
+# Pins a read-only snapshot of the db for a report.
+@contextmanager
+def snapshot():
+    """
+    Opens a separate read-only connection (mode=ro) and starts a read transaction on it, so every
+    query in the block sees the db as it was when the snapshot was taken. As the db uses WAL, the
+    snapshot doesn't block writers in this or any other process, and they don't block it. Totals
+    read from different tables in the block therefore agree with each other even while rows are
+    being added.
+
+    While the block runs, get_connection() on this thread returns the snapshot, so the *_db getters
+    read from it. Writes in the block fail with sqlite3.OperationalError, as the connection is
+    read-only. A snapshot() inside another one reuses the outer snapshot.
+
+    Args:
+        None
+
+    Yields:
+        db: The read-only connection. (sqlite3.Connection)
+    """
+    snapshot_db = getattr(_local, 'snapshot', None)
+    if snapshot_db is not None:
+        yield snapshot_db
+        return
+    # Makes sure the db exists and has its schema's WAL mode set before it is opened read-only.
+    get_connection()
+    uri = pathlib.Path(get_db_path()).absolute().as_uri() + '?mode=ro'
+    snapshot_db = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+    try:
+        snapshot_db.execute('BEGIN')
+        # A WAL read transaction only takes its snapshot at the first read.
+        snapshot_db.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        _local.snapshot = snapshot_db
+        try:
+            yield snapshot_db
+        finally:
+            _local.snapshot = None
+            snapshot_db.execute('ROLLBACK')
+    finally:
+        snapshot_db.close()
+
+# Reads the rows of a query a few at a time.
+def iter_rows(query, params=()):
+    """
+    Runs a query on the current thread's connection and yields its rows, fetching FETCH_SIZE of
+    them at a time, so only that many are held in memory however many rows the query returns.
+    Unlike the *_db getters, errors are raised rather than returned.
+
+    Args:
+        query: The SQL query. (str)
+        params: The values for the placeholders in the query. (tuple)
+
+    Yields:
+        row: A row of the query. (tuple)
+    """
+    cursor = get_connection().cursor()
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if len(rows) == 0:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+# Turns a search into a full-text query.
+def match_query(search_text):
+    """
+    Turns the words a user searched for into an FTS5 query that matches names containing every word,
+    or a word starting with it, so 'groc' finds 'groceries'. Punctuation is ignored so that nothing
+    the user types is read as FTS5 syntax.
+
+    Args:
+        search_text: What the user searched for. (str)
+
+    Returns:
+        query: The FTS5 query, or None if there were no words to search for. (str)
+    """
+    words = re.findall(r'\w+', search_text.lower())
+    if len(words) == 0:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+# Closes the connections for the current thread.
+def close_connection():
+    """
+    Closes the current thread's connections to the tracker dbs if any are open.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    connections = get_thread_connections()
+    for db in connections.values():
+        with _connections_lock:
+            if db in _connections:
+                _connections.remove(db)
+        db.close()
+    connections.clear()
+    _local.depths.clear()
+    _local.generations.clear()
+
+# Closes and forgets this thread's connection to a ledger.
+def forget_connection(name):
+    """
+    Closes the current thread's connection to a ledger if one is open and forgets it.
+
+    Args:
+        name: The name of the ledger. (str)
+
+    Returns:
+        None
+    """
+    db = get_thread_connections().pop(name, None)
+    _local.generations.pop(name, None)
+    if db is None:
+        return
+    _local.depths.pop(db, None)
+    with _connections_lock:
+        if db in _connections:
+            _connections.remove(db)
+    db.close()
+
+# Closes every thread's connection to a ledger.
+def close_ledger(name):
+    """
+    Closes the connections to a ledger on every thread, so its db file is let go and a ledger
+    registered under the same name later gets new connections. This thread's connection is closed
+    straight away. A connection can't safely be closed while another thread may be using it, so the
+    ledger's generation is moved on instead, and each other thread closes its connection and opens
+    a new one the next time it uses the ledger.
+
+    Args:
+        name: The name of the ledger. (str)
+
+    Returns:
+        None
+    """
+    with _connections_lock:
+        _generations[name] = _generations.get(name, 0) + 1
+    forget_connection(name)
+
+# Closes every connection when the program exits.
+def close_all():
+    """
+    Closes every connection to the tracker dbs that is still open.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    with _connections_lock:
+        while _connections:
+            _connections.pop().close()
+
+atexit.register(close_all)